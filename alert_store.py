@@ -0,0 +1,231 @@
+"""
+Histórico de alertas de ZAP en SQLite
+
+Guarda las alertas agregadas de cada ejecución en una base de datos SQLite
+embebida, con índices por plugin, URL, riesgo y ejecución, y responde en
+milisegundos a "nuevas desde la última ejecución", "corregidas desde la última
+ejecución" y "evolución del riesgo en las últimas N ejecuciones".
+
+Uso:
+    python alert_store.py alerts.db --new
+    python alert_store.py alerts.db --trend 10
+"""
+
+import argparse
+import sqlite3
+import time
+
+RISK_LEVELS = {"Informational": 0, "Low": 1, "Medium": 2, "High": 3}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    target TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    plugin_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    param TEXT NOT NULL,
+    risk TEXT NOT NULL,
+    risk_level INTEGER NOT NULL,
+    alert TEXT,
+    confidence TEXT,
+    cweid TEXT,
+    sample_url TEXT,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, plugin_id, url, param, risk)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS run_risks (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    risk_level INTEGER NOT NULL,
+    findings INTEGER NOT NULL,
+    occurrences INTEGER NOT NULL,
+    PRIMARY KEY (run_id, risk_level)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_findings_plugin ON findings (plugin_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_url ON findings (url, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_risk ON findings (run_id, risk_level);
+"""
+
+# Findings of run :a whose key does not appear in run :b; idx_findings_url makes
+# the NOT EXISTS probe an index lookup
+_DIFF = """
+SELECT plugin_id, alert, risk, url, param, count
+FROM findings AS current
+WHERE current.run_id = :a
+  AND NOT EXISTS (
+      SELECT 1 FROM findings AS other
+      WHERE other.run_id = :b AND other.plugin_id = current.plugin_id AND other.url = current.url
+        AND other.param = current.param AND other.risk = current.risk)
+ORDER BY risk_level DESC, count DESC, url
+"""
+
+
+class AlertStore:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_run(self, records, target=None):
+        """Store one run's aggregated alert records and return its run ID"""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, target) VALUES (?, ?)",
+                (time.strftime("%Y-%m-%dT%H:%M:%S"), target))
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO findings (run_id, plugin_id, url, param, risk, risk_level, alert, confidence,"
+                " cweid, sample_url, count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (run_id, plugin_id, url, param, risk) DO UPDATE SET count = count + excluded.count",
+                ((run_id, str(record["pluginId"]), record["url"], record["param"] or "", record["risk"],
+                  RISK_LEVELS.get(record["risk"], -1), record.get("alert"), record.get("confidence"),
+                  record.get("cweid"), record.get("sample_url"), record["count"]) for record in records))
+            # Per-run totals written once here keep trend queries independent of findings volume
+            self.connection.execute(
+                "INSERT INTO run_risks (run_id, risk_level, findings, occurrences)"
+                " SELECT run_id, risk_level, COUNT(*), SUM(count) FROM findings WHERE run_id = ?"
+                " GROUP BY risk_level", (run_id,))
+        return run_id
+
+    def run_ids(self, limit=None):
+        """Most recent run IDs first"""
+        query = "SELECT id FROM runs ORDER BY id DESC"
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        return [row["id"] for row in self.connection.execute(query, params)]
+
+    def _last_two(self, run_id):
+        if run_id is None:
+            ids = self.run_ids(2)
+        else:
+            ids = [run_id] + [row["id"] for row in self.connection.execute(
+                "SELECT id FROM runs WHERE id < ? ORDER BY id DESC LIMIT 1", (run_id,))]
+        if not ids:
+            return None, None
+        return ids[0], ids[1] if len(ids) > 1 else None
+
+    def new_since_last(self, run_id=None):
+        """Findings of run_id (default: latest) absent from the run before it"""
+        current, previous = self._last_two(run_id)
+        if current is None:
+            return []
+        return [dict(row) for row in self.connection.execute(_DIFF, {"a": current, "b": previous})]
+
+    def fixed_since_last(self, run_id=None):
+        """Findings of the previous run that run_id (default: latest) no longer has"""
+        current, previous = self._last_two(run_id)
+        if previous is None:
+            return []
+        return [dict(row) for row in self.connection.execute(_DIFF, {"a": previous, "b": current})]
+
+    def resolve_run(self, run_id):
+        """run_id itself, or the latest run ID when it is None"""
+        if run_id is None:
+            ids = self.run_ids(1)
+            return ids[0] if ids else None
+        return run_id
+
+    def iter_findings(self, run_id=None):
+        """Yield run_id's (default: latest) findings most severe first, straight off the cursor"""
+        run_id = self.resolve_run(run_id)
+        if run_id is None:
+            return
+        cursor = self.connection.execute("""
+            SELECT plugin_id AS pluginId, alert, risk, confidence, cweid, url, param, sample_url, count
+            FROM findings WHERE run_id = ?
+            ORDER BY risk_level DESC, count DESC, url
+        """, (run_id,))
+        for row in cursor:
+            yield dict(row)
+
+    def risk_totals(self, run_id=None):
+        """{risk: {"findings", "occurrences"}} for run_id (default: latest)"""
+        run_id = self.resolve_run(run_id)
+        names = {level: risk for risk, level in RISK_LEVELS.items()}
+        totals = {risk: {"findings": 0, "occurrences": 0} for risk in RISK_LEVELS}
+        for row in self.connection.execute(
+                "SELECT risk_level, findings, occurrences FROM run_risks WHERE run_id = ?", (run_id,)):
+            if row["risk_level"] in names:
+                totals[names[row["risk_level"]]] = {"findings": row["findings"], "occurrences": row["occurrences"]}
+        return totals
+
+    def alert_types(self, run_id=None):
+        """One row per (plugin, risk) of run_id (default: latest) with its route and occurrence totals"""
+        run_id = self.resolve_run(run_id)
+        return [dict(row) for row in self.connection.execute("""
+            SELECT plugin_id AS pluginId, MAX(alert) AS alert, risk, MAX(cweid) AS cweid,
+                   COUNT(DISTINCT url) AS routes, SUM(count) AS occurrences
+            FROM findings WHERE run_id = ?
+            GROUP BY plugin_id, risk
+            ORDER BY MAX(risk_level) DESC, occurrences DESC
+        """, (run_id,))]
+
+    def risk_trend(self, runs=10):
+        """[{run_id, started_at, High, Medium, Low, Informational}] oldest first
+
+        Values are distinct findings per risk level.
+        """
+        rows = self.connection.execute("""
+            SELECT runs.id AS run_id, runs.started_at, run_risks.risk_level, run_risks.findings
+            FROM (SELECT id, started_at FROM runs ORDER BY id DESC LIMIT ?) AS runs
+            LEFT JOIN run_risks ON run_risks.run_id = runs.id
+            ORDER BY runs.id
+        """, (runs,))
+        names = {level: risk for risk, level in RISK_LEVELS.items()}
+        trend = {}
+        for row in rows:
+            point = trend.setdefault(row["run_id"], dict({"run_id": row["run_id"], "started_at": row["started_at"]},
+                                                         **{risk: 0 for risk in RISK_LEVELS}))
+            if row["risk_level"] in names:
+                point[names[row["risk_level"]]] = row["findings"]
+        return list(trend.values())
+
+
+def print_diff(title, findings, limit=20):
+    print(f"{title}: {len(findings)}")
+    for finding in findings[:limit]:
+        param = f" [{finding['param']}]" if finding["param"] else ""
+        print(f"- {finding['alert']} (Risk: {finding['risk']}) x{finding['count']} | URL: {finding['url']}{param}")
+    if len(findings) > limit:
+        print(f"- ... {len(findings) - limit} more")
+
+
+def print_trend(trend):
+    risks = sorted(RISK_LEVELS, key=RISK_LEVELS.get, reverse=True)
+    print(f"   {'run':>5}  {'started':<19}" + "".join(f"{risk:>15}" for risk in risks))
+    for point in trend:
+        print(f"   {point['run_id']:>5}  {point['started_at']:<19}"
+              + "".join(f"{point[risk]:>15}" for risk in risks))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the ZAP alert history")
+    parser.add_argument("database")
+    parser.add_argument("--new", action="store_true", help="findings new since the previous run")
+    parser.add_argument("--fixed", action="store_true", help="findings fixed since the previous run")
+    parser.add_argument("--trend", type=int, metavar="N", help="risk trend over the last N runs")
+    args = parser.parse_args()
+
+    with AlertStore(args.database) as store:
+        if args.new:
+            print_diff("New since last run", store.new_since_last())
+        if args.fixed:
+            print_diff("Fixed since last run", store.fixed_since_last())
+        if args.trend:
+            print_trend(store.risk_trend(args.trend))
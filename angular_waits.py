@@ -0,0 +1,166 @@
+"""
+Esperas guiadas por eventos para las pruebas de Selenium sobre Angular
+
+En lugar de time.sleep, cada paso espera a que la aplicación esté realmente
+ociosa: la API de testability de Angular (zona estable, sin macrotareas
+pendientes) y un contador de peticiones HTTP en curso que se instala en la
+página antes de que arranque Angular (XMLHttpRequest y fetch). La espera se
+resuelve en el navegador con callbacks, sin sondeo desde Python, y cada una
+queda registrada con su duración.
+"""
+
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+DEFAULT_TIMEOUT = 10
+
+# Counts in-flight XHR/fetch requests and fires "selenium-http-idle" when the
+# count drops back to zero. Installed before any page script when the driver
+# supports CDP, otherwise injected right after navigation.
+HTTP_TRACKER = """
+(function () {
+  if (window.__seleniumHttp) { return; }
+  var tracker = window.__seleniumHttp = { pending: 0 };
+  function started() { tracker.pending++; }
+  function finished() {
+    tracker.pending = Math.max(0, tracker.pending - 1);
+    if (tracker.pending === 0) { window.dispatchEvent(new Event('selenium-http-idle')); }
+  }
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    started();
+    this.addEventListener('loadend', finished, { once: true });
+    return send.apply(this, arguments);
+  };
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function () {
+      started();
+      return fetch.apply(this, arguments).finally(finished);
+    };
+  }
+})();
+"""
+
+# Async script: resolves once every Angular root is stable and no HTTP request
+# is in flight at the same moment, or with ready=false at the deadline.
+WAIT_FOR_IDLE = """
+var timeoutMs = arguments[0];
+var done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+var tracker = window.__seleniumHttp || { pending: 0 };
+var finished = false;
+
+function finish(ready, reason) {
+  if (finished) { return; }
+  finished = true;
+  done({ ready: ready, reason: reason, pendingHttp: tracker.pending,
+         angular: typeof window.getAllAngularTestabilities === 'function' });
+}
+
+function check() {
+  if (finished) { return; }
+  if (Date.now() > deadline) { return finish(false, 'timeout'); }
+  if (document.readyState !== 'complete') {
+    return window.addEventListener('load', check, { once: true });
+  }
+  if (tracker.pending > 0) {
+    return window.addEventListener('selenium-http-idle', check, { once: true });
+  }
+  if (typeof window.getAllAngularTestabilities !== 'function') {
+    // Angular has not bootstrapped yet (or this is not an Angular page)
+    if (!document.querySelector('[ng-version]') && document.querySelector('app-root') === null) {
+      return finish(true, 'no-angular');
+    }
+    return setTimeout(check, 10);
+  }
+  var testabilities = window.getAllAngularTestabilities();
+  if (testabilities.length === 0) { return setTimeout(check, 10); }
+  var remaining = testabilities.length;
+  testabilities.forEach(function (testability) {
+    testability.whenStable(function () {
+      if (--remaining === 0) {
+        // Response handlers may have started new requests: re-check both signals
+        if (tracker.pending === 0 && testabilities.every(function (t) { return t.isStable(); })) {
+          finish(true, 'stable');
+        } else {
+          check();
+        }
+      }
+    });
+  });
+}
+
+setTimeout(function () { finish(false, 'timeout'); }, timeoutMs);
+check();
+"""
+
+
+class WaitRecord:
+    __slots__ = ("label", "duration", "ready", "reason")
+
+    def __init__(self, label, duration, ready, reason):
+        self.label = label
+        self.duration = duration
+        self.ready = ready
+        self.reason = reason
+
+
+class AngularWaits:
+    """Wait for an Angular page to go idle and record every wait
+
+    wait() returns the WaitRecord; a wait that times out does not raise, so
+    the next assertion reports the actual problem.
+    """
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.timeout = timeout
+        self.records = []
+        self.preinstalled = False
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": HTTP_TRACKER})
+                self.preinstalled = True
+            except Exception:
+                pass
+        # Leave slack over the in-page deadline so the script, not Selenium, times out
+        driver.set_script_timeout(timeout + 5)
+
+    def get(self, url, label=None):
+        """Navigate and wait until the app has bootstrapped and loaded its data"""
+        self.driver.get(url)
+        if not self.preinstalled:
+            self.driver.execute_script(HTTP_TRACKER)
+        return self.wait(label or f"load {url}")
+
+    def wait(self, label, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        if timeout > self.timeout:
+            self.driver.set_script_timeout(timeout + 5)
+        start = time.perf_counter()
+        try:
+            state = self.driver.execute_async_script(WAIT_FOR_IDLE, int(timeout * 1000))
+            ready, reason = state["ready"], state["reason"]
+        except (JavascriptException, TimeoutException) as e:
+            ready, reason = False, type(e).__name__
+        record = WaitRecord(label, time.perf_counter() - start, ready, reason)
+        self.records.append(record)
+        return record
+
+    def click(self, element, label):
+        element.click()
+        return self.wait(label)
+
+    @property
+    def total(self):
+        return sum(record.duration for record in self.records)
+
+
+def print_wait_summary(records):
+    print(f"   {'wait':<36} {'ms':>9}  state")
+    for record in records:
+        marker = "✅" if record.ready else "⏱️ "
+        print(f"   {record.label:<36} {record.duration * 1000:9.1f}  {marker} {record.reason}")
+    print(f"   {'total':<36} {sum(record.duration for record in records) * 1000:9.1f}")
@@ -0,0 +1,178 @@
+"""
+Planificador de comprobaciones con dependencias
+
+Cada comprobación declara de qué otras depende (por ejemplo, actualizar depende
+de crear). Las comprobaciones independientes se ejecutan en paralelo con un
+límite de hilos configurable, y tanto su salida por consola como sus resultados
+se presentan en el orden de registro, de modo que el informe es determinista.
+"""
+
+import io
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+ERROR = "error"
+
+
+class CheckResult:
+    __slots__ = ("name", "status", "value", "duration", "error")
+
+    def __init__(self, name, status, value=None, duration=0.0, error=None):
+        self.name = name
+        self.status = status
+        self.value = value
+        self.duration = duration
+        self.error = error
+
+
+class _Check:
+    __slots__ = ("name", "func", "depends_on", "after")
+
+    def __init__(self, name, func, depends_on, after):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.after = tuple(after)
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """Route print() from worker threads into per-check buffers"""
+
+    def __init__(self, target):
+        self.target = target
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.target).write(text)
+
+    def flush(self):
+        self.target.flush()
+
+
+class CheckScheduler:
+    """Run checks concurrently while honouring their declared dependencies
+
+    A check passes when func returns a truthy value and fails when it returns
+    a falsy one, None included; an exception is an error. depends_on lists
+    checks whose results are passed to func positionally; if any of them did
+    not pass the check is skipped.
+    after lists checks that must merely finish first, whatever their outcome.
+    on_result(result, output) is called for every check, in registration
+    order, as soon as its output is printed.
+    """
+
+    def __init__(self, max_workers=4, on_result=None):
+        self.max_workers = max_workers
+        self.on_result = on_result
+        self._checks = {}
+
+    def add(self, name, func, depends_on=(), after=()):
+        if name in self._checks:
+            raise ValueError(f"Duplicate check: {name}")
+        self._checks[name] = _Check(name, func, depends_on, after)
+        return self
+
+    def _validate(self):
+        for check in self._checks.values():
+            for dependency in check.depends_on + check.after:
+                if dependency not in self._checks:
+                    raise ValueError(f"{check.name} depends on unknown check {dependency}")
+
+        # Kahn's algorithm: anything left unvisited sits on a cycle
+        remaining = {name: len(set(c.depends_on + c.after)) for name, c in self._checks.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for other in self._checks.values():
+                if name in other.depends_on or name in other.after:
+                    remaining[other.name] -= 1
+                    if remaining[other.name] == 0:
+                        ready.append(other.name)
+        if visited != len(self._checks):
+            raise ValueError("Check dependencies contain a cycle")
+
+    def _execute(self, check, args, stdout):
+        buffer = io.StringIO()
+        stdout.local.buffer = buffer
+        start = time.perf_counter()
+        try:
+            value = check.func(*args)
+            # A check passes only by returning a truthy value; None (e.g. an except
+            # branch that printed an error and fell through) is a failure
+            status = PASSED if value else FAILED
+            result = CheckResult(check.name, status, value, time.perf_counter() - start)
+        except Exception as e:
+            print(f"❌ {check.name} raised {type(e).__name__}: {e}")
+            result = CheckResult(check.name, ERROR, None, time.perf_counter() - start, e)
+        finally:
+            stdout.local.buffer = None
+        return result, buffer.getvalue()
+
+    def _emit(self, result, output, stdout):
+        stdout.write(output)
+        if self.on_result is not None:
+            self.on_result(result, output)
+
+    def run(self):
+        """Run every check and return {name: CheckResult} in registration order"""
+        self._validate()
+        order = list(self._checks)
+        results = {}
+        outputs = {}
+        pending = dict(self._checks)
+        running = {}
+        printed = 0
+
+        real_stdout = sys.stdout
+        stdout = _ThreadLocalStdout(real_stdout)
+        sys.stdout = stdout
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while pending or running:
+                    for name, check in list(pending.items()):
+                        if not all(d in results for d in check.depends_on + check.after):
+                            continue
+                        del pending[name]
+                        blocked = [d for d in check.depends_on if results[d].status != PASSED]
+                        if blocked:
+                            results[name] = CheckResult(name, SKIPPED, error=f"blocked by {', '.join(blocked)}")
+                            outputs[name] = ""
+                            continue
+                        args = [results[d].value for d in check.depends_on]
+                        running[executor.submit(self._execute, check, args, stdout)] = name
+
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        results[name], outputs[name] = future.result()
+
+                    # Stream output as soon as every earlier check has finished
+                    while printed < len(order) and order[printed] in results:
+                        self._emit(results[order[printed]], outputs.pop(order[printed]), real_stdout)
+                        printed += 1
+        finally:
+            sys.stdout = real_stdout
+
+        for name in order[printed:]:
+            if name in results:
+                self._emit(results[name], outputs.pop(name, ""), real_stdout)
+        return {name: results[name] for name in order}
+
+
+def print_summary(results):
+    """Print one line per check with its outcome and duration"""
+    markers = {PASSED: "✅", FAILED: "❌", ERROR: "❌", SKIPPED: "⏭️ "}
+    for result in results.values():
+        detail = f" ({result.error})" if result.status == SKIPPED else ""
+        print(f"   {markers[result.status]} {result.name:<24} {result.status:<8} "
+              f"{result.duration * 1000:8.1f} ms{detail}")
@@ -0,0 +1,180 @@
+"""
+Matriz de preflight CORS
+
+Envía peticiones OPTIONS de preflight para todas las combinaciones de origen ×
+método × cabecera solicitada × endpoint en paralelo, decide para cada una si un
+navegador permitiría la petición real y agrupa las combinaciones que reciben la
+misma política en una única fila de la tabla.
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+
+import requests
+
+import http_client
+
+DEFAULT_ENDPOINTS = ["/api/teachers", "/api/teachers/1", "/api/teachers/search", "/api/teachers/batch"]
+TRUSTED_ORIGINS = ["http://localhost:4200", "http://localhost:4201"]
+UNTRUSTED_ORIGINS = ["http://malicious-site.com", "https://attacker.example", "null"]
+DEFAULT_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD"]
+DEFAULT_REQUEST_HEADERS = [None, "Content-Type", "Authorization", "X-Requested-With", "X-Custom-Header"]
+
+# Methods a browser never needs listed in Access-Control-Allow-Methods
+SAFELISTED_METHODS = {"GET", "HEAD", "POST"}
+
+
+def _split(value):
+    return {item.strip().lower() for item in (value or "").split(",") if item.strip()}
+
+
+class PreflightResult:
+    __slots__ = ("endpoint", "origin", "method", "header", "status", "allowed", "policy", "error")
+
+    def __init__(self, endpoint, origin, method, header, status=None, allowed=False, policy=None, error=None):
+        self.endpoint = endpoint
+        self.origin = origin
+        self.method = method
+        self.header = header
+        self.status = status
+        self.allowed = allowed
+        self.policy = policy
+        self.error = error
+
+
+def preflight_allows(origin, method, header, status, headers):
+    """Whether a browser would go on with the actual request after this preflight"""
+    if not 200 <= status < 300:
+        return False
+    allow_origin = headers.get("Access-Control-Allow-Origin")
+    if allow_origin not in ("*", origin):
+        return False
+    allowed_methods = _split(headers.get("Access-Control-Allow-Methods"))
+    if method not in SAFELISTED_METHODS and "*" not in allowed_methods and method.lower() not in allowed_methods:
+        return False
+    allowed_headers = _split(headers.get("Access-Control-Allow-Headers"))
+    if header and "*" not in allowed_headers and header.lower() not in allowed_headers:
+        return False
+    return True
+
+
+def policy_signature(origin, header, status, headers):
+    """The policy a preflight answer expresses, with echoed values abstracted
+
+    A server reflecting the Origin or the requested header gives the same
+    policy to every combination, so those echoes are replaced by markers.
+    """
+    allow_origin = headers.get("Access-Control-Allow-Origin")
+    if allow_origin is not None and allow_origin == origin and origin != "*":
+        allow_origin = "<origin>"
+    allow_headers = headers.get("Access-Control-Allow-Headers")
+    if header and allow_headers and allow_headers.strip().lower() == header.lower():
+        allow_headers = "<requested>"
+    elif not header and allow_headers is None and allow_origin is not None:
+        # Nothing was requested, so an echoing server has nothing to echo
+        allow_headers = "<requested>"
+    allow_methods = ",".join(sorted(_split(headers.get("Access-Control-Allow-Methods")))).upper()
+    return (status, allow_origin, allow_methods or None, allow_headers,
+            headers.get("Access-Control-Allow-Credentials"), headers.get("Access-Control-Max-Age"))
+
+
+class CorsMatrix:
+    """Probe every origin × method × request header × endpoint concurrently"""
+
+    def __init__(self, base_url="http://localhost:8080", endpoints=DEFAULT_ENDPOINTS,
+                 origins=TRUSTED_ORIGINS + UNTRUSTED_ORIGINS, methods=DEFAULT_METHODS,
+                 request_headers=DEFAULT_REQUEST_HEADERS, workers=32, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.endpoints = list(endpoints)
+        self.origins = list(origins)
+        self.methods = list(methods)
+        self.request_headers = list(request_headers)
+        self.workers = workers
+        self.session = session or http_client.create_session(pool_maxsize=workers)
+
+    def probe(self, endpoint, origin, method, header):
+        headers = {"Origin": origin, "Access-Control-Request-Method": method}
+        if header:
+            headers["Access-Control-Request-Headers"] = header
+        try:
+            response = self.session.options(f"{self.base_url}{endpoint}", headers=headers)
+        except requests.exceptions.RequestException as e:
+            return PreflightResult(endpoint, origin, method, header, error=type(e).__name__)
+        return PreflightResult(
+            endpoint, origin, method, header, response.status_code,
+            preflight_allows(origin, method, header, response.status_code, response.headers),
+            policy_signature(origin, header, response.status_code, response.headers))
+
+    def run(self):
+        """Probe the whole matrix and return {"probes", "elapsed", "rows"}
+
+        Each row is one policy with the set of endpoints, origins, methods and
+        request headers it was returned for.
+        """
+        combinations = list(product(self.endpoints, self.origins, self.methods, self.request_headers))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(lambda combination: self.probe(*combination), combinations))
+        elapsed = time.perf_counter() - start
+
+        groups = {}
+        for result in results:
+            key = (result.allowed, result.policy, result.error)
+            row = groups.get(key)
+            if row is None:
+                status, allow_origin, allow_methods, allow_headers, credentials, max_age = \
+                    result.policy or (None,) * 6
+                row = groups[key] = {
+                    "allowed": result.allowed, "status": status, "error": result.error,
+                    "allow_origin": allow_origin, "allow_methods": allow_methods,
+                    "allow_headers": allow_headers, "credentials": credentials, "max_age": max_age,
+                    "count": 0, "endpoints": set(), "origins": set(), "methods": set(), "headers": set(),
+                }
+            row["count"] += 1
+            row["endpoints"].add(result.endpoint)
+            row["origins"].add(result.origin)
+            row["methods"].add(result.method)
+            row["headers"].add(result.header or "-")
+
+        rows = sorted(groups.values(), key=lambda row: (not row["allowed"], -row["count"]))
+        return {"probes": len(results), "elapsed": elapsed, "rows": rows}
+
+    def describe(self, values, dimension):
+        """Compact text for one dimension of a row, "all" when nothing is missing"""
+        full = {value or "-" for value in getattr(self, dimension)}
+        if values == full:
+            return "all"
+        return ",".join(sorted(values))
+
+
+def print_matrix(matrix, report):
+    """Print the collapsed matrix in the testers' console style"""
+    rate = report["probes"] / report["elapsed"] if report["elapsed"] > 0 else 0.0
+    print(f"   {report['probes']} preflight combinations in {report['elapsed']:.2f}s "
+          f"({rate:.0f} req/s), {len(report['rows'])} distinct policies")
+    for row in report["rows"]:
+        marker = "✅ allowed" if row["allowed"] else "🚫 denied "
+        answer = row["error"] or (f"{row['status']} origin={row['allow_origin']} "
+                                  f"methods={row['allow_methods']} headers={row['allow_headers']}")
+        if row["credentials"]:
+            answer += f" credentials={row['credentials']}"
+        print(f"   {marker} {row['count']:>5}  endpoints={matrix.describe(row['endpoints'], 'endpoints')} "
+              f"origins={matrix.describe(row['origins'], 'origins')} "
+              f"methods={matrix.describe(row['methods'], 'methods')} "
+              f"request-headers={matrix.describe(row['headers'], 'request_headers')}")
+        print(f"                {answer}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Probe CORS preflight answers for every combination")
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--origins", nargs="+", default=TRUSTED_ORIGINS + UNTRUSTED_ORIGINS)
+    parser.add_argument("--methods", nargs="+", default=DEFAULT_METHODS)
+    parser.add_argument("--workers", type=int, default=32, help="preflight requests in flight")
+    args = parser.parse_args()
+
+    matrix = CorsMatrix(args.base_url, args.endpoints, args.origins, args.methods, workers=args.workers)
+    print_matrix(matrix, matrix.run())
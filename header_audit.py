@@ -0,0 +1,243 @@
+"""
+Auditoría de cabeceras de seguridad sobre todas las URLs descubiertas
+
+Recibe el conjunto de URLs (del spider de ZAP o de una lista de rutas), agrupa
+las que corresponden a la misma ruta (IDs numéricos, nombres de assets con hash)
+y envía peticiones HEAD en paralelo, recurriendo a GET cuando el servidor no
+admite HEAD. Los resultados se guardan por ruta y tipo de contenido en un
+fichero de caché junto con su ETag/Last-Modified, de modo que en ejecuciones posteriores un 304 reutiliza
+el resultado anterior y solo se vuelven a analizar las rutas que han cambiado.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+import http_client
+
+SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block',
+    'Strict-Transport-Security': 'max-age=31536000',
+    'Content-Security-Policy': "default-src 'self'",
+    'Referrer-Policy': 'no-referrer',
+}
+
+# HEAD answers that mean "try again with GET"; any other status is recorded as is
+HEAD_UNSUPPORTED = (405, 501)
+
+_NUMERIC_SEGMENT = re.compile(r"^\d+$")
+_HASHED_ASSET = re.compile(r"^(?P<name>[\w-]+)[.-][0-9a-f]{8,}(?P<ext>(?:\.[\w]+)+)$")
+
+
+def route_key(url):
+    """Collapse URLs served by the same route: /api/teachers/7 -> /api/teachers/{id}"""
+    parts = urlsplit(url)
+    segments = []
+    for segment in parts.path.split("/"):
+        if _NUMERIC_SEGMENT.match(segment):
+            segment = "{id}"
+        else:
+            match = _HASHED_ASSET.match(segment)
+            if match:
+                segment = f"{match.group('name')}.*{match.group('ext')}"
+        segments.append(segment)
+    query = "&".join(sorted(pair.split("=")[0] for pair in parts.query.split("&") if pair))
+    return urlunsplit((parts.scheme, parts.netloc, "/".join(segments) or "/", query, ""))
+
+
+def content_kind(content_type):
+    """Coarse content type used to group the coverage summary"""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if "html" in content_type:
+        return "html"
+    if "json" in content_type:
+        return "json"
+    if "javascript" in content_type:
+        return "javascript"
+    if content_type.startswith("text/css"):
+        return "css"
+    if content_type.startswith(("image/", "font/")):
+        return "media"
+    return content_type or "unknown"
+
+
+class HeaderAuditor:
+    """Check the security headers of many routes concurrently, with a route cache
+
+    The cache is {route: {content kind: entry}}: one route can answer with
+    different representations (e.g. JSON from the API, HTML from an SPA
+    fallback), and a 304 must reuse the one the server confirmed.
+    """
+
+    def __init__(self, workers=16, cache_path=None, session=None):
+        self.workers = workers
+        self.cache_path = cache_path
+        self.session = session or http_client.create_session(pool_maxsize=workers)
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as cache_file:
+                self.cache = json.load(cache_file)
+        for route, cached in self.cache.items():
+            # Cache files written before entries were kept per content kind
+            if "route" in cached:
+                self.cache[route] = {content_kind(cached["content_type"]): cached}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        temporary = f"{self.cache_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as cache_file:
+            json.dump(self.cache, cache_file, indent=1, sort_keys=True)
+        os.replace(temporary, self.cache_path)
+
+    def _request(self, url, cached):
+        headers = {}
+        if cached:
+            etags = [entry["etag"] for entry in cached.values() if entry.get("etag")]
+            if etags:
+                headers["If-None-Match"] = ", ".join(etags)
+            # A date cannot tell representations apart: only send it for a single one
+            if len(cached) == 1:
+                entry = next(iter(cached.values()))
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.session.head(url, headers=headers, allow_redirects=True)
+        method = "HEAD"
+        if response.status_code in HEAD_UNSUPPORTED:
+            # stream=True: only the headers are needed, the body is never read
+            response = self.session.get(url, headers=headers, allow_redirects=True, stream=True)
+            response.close()
+            method = "GET"
+        return response, method
+
+    @staticmethod
+    def _revalidated(cached, response):
+        """The cached entry a 304 confirms, or None when it cannot tell which"""
+        etag = response.headers.get("ETag")
+        if etag:
+            return next((entry for entry in cached.values() if entry.get("etag") == etag), None)
+        if response.headers.get("Content-Type"):
+            return cached.get(content_kind(response.headers["Content-Type"]))
+        return next(iter(cached.values())) if len(cached) == 1 else None
+
+    def probe(self, route, url):
+        """Return (entry, reused) for one route"""
+        cached = self.cache.get(route)
+        try:
+            response, method = self._request(url, cached)
+            if response.status_code == 304 and cached:
+                entry = self._revalidated(cached, response)
+                if entry is not None:
+                    return entry, True
+                response, method = self._request(url, None)
+        except requests.exceptions.RequestException as e:
+            return {"route": route, "url": url, "error": type(e).__name__}, False
+
+        entry = {
+            "route": route,
+            "url": url,
+            "method": method,
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", ""),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "headers": {name: response.headers.get(name) for name in SECURITY_HEADERS},
+        }
+        return entry, False
+
+    def audit(self, urls):
+        """Audit every distinct route among urls and return the report dict"""
+        routes = {}
+        for url in urls:
+            routes.setdefault(route_key(url), url)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(lambda item: self.probe(*item), routes.items()))
+        elapsed = time.perf_counter() - start
+
+        entries = []
+        reused = 0
+        for entry, from_cache in results:
+            entries.append(entry)
+            reused += from_cache
+            if "error" not in entry:
+                self.cache.setdefault(entry["route"], {})[content_kind(entry["content_type"])] = entry
+        self._save_cache()
+
+        return {
+            "urls": len(urls),
+            "routes": len(routes),
+            "reused": reused,
+            "elapsed": elapsed,
+            "entries": entries,
+            "coverage": self.coverage(entries),
+        }
+
+    @staticmethod
+    def coverage(entries):
+        """{content kind: {"routes": n, header: routes carrying it}}"""
+        summary = {}
+        for entry in entries:
+            if "error" in entry:
+                continue
+            kind = summary.setdefault(content_kind(entry["content_type"]),
+                                      dict({"routes": 0}, **{name: 0 for name in SECURITY_HEADERS}))
+            kind["routes"] += 1
+            for name, value in entry["headers"].items():
+                if value is not None:
+                    kind[name] += 1
+        return summary
+
+
+def missing_headers(report):
+    """Security headers that at least one audited route does not send"""
+    return [name for name in SECURITY_HEADERS
+            if any(counts[name] < counts["routes"] for counts in report["coverage"].values())]
+
+
+def errored_routes(report):
+    return [entry["route"] for entry in report["entries"] if "error" in entry]
+
+
+def print_audit(report):
+    """Print per-route gaps and the per-header coverage table"""
+    print(f"   {report['urls']} URLs -> {report['routes']} routes in {report['elapsed']:.2f}s "
+          f"({report['reused']} unchanged, reused from cache)")
+    for entry in sorted(report["entries"], key=lambda entry: entry["route"]):
+        if "error" in entry:
+            print(f"   ❌ {entry['route']}: {entry['error']}")
+            continue
+        missing = [name for name in SECURITY_HEADERS if entry["headers"].get(name) is None]
+        if missing:
+            print(f"   ⚠️  {entry['route']} [{content_kind(entry['content_type'])}] "
+                  f"missing {', '.join(missing)}")
+
+    print(f"   {'header':<28}" + "".join(f"{kind:>12}" for kind in report["coverage"]))
+    for name in SECURITY_HEADERS:
+        cells = ["{}/{}".format(counts[name], counts["routes"]) for counts in report["coverage"].values()]
+        print(f"   {name:<28}" + "".join(f"{cell:>12}" for cell in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit security headers across many URLs")
+    parser.add_argument("urls", nargs="*", help="URLs to audit")
+    parser.add_argument("--routes-file", help="file with one URL per line")
+    parser.add_argument("--cache", help="JSON file keeping per-route results between runs")
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.routes_file:
+        with open(args.routes_file, encoding="utf-8") as routes_file:
+            urls.extend(line.strip() for line in routes_file if line.strip() and not line.startswith("#"))
+    print_audit(HeaderAuditor(args.workers, args.cache).audit(urls))
@@ -0,0 +1,179 @@
+"""
+Cliente HTTP compartido para los scripts de pruebas
+
+Todos los testers (integración, seguridad Spring Boot y OWASP ZAP) usan la misma
+sesión de requests con conexiones keep-alive reutilizables, timeouts por defecto
+y reintentos con backoff exponencial para errores transitorios.
+
+La sesión compartida guarda además una caché LRU de respuestas GET con ETag,
+acotada en número de entradas y en bytes de cuerpo, y las revalida con
+If-None-Match, de modo que un 304 evita volver a descargar el cuerpo.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.3
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_CACHE_SIZE = 256
+# Response bodies kept by the shared session's cache: a few pages of teachers,
+# not a copy of every page a paged listing walks through
+DEFAULT_CACHE_BYTES = 4 * 1024 * 1024
+
+# Only gateway-style failures are retried: a 500 from the backend is a test
+# signal (e.g. in the SQL injection check) and must reach the caller untouched.
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# Headers describing the (empty) 304 body must not overwrite the cached ones
+BODY_HEADERS = ("content-length", "content-encoding", "transfer-encoding")
+
+
+class PooledSession(requests.Session):
+    """requests.Session with a default timeout and an optional ETag cache
+
+    With cache_size > 0, GET responses carrying an ETag are kept in an LRU
+    cache of at most cache_size entries and, when cache_bytes is set, that
+    many bytes of body; a larger body is not cached. Later GETs for the same
+    URL and headers send If-None-Match and a 304 answer is served from the
+    cache as a 200 with from_cache set.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, cache_size=0, cache_bytes=None):
+        super().__init__()
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.cache_hits = 0
+        self._cache = OrderedDict()
+        self._cache_total = 0
+        self._cache_lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        if not self.cache_size or method.upper() != "GET" or kwargs.get("stream"):
+            return super().request(method, url, **kwargs)
+
+        key = self._cache_key(url, kwargs)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+
+        if cached is not None:
+            headers = dict(kwargs.get("headers") or {})
+            headers["If-None-Match"] = cached.headers["ETag"]
+            kwargs["headers"] = headers
+
+        response = super().request(method, url, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            with self._cache_lock:
+                # Headers sent with a 304 replace the stored ones (RFC 9111 §4.3.4)
+                for name, value in response.headers.items():
+                    if name.lower() not in BODY_HEADERS:
+                        cached.headers[name] = value
+                headers = cached.headers.copy()
+                self.cache_hits += 1
+            fresh = copy.copy(cached)
+            fresh.headers = headers
+            fresh.elapsed = response.elapsed
+            fresh.from_cache = True
+            return fresh
+
+        if response.status_code == 200 and "ETag" in response.headers:
+            # Read the body now so the cached copy is complete
+            size = len(response.content)
+            response.from_cache = False
+            with self._cache_lock:
+                self._evict(key)
+                if self.cache_bytes is None or size <= self.cache_bytes:
+                    self._cache[key] = response
+                    self._cache_total += size
+                    while len(self._cache) > self.cache_size or (
+                            self.cache_bytes is not None and self._cache_total > self.cache_bytes):
+                        self._evict(next(iter(self._cache)))
+        elif cached is not None:
+            with self._cache_lock:
+                self._evict(key)
+        return response
+
+    def _evict(self, key):
+        """Drop key from the cache if present; the caller holds the lock"""
+        response = self._cache.pop(key, None)
+        if response is not None:
+            self._cache_total -= len(response.content)
+
+    @staticmethod
+    def _cache_key(url, kwargs):
+        # Request headers are part of the key: an Origin header, for instance,
+        # changes the CORS headers of the response
+        prepared = requests.Request("GET", url, params=kwargs.get("params")).prepare()
+        headers = tuple(sorted((str(k).lower(), str(v)) for k, v in (kwargs.get("headers") or {}).items()))
+        return prepared.url, headers
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_total = 0
+
+
+def create_session(timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                   backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                   pool_connections=DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize=DEFAULT_POOL_MAXSIZE, cache_size=0, cache_bytes=None):
+    """Create a session with keep-alive pools and retry-with-backoff
+
+    pool_connections is the number of hosts whose pools are kept alive and
+    pool_maxsize the number of connections kept per host. cache_size enables
+    the conditional-GET response cache, cache_bytes bounds the bodies it
+    keeps; benchmarks leave it off.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = PooledSession(timeout=timeout, cache_size=cache_size, cache_bytes=cache_bytes)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide session shared by all testers"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session(cache_size=DEFAULT_CACHE_SIZE, cache_bytes=DEFAULT_CACHE_BYTES)
+        return _shared_session
+
+
+def close_session():
+    """Close the shared session and release its pooled connections"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
@@ -0,0 +1,118 @@
+"""
+Benchmark de búsquedas indexadas frente a recorrido completo
+
+Carga profesores sintéticos en el backend y compara, para cada tamaño de datos,
+el endpoint GET /api/teachers/search (índices de email, asignatura y años de
+experiencia) con la alternativa previa: descargar el listado completo y filtrar
+en el cliente.
+"""
+
+import argparse
+import statistics
+import time
+
+import http_client
+from teacher_client import batch_create, batch_delete, iter_teachers
+
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Biology", "History", "Geography",
+            "Literature", "Art", "Music", "Computer Science", "Economics", "Philosophy",
+            "Spanish", "English", "French", "Physical Education", "Statistics", "Astronomy",
+            "Engineering", "Psychology"]
+
+
+class IndexBenchmark:
+    def __init__(self, base_url="http://localhost:8080", workers=4, repeats=5):
+        self.api_url = f"{base_url}/api/teachers"
+        self.search_url = f"{self.api_url}/search"
+        self.workers = workers
+        self.repeats = repeats
+        self.session = http_client.create_session(pool_maxsize=workers)
+        self.seeded_ids = []
+
+    def _teacher(self, index):
+        return {
+            "firstName": "Bench",
+            "lastName": f"Teacher{index}",
+            "email": f"bench.{index}@school.edu",
+            "subject": SUBJECTS[index % len(SUBJECTS)],
+            "yearsOfExperience": index % 41
+        }
+
+    def seed_to(self, size):
+        """Grow the seeded dataset until it holds size teachers"""
+        start = len(self.seeded_ids)
+        if start >= size:
+            return
+        print(f"   Seeding teachers {start}..{size - 1}")
+        teachers = (self._teacher(index) for index in range(start, size))
+        ids = batch_create(self.api_url, teachers, workers=self.workers, session=self.session)
+        self.seeded_ids.extend(teacher_id for teacher_id in ids if teacher_id is not None)
+
+    def cleanup(self):
+        print(f"   Deleting {len(self.seeded_ids)} seeded teachers")
+        batch_delete(self.api_url, self.seeded_ids, workers=self.workers, session=self.session)
+        self.seeded_ids = []
+
+    def _time(self, func):
+        samples = []
+        matches = 0
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            matches = func()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples), matches
+
+    def _indexed(self, params):
+        response = self.session.get(self.search_url, params=params)
+        response.raise_for_status()
+        return len(response.json())
+
+    def _full_scan(self, predicate):
+        return sum(1 for teacher in iter_teachers(self.api_url, page_size=1000, session=self.session)
+                   if predicate(teacher))
+
+    def run_queries(self, size):
+        probe = size // 2
+        queries = [
+            ("email", {"email": f"bench.{probe}@school.edu"},
+             lambda t: (t.get("email") or "").lower() == f"bench.{probe}@school.edu"),
+            ("subject", {"subject": "Physics"},
+             lambda t: (t.get("subject") or "").lower() == "physics"),
+            ("experience 10-12", {"minExperience": 10, "maxExperience": 12},
+             lambda t: 10 <= t.get("yearsOfExperience", -1) <= 12),
+        ]
+        rows = []
+        for name, params, predicate in queries:
+            indexed_time, indexed_matches = self._time(lambda: self._indexed(params))
+            scan_time, scan_matches = self._time(lambda: self._full_scan(predicate))
+            rows.append((name, indexed_matches, indexed_time, scan_matches, scan_time))
+        return rows
+
+    def run(self, sizes, keep=False):
+        print("Starting Indexed Search vs Full Scan Benchmark")
+        print("=" * 60)
+        try:
+            for size in sorted(sizes):
+                print(f"\n=== {size} seeded teachers ===")
+                self.seed_to(size)
+                print(f"   {'query':<18}{'matches':>9}{'indexed ms':>12}{'scan ms':>12}{'speedup':>10}")
+                for name, indexed_matches, indexed_time, scan_matches, scan_time in self.run_queries(size):
+                    marker = "" if indexed_matches == scan_matches else "  ❌ result mismatch"
+                    speedup = scan_time / indexed_time if indexed_time > 0 else float("inf")
+                    print(f"   {name:<18}{indexed_matches:>9}{indexed_time * 1000:>12.1f}"
+                          f"{scan_time * 1000:>12.1f}{speedup:>9.1f}x{marker}")
+        finally:
+            if not keep:
+                self.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare indexed search with a full client-side scan")
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=5, help="runs per query, median is reported")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent batch requests while seeding")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded teachers afterwards")
+    args = parser.parse_args()
+
+    IndexBenchmark(args.base_url, workers=args.workers, repeats=args.repeats).run(args.sizes, keep=args.keep)
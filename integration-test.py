@@ -5,21 +5,35 @@ Este script prueba la integración entre tu frontend Angular y tu backend Spring
 simulando las interacciones del usuario y verificando el flujo de datos.
 """
 
+import argparse
 import requests
 import json
 import time
 
+import http_client
+from check_scheduler import PASSED, CheckScheduler, print_summary
+from cors_matrix import CorsMatrix, print_matrix
+from teacher_client import batch_create, batch_delete, iter_teachers
+from load_generator import CrudLoadGenerator, OpenLoopBenchmark, print_report
+from result_writers import FAILED, ResultStream, add_result_arguments
+
+# Methods the Angular TeacherService sends to the backend
+FRONTEND_METHODS = ["GET", "POST", "PUT", "DELETE"]
+
 class IntegrationTester:
-    def __init__(self):
-        self.backend_url = "http://localhost:8080"
+    def __init__(self, backend_url="http://localhost:8080", frontend_url="http://localhost:4201", session=None,
+                 results=None):
+        self.backend_url = backend_url
         self.api_url = f"{self.backend_url}/api/teachers"
-        self.frontend_url = "http://localhost:4201"
+        self.frontend_url = frontend_url
+        self.session = session or http_client.get_session()
+        self.results = results or ResultStream("integration-test")
         
     def test_backend_connectivity(self):
         """Test if backend is accessible"""
         print("=== Testing Backend Connectivity ===")
         try:
-            response = requests.get(self.backend_url)
+            response = self.session.get(self.backend_url)
             if response.status_code == 200:
                 print("✅ Backend is accessible")
                 return True
@@ -34,7 +48,7 @@ class IntegrationTester:
         """Test if frontend is accessible"""
         print("\n=== Testing Frontend Connectivity ===")
         try:
-            response = requests.get(self.frontend_url)
+            response = self.session.get(self.frontend_url)
             if response.status_code == 200:
                 print("✅ Frontend is accessible")
                 return True
@@ -49,19 +63,17 @@ class IntegrationTester:
         """Test all API endpoints"""
         print("\n=== Testing API Endpoints ===")
         
-        # Test GET all teachers
+        # Test GET all teachers, streamed page by page
         try:
-            response = requests.get(self.api_url)
-            if response.status_code == 200:
-                teachers = response.json()
-                print(f"✅ GET /api/teachers successful. Found {len(teachers)} teachers")
-                return teachers
-            else:
-                print(f"❌ GET /api/teachers failed with status {response.status_code}")
-                return []
+            count = sum(1 for _ in iter_teachers(self.api_url, session=self.session))
+            print(f"✅ GET /api/teachers successful. Found {count} teachers")
+            return count
+        except requests.exceptions.HTTPError as e:
+            print(f"❌ GET /api/teachers failed with status {e.response.status_code}")
+            return None
         except Exception as e:
             print(f"❌ Error testing GET /api/teachers: {e}")
-            return []
+            return None
             
     def test_create_teacher(self):
         """Test creating a new teacher"""
@@ -76,7 +88,7 @@ class IntegrationTester:
         }
         
         try:
-            response = requests.post(self.api_url, json=new_teacher)
+            response = self.session.post(self.api_url, json=new_teacher)
             if response.status_code == 201:
                 created_teacher = response.json()
                 print(f"✅ Teacher created successfully with ID: {created_teacher.get('id')}")
@@ -106,7 +118,7 @@ class IntegrationTester:
         }
         
         try:
-            response = requests.put(f"{self.api_url}/{teacher_id}", json=updated_teacher)
+            response = self.session.put(f"{self.api_url}/{teacher_id}", json=updated_teacher)
             if response.status_code == 200:
                 print("✅ Teacher updated successfully")
                 return True
@@ -129,7 +141,7 @@ class IntegrationTester:
             return False
             
         try:
-            response = requests.delete(f"{self.api_url}/{teacher_id}")
+            response = self.session.delete(f"{self.api_url}/{teacher_id}")
             if response.status_code == 204:
                 print("✅ Teacher deleted successfully")
                 return True
@@ -149,7 +161,7 @@ class IntegrationTester:
         
         try:
             # Simulate a request from the frontend
-            response = requests.get(self.api_url, headers={
+            response = self.session.get(self.api_url, headers={
                 'Origin': self.frontend_url,
                 'Referer': f"{self.frontend_url}/"
             })
@@ -169,59 +181,187 @@ class IntegrationTester:
             print(f"❌ Error testing CORS: {e}")
             return False
             
-    def run_integration_tests(self):
-        """Run all integration tests"""
+    def test_cors_matrix(self):
+        """Check every preflight the frontend needs across all teacher endpoints"""
+        print("\n=== Testing CORS Preflight Matrix ===")
+        try:
+            matrix = CorsMatrix(self.backend_url, origins=[self.frontend_url],
+                                methods=FRONTEND_METHODS, request_headers=[None, "Content-Type"])
+            report = matrix.run()
+            print_matrix(matrix, report)
+            denied = sum(row["count"] for row in report["rows"] if not row["allowed"])
+            if denied:
+                print(f"❌ {denied} preflight combinations needed by the frontend are denied")
+                return False
+            print("✅ Every preflight needed by the frontend is allowed")
+            return True
+        except Exception as e:
+            print(f"❌ Error testing CORS matrix: {e}")
+            return False
+            
+    def verify_teacher_updated(self, teacher_id):
+        """Verify the teacher was updated by fetching it"""
+        try:
+            response = self.session.get(f"{self.api_url}/{teacher_id}")
+            if response.status_code == 200 and response.json().get('firstName') == 'Updated':
+                print("✅ Verified teacher was updated correctly")
+                return True
+            print("❌ Teacher update verification failed")
+            return False
+        except Exception as e:
+            print(f"❌ Error verifying teacher update: {e}")
+            return False
+
+    def verify_teacher_deleted(self, teacher_id):
+        """Verify the teacher was deleted"""
+        try:
+            response = self.session.get(f"{self.api_url}/{teacher_id}")
+            if response.status_code == 404:
+                print("✅ Verified teacher was deleted correctly")
+                return True
+            print("❌ Teacher deletion verification failed")
+            return False
+        except Exception as e:
+            print(f"❌ Error verifying teacher deletion: {e}")
+            return False
+
+    def run_integration_tests(self, max_workers=4, cors_matrix=False):
+        """Run all integration tests, independent checks in parallel"""
         print("Starting Integration Tests for Spring Boot + Angular Application")
         print("=" * 65)
         
-        # Test connectivity
-        backend_ok = self.test_backend_connectivity()
-        frontend_ok = self.test_frontend_connectivity()
-        
-        if not (backend_ok and frontend_ok):
-            print("\nCannot proceed with integration tests.")
-            return
-            
-        # Test API endpoints
-        teachers = self.test_api_endpoints()
-        
-        # Test CORS
-        self.test_cors_integration()
+        connectivity = ("backend_connectivity", "frontend_connectivity")
+        scheduler = CheckScheduler(max_workers, on_result=self.results.add_check)
+        scheduler.add("backend_connectivity", self.test_backend_connectivity)
+        scheduler.add("frontend_connectivity", self.test_frontend_connectivity)
+        scheduler.add("api_endpoints", lambda *_: self.test_api_endpoints() is not None,
+                      depends_on=connectivity)
+        scheduler.add("cors_integration", lambda *_: self.test_cors_integration(), depends_on=connectivity)
+        if cors_matrix:
+            scheduler.add("cors_matrix", lambda *_: self.test_cors_matrix(), depends_on=connectivity)
         
-        # Test CRUD operations
-        print("\n=== Testing CRUD Operations ===")
-        teacher_id = self.test_create_teacher()
+        # CRUD operations: each step needs the ID returned by the create step
+        scheduler.add("create_teacher", lambda *_: self.test_create_teacher(), depends_on=connectivity)
+        scheduler.add("update_teacher", self.test_update_teacher, depends_on=["create_teacher"])
+        scheduler.add("verify_update", lambda teacher_id, _: self.verify_teacher_updated(teacher_id),
+                      depends_on=["create_teacher", "update_teacher"])
+        scheduler.add("delete_teacher", self.test_delete_teacher,
+                      depends_on=["create_teacher"], after=["verify_update"])
+        scheduler.add("verify_delete", lambda teacher_id, _: self.verify_teacher_deleted(teacher_id),
+                      depends_on=["create_teacher", "delete_teacher"])
+        results = scheduler.run()
         
-        if teacher_id:
-            self.test_update_teacher(teacher_id)
-            # Verify the teacher was updated by fetching it
-            try:
-                response = requests.get(f"{self.api_url}/{teacher_id}")
-                if response.status_code == 200:
-                    teacher = response.json()
-                    if teacher.get('firstName') == 'Updated':
-                        print("✅ Verified teacher was updated correctly")
-                    else:
-                        print("❌ Teacher update verification failed")
-            except Exception as e:
-                print(f"❌ Error verifying teacher update: {e}")
-                
-            self.test_delete_teacher(teacher_id)
-            
-            # Verify the teacher was deleted
-            try:
-                response = requests.get(f"{self.api_url}/{teacher_id}")
-                if response.status_code == 404:
-                    print("✅ Verified teacher was deleted correctly")
-                else:
-                    print("❌ Teacher deletion verification failed")
-            except Exception as e:
-                print(f"❌ Error verifying teacher deletion: {e}")
+        if any(results[name].status != PASSED for name in connectivity):
+            print("\nCannot proceed with integration tests.")
+            return results
         
         print("\n" + "=" * 65)
+        print_summary(results)
         print("Integration Testing Complete")
         print("Your Spring Boot backend and Angular frontend are properly integrated!")
+        return results
+
+    def batch_seed(self, teachers, chunk_size=1000):
+        """Create many teachers through the batch endpoint and return their IDs"""
+        print("\n=== Batch Seeding Teachers ===")
+        start = time.perf_counter()
+        try:
+            ids = batch_create(self.api_url, teachers, chunk_size=chunk_size, session=self.session)
+        except Exception as e:
+            print(f"❌ Error seeding teachers: {e}")
+            return []
+        created = [teacher_id for teacher_id in ids if teacher_id is not None]
+        elapsed = time.perf_counter() - start
+        if len(created) == len(ids):
+            print(f"✅ Seeded {len(created)} teachers in {elapsed:.2f}s")
+        else:
+            print(f"❌ Only {len(created)} of {len(ids)} teachers were created")
+        return created
+
+    def batch_teardown(self, teacher_ids, chunk_size=1000):
+        """Delete many teachers through the batch endpoint"""
+        print("\n=== Batch Teardown of Teachers ===")
+        teacher_ids = list(teacher_ids)
+        start = time.perf_counter()
+        try:
+            deleted = batch_delete(self.api_url, teacher_ids, chunk_size=chunk_size, session=self.session)
+        except Exception as e:
+            print(f"❌ Error deleting teachers: {e}")
+            return 0
+        elapsed = time.perf_counter() - start
+        if deleted == len(teacher_ids):
+            print(f"✅ Deleted {deleted} teachers in {elapsed:.2f}s")
+        else:
+            print(f"⚠️  Deleted {deleted} of {len(teacher_ids)} teachers")
+        return deleted
+
+    def run_load_test(self, virtual_users=10, duration=None, iterations=None):
+        """Run the CRUD cycle concurrently with N virtual users"""
+        print("\n=== Running CRUD Load Test ===")
+        if not self.test_backend_connectivity():
+            print("\nCannot proceed with load test.")
+            return None
+
+        generator = CrudLoadGenerator(
+            self.api_url,
+            virtual_users=virtual_users,
+            duration=duration,
+            iterations=iterations
+        )
+        report = generator.run()
+        print_report(report)
+
+        errors = sum(summary["errors"] for summary in report["operations"].values())
+        if errors:
+            print(f"❌ {errors} requests failed under concurrent load")
+            self.results.record("crud_load", FAILED, report["elapsed"], f"{errors} requests failed")
+        else:
+            print("✅ All requests succeeded under concurrent load")
+            self.results.record("crud_load", PASSED, report["elapsed"])
+        return report
+
+    def run_open_loop_benchmark(self, rates, step_duration=10, max_p99_ms=None):
+        """Fire GET /api/teachers at constant rates, stepping up until saturation"""
+        print("\n=== Running Open-Loop Benchmark for GET /api/teachers ===")
+        if not self.test_backend_connectivity():
+            print("\nCannot proceed with benchmark.")
+            return None
+
+        benchmark = OpenLoopBenchmark(self.api_url, max_p99_ms=max_p99_ms)
+        result = benchmark.ramp(rates, step_duration)
+        if result["saturation_rate"] is not None:
+            print(f"⚠️  Backend saturated at {result['saturation_rate']} req/s")
+        else:
+            print("✅ Backend sustained every target rate")
+        return result
 
 if __name__ == "__main__":
-    tester = IntegrationTester()
-    tester.run_integration_tests()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Spring Boot + Angular integration tests")
+    parser.add_argument("--backend-url", default="http://localhost:8080")
+    parser.add_argument("--frontend-url", default="http://localhost:4201")
+    parser.add_argument("--workers", type=int, default=4, help="checks run concurrently")
+    parser.add_argument("--cors-matrix", action="store_true",
+                        help="also probe every preflight combination the frontend needs")
+    parser.add_argument("--load", action="store_true", help="run the concurrent CRUD load mode")
+    parser.add_argument("--users", type=int, default=10, help="virtual users for the load mode")
+    parser.add_argument("--duration", type=float, help="load mode duration in seconds")
+    parser.add_argument("--iterations", type=int, help="CRUD cycles per virtual user")
+    parser.add_argument("--rate", type=float, nargs="+",
+                        help="open-loop target rates in req/s, ramped in order")
+    parser.add_argument("--step-duration", type=float, default=10,
+                        help="seconds spent at each open-loop rate")
+    parser.add_argument("--max-p99-ms", type=float,
+                        help="p99 latency above which a rate counts as saturated")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    with ResultStream.from_args("integration-test", args) as results:
+        tester = IntegrationTester(args.backend_url, args.frontend_url, results=results)
+        if args.rate:
+            tester.run_open_loop_benchmark(args.rate, args.step_duration, args.max_p99_ms)
+        elif args.load:
+            if args.duration is None and args.iterations is None:
+                args.duration = 30
+            tester.run_load_test(args.users, duration=args.duration, iterations=args.iterations)
+        else:
+            tester.run_integration_tests(args.workers, cors_matrix=args.cors_matrix)
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Histograma de latencias estilo HDR
+
+Registra latencias en microsegundos con precisión relativa fija (por defecto
+3 cifras significativas) usando buckets logarítmicos con sub-buckets lineales,
+de modo que la memoria es constante sin importar cuántas muestras se registren.
+"""
+
+import math
+from array import array
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with bounded relative error"""
+
+    def __init__(self, lowest_trackable=1, highest_trackable=60_000_000, significant_figures=3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        if lowest_trackable < 1 or highest_trackable < 2 * lowest_trackable:
+            raise ValueError("highest_trackable must be at least twice lowest_trackable")
+
+        self.lowest_trackable = lowest_trackable
+        self.highest_trackable = highest_trackable
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self.sub_bucket_half_count_magnitude = max(sub_bucket_count_magnitude, 1) - 1
+        self.sub_bucket_count = 1 << (self.sub_bucket_half_count_magnitude + 1)
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.unit_magnitude = int(math.floor(math.log2(lowest_trackable)))
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+
+        smallest_untrackable = self.sub_bucket_count << self.unit_magnitude
+        bucket_count = 1
+        while smallest_untrackable <= highest_trackable:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self.bucket_count = bucket_count
+
+        self.counts = array("q", bytes(8 * (bucket_count + 1) * self.sub_bucket_half_count))
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self._sum = 0
+
+    def _bucket_index(self, value):
+        return ((value | self.sub_bucket_mask).bit_length()
+                - self.unit_magnitude - (self.sub_bucket_half_count_magnitude + 1))
+
+    def _counts_index(self, value):
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        bucket_base = (bucket_index + 1) << self.sub_bucket_half_count_magnitude
+        return bucket_base + sub_bucket_index - self.sub_bucket_half_count
+
+    def _value_from_index(self, index):
+        bucket_index = (index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self.sub_bucket_half_count
+            bucket_index = 0
+        return sub_bucket_index << (bucket_index + self.unit_magnitude)
+
+    def _highest_equivalent_value(self, value):
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        if sub_bucket_index >= self.sub_bucket_count:
+            bucket_index += 1
+        return value + (1 << (self.unit_magnitude + bucket_index)) - 1
+
+    def record(self, value, count=1):
+        """Record an integer value; values above the range are clamped"""
+        value = max(0, min(int(value), self.highest_trackable))
+        self.counts[self._counts_index(value)] += count
+        self.total_count += count
+        self._sum += value * count
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def record_seconds(self, seconds, count=1):
+        """Record a latency given in seconds with microsecond resolution"""
+        self.record(int(seconds * 1_000_000), count)
+
+    def merge(self, other):
+        """Add every count from a histogram with the same configuration"""
+        if (other.counts.buffer_info()[1] != self.counts.buffer_info()[1]
+                or other.unit_magnitude != self.unit_magnitude):
+            raise ValueError("Histograms must share the same configuration")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self._sum += other._sum
+        if other.min_value is not None and (self.min_value is None or other.min_value < self.min_value):
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+
+    def value_at_percentile(self, pct):
+        """Return the highest equivalent value at the given percentile"""
+        if self.total_count == 0:
+            return 0
+        pct = min(max(pct, 0.0), 100.0)
+        target = max(1, int(math.ceil(pct / 100.0 * self.total_count)))
+        running = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            running += count
+            if running >= target:
+                value = self._highest_equivalent_value(self._value_from_index(index))
+                return min(value, self.max_value)
+        return self.max_value
+
+    def mean(self):
+        return self._sum / self.total_count if self.total_count else 0.0
+
+    def summary(self, percentiles=(50, 90, 95, 99, 99.9)):
+        """Return count, min, mean, max and the requested percentiles (µs)"""
+        result = {
+            "count": self.total_count,
+            "min": self.min_value or 0,
+            "mean": self.mean(),
+            "max": self.max_value,
+        }
+        for pct in percentiles:
+            result[f"p{pct:g}"] = self.value_at_percentile(pct)
+        return result
@@ -0,0 +1,242 @@
+"""
+Generador de carga concurrente para la API de profesores
+
+Ejecuta N usuarios virtuales que repiten el ciclo create → update → get → delete
+contra /api/teachers en paralelo y reporta el throughput y los percentiles de
+latencia (p50/p95/p99/max) de cada operación.
+
+También incluye un benchmark de lazo abierto (tasa de llegada constante) que
+mide la latencia desde el instante de envío previsto, evitando la omisión
+coordinada, y que puede escalar la tasa por pasos para encontrar la saturación.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import http_client
+from latency_histogram import LatencyHistogram
+
+OPERATIONS = ("create", "update", "get", "delete")
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_samples))))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+class OperationStats:
+    """Latency samples and error count for a single operation"""
+
+    def __init__(self):
+        self.samples = []
+        self.errors = 0
+
+    def record(self, latency, ok):
+        self.samples.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def merge(self, other):
+        self.samples.extend(other.samples)
+        self.errors += other.errors
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": len(ordered),
+            "errors": self.errors,
+            "p50": percentile(ordered, 50),
+            "p95": percentile(ordered, 95),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else 0.0,
+        }
+
+
+class CrudLoadGenerator:
+    """Closed-loop load generator running the CRUD cycle with virtual users"""
+
+    def __init__(self, api_url, virtual_users=10, duration=None, iterations=None, session=None):
+        if duration is None and iterations is None:
+            raise ValueError("Either duration or iterations must be given")
+        self.api_url = api_url
+        self.virtual_users = virtual_users
+        self.duration = duration
+        self.iterations = iterations
+        # Every virtual user keeps one connection busy, so size the pool to match
+        self.session = session or http_client.create_session(pool_maxsize=virtual_users)
+
+    def _timed(self, stats, operation, expected_status, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            stats[operation].record(time.perf_counter() - start, False)
+            return None
+        stats[operation].record(time.perf_counter() - start, response.status_code == expected_status)
+        return response
+
+    def _run_cycle(self, stats, user_id, iteration):
+        teacher = {
+            "firstName": "Load",
+            "lastName": f"User{user_id}",
+            "email": f"load.{user_id}.{iteration}@test.com",
+            "subject": "Load Testing",
+            "yearsOfExperience": iteration % 40
+        }
+        response = self._timed(stats, "create", 201, "POST", self.api_url, json=teacher)
+        if response is None or response.status_code != 201:
+            return
+        teacher_url = f"{self.api_url}/{response.json().get('id')}"
+
+        teacher["firstName"] = "LoadUpdated"
+        self._timed(stats, "update", 200, "PUT", teacher_url, json=teacher)
+        self._timed(stats, "get", 200, "GET", teacher_url)
+        self._timed(stats, "delete", 204, "DELETE", teacher_url)
+
+    def _virtual_user(self, user_id, deadline):
+        stats = {operation: OperationStats() for operation in OPERATIONS}
+        iteration = 0
+        while True:
+            if self.iterations is not None and iteration >= self.iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._run_cycle(stats, user_id, iteration)
+            iteration += 1
+        return stats
+
+    def run(self):
+        """Run all virtual users and return the aggregated report"""
+        start = time.perf_counter()
+        deadline = start + self.duration if self.duration is not None else None
+
+        with ThreadPoolExecutor(max_workers=self.virtual_users) as executor:
+            futures = [executor.submit(self._virtual_user, user_id, deadline)
+                       for user_id in range(self.virtual_users)]
+            per_user = [future.result() for future in futures]
+
+        elapsed = time.perf_counter() - start
+        totals = {operation: OperationStats() for operation in OPERATIONS}
+        for stats in per_user:
+            for operation in OPERATIONS:
+                totals[operation].merge(stats[operation])
+
+        report = {"elapsed": elapsed, "virtual_users": self.virtual_users, "operations": {}}
+        for operation in OPERATIONS:
+            summary = totals[operation].summary()
+            summary["throughput"] = summary["count"] / elapsed if elapsed > 0 else 0.0
+            report["operations"][operation] = summary
+        return report
+
+
+def print_report(report):
+    """Print a load report in the same console style as the testers"""
+    print(f"   {report['virtual_users']} virtual users, {report['elapsed']:.2f}s elapsed")
+    print(f"   {'operation':<10}{'count':>8}{'errors':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for operation, summary in report["operations"].items():
+        print(f"   {operation:<10}{summary['count']:>8}{summary['errors']:>8}"
+              f"{summary['throughput']:>10.1f}"
+              f"{summary['p50'] * 1000:>10.1f}{summary['p95'] * 1000:>10.1f}"
+              f"{summary['p99'] * 1000:>10.1f}{summary['max'] * 1000:>10.1f}")
+
+
+class OpenLoopBenchmark:
+    """Constant-arrival-rate benchmark immune to coordinated omission
+
+    Requests are scheduled at fixed intervals regardless of how fast responses
+    come back. Each latency is measured from the intended send time, so time
+    spent queued behind a slow server is charged to the request.
+    """
+
+    def __init__(self, url, method="GET", max_workers=256, session=None,
+                 saturation_ratio=0.9, max_error_rate=0.01, max_p99_ms=None):
+        self.url = url
+        self.method = method
+        self.max_workers = max_workers
+        self.session = session or http_client.create_session(pool_maxsize=max_workers, retries=0)
+        self.saturation_ratio = saturation_ratio
+        self.max_error_rate = max_error_rate
+        self.max_p99_ms = max_p99_ms
+
+    def _fire(self, intended, histogram, state, lock):
+        try:
+            response = self.session.request(self.method, self.url)
+            ok = response.status_code < 400
+        except requests.exceptions.RequestException:
+            ok = False
+        latency = time.perf_counter() - intended
+        with lock:
+            histogram.record_seconds(latency)
+            if not ok:
+                state["errors"] += 1
+
+    def run_step(self, rate, duration):
+        """Fire requests at a constant rate for duration seconds"""
+        histogram = LatencyHistogram()
+        state = {"errors": 0}
+        lock = threading.Lock()
+        total = int(rate * duration)
+        interval = 1.0 / rate
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            start = time.perf_counter()
+            for i in range(total):
+                intended = start + i * interval
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._fire, intended, histogram, state, lock)
+            send_elapsed = time.perf_counter() - start
+        elapsed = time.perf_counter() - start
+
+        summary = histogram.summary()
+        result = {
+            "target_rate": rate,
+            "sent": total,
+            "errors": state["errors"],
+            "send_rate": total / send_elapsed if send_elapsed > 0 else 0.0,
+            "throughput": total / elapsed if elapsed > 0 else 0.0,
+            "latency_us": summary,
+        }
+        result["saturated"] = self._is_saturated(result)
+        return result
+
+    def _is_saturated(self, result):
+        if result["throughput"] < self.saturation_ratio * result["target_rate"]:
+            return True
+        if result["sent"] and result["errors"] / result["sent"] > self.max_error_rate:
+            return True
+        if self.max_p99_ms is not None and result["latency_us"]["p99"] / 1000 > self.max_p99_ms:
+            return True
+        return False
+
+    def ramp(self, rates, step_duration, stop_on_saturation=True):
+        """Run one step per rate and report the first saturated rate"""
+        steps = []
+        saturation_rate = None
+        for rate in rates:
+            result = self.run_step(rate, step_duration)
+            steps.append(result)
+            print_step(result)
+            if result["saturated"] and saturation_rate is None:
+                saturation_rate = rate
+                if stop_on_saturation:
+                    break
+        return {"steps": steps, "saturation_rate": saturation_rate}
+
+
+def print_step(result):
+    """Print one open-loop step as a single console row"""
+    latency = result["latency_us"]
+    marker = "❌" if result["saturated"] else "✅"
+    print(f"   {marker} {result['target_rate']:>7.0f} req/s target | "
+          f"{result['throughput']:>7.1f} req/s achieved | {result['errors']} errors | "
+          f"p50 {latency['p50'] / 1000:.1f} ms | p99 {latency['p99'] / 1000:.1f} ms | "
+          f"p99.9 {latency['p99.9'] / 1000:.1f} ms | max {latency['max'] / 1000:.1f} ms")
@@ -5,131 +5,335 @@ Este script muestra cómo realizar pruebas de seguridad utilizando la API OWASP
 para detectar vulnerabilidades comunes en su aplicación web.
 """
 
-import requests
+import argparse
 import json
 import time
-from urllib.parse import urljoin
+from collections import deque
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+import http_client
+from scan_monitor import DONE, TIMEOUT, ScanMonitor, print_scan_summary
+from alert_store import AlertStore, print_diff, print_trend
+from header_audit import HeaderAuditor, errored_routes, missing_headers, print_audit
+from result_writers import ERROR, FAILED, PASSED, SKIPPED, ResultStream, add_result_arguments
+from scan_state import ScanState, fingerprint_urls
+from zap_alerts import DEFAULT_MAX_RECORDS, DEFAULT_PAGE_SIZE, AlertAggregator, iter_alerts, print_alerts
 
 class OWASPZAPSecurityTester:
-    def __init__(self, zap_url="http://localhost:8081", api_key="TU_CLAVE_AQUI"):
+    def __init__(self, zap_url="http://localhost:8081", api_key="TU_CLAVE_AQUI", session=None, header_cache=None,
+                 spider_timeout=600, scan_timeout=3600, alert_page_size=DEFAULT_PAGE_SIZE,
+                 max_alert_records=DEFAULT_MAX_RECORDS,
+                 state_file=None, history_db=None, max_active_scans=4, results=None):
         self.zap_url = zap_url
         self.api_url = f"{zap_url}/JSON"
         self.api_key = api_key
         self.target_url = "http://localhost:8080"
         self.frontend_url = "http://localhost:4201"
+        self.session = session or http_client.get_session()
+        self.header_cache = header_cache
+        self.spider_timeout = spider_timeout
+        self.scan_timeout = scan_timeout
+        self.alert_page_size = alert_page_size
+        self.max_alert_records = max_alert_records
+        self.state_file = state_file
+        self.history_db = history_db
+        self.max_active_scans = max_active_scans
+        self.results = results or ResultStream("owasp-zap-security-test")
 
     def check_zap_connection(self):
         print("==============================================================")
         print("Starting OWASP ZAP Security Tests for Spring Boot + Angular Application")
         print("==============================================================")
         
+        start = time.perf_counter()
         try:
-            response = requests.get(f"{self.api_url}/core/view/version/", params={'apikey': self.api_key})
+            response = self.session.get(f"{self.api_url}/core/view/version/", params={'apikey': self.api_key})
             if response.status_code == 200:
                 print("✅ OWASP ZAP is accessible")
-            else:
-                print("❌ ZAP Connection Failed")
+                self.results.record("zap_connection", PASSED, time.perf_counter() - start)
+                return True
+            print("❌ ZAP Connection Failed")
+            self.results.record("zap_connection", FAILED, time.perf_counter() - start,
+                                f"status {response.status_code}")
         except:
             print("❌ Cannot connect to ZAP. Make sure ZAP is running.")
+            self.results.record("zap_connection", ERROR, time.perf_counter() - start, "cannot connect to ZAP")
+        return False
 
-    def spider_site(self, url):
-        print(f"=== Spidering {url} ===")
-        spider_response = requests.get(
-            f"{self.api_url}/spider/action/scan/",
-            params={'url': url, 'apikey': self.api_key}
+    def _start(self, component, url, **params):
+        response = self.session.get(
+            f"{self.api_url}/{component}/action/scan/",
+            params=dict(params, url=url, apikey=self.api_key)
         )
+        if response.status_code != 200:
+            return None, response.text
+        return response.json().get("scan"), None
 
-        if spider_response.status_code != 200:
-            print(f"❌ Failed to start spidering: {spider_response.text}")
-            return
-        
-        scan_id = spider_response.json().get("scan")
-        print(f"   Spider started with scan ID: {scan_id}")
-
-        while True:
-            progress = requests.get(
-                f"{self.api_url}/spider/view/status/",
-                params={'scanId': scan_id, 'apikey': self.api_key}
-            ).json().get("status")
-
-            print(f"   Spider progress: {progress}%")
-            if progress == "100":
-                break
-            time.sleep(2)
-        
-        print("✅ Spidering completed\n")
+    def _status(self, component, scan_id):
+        response = self.session.get(
+            f"{self.api_url}/{component}/view/status/",
+            params={'scanId': scan_id, 'apikey': self.api_key}
+        )
+        response.raise_for_status()
+        return int(response.json().get("status"))
 
-    def active_scan(self, url):
-        print(f"=== Active Scanning {url} ===")
-        scan_response = requests.get(
-            f"{self.api_url}/ascan/action/scan/",
-            params={'url': url, 'apikey': self.api_key}
+    def _stop(self, component, scan_id):
+        self.session.get(
+            f"{self.api_url}/{component}/action/stop/",
+            params={'scanId': scan_id, 'apikey': self.api_key}
+        )
+
+    def watch_scan(self, monitor, component, url, timeout, on_done=None, **params):
+        """Start a spider or active scan and register it with the monitor"""
+        label = "Spider" if component == "spider" else "Active scan"
+        scan_id, error = self._start(component, url, **params)
+        if scan_id is None:
+            print(f"❌ Failed to start {label.lower()} of {url}: {error}")
+            return None
+        print(f"   {label} of {url} started with scan ID: {scan_id}")
+        return monitor.add(
+            f"{component} {url}",
+            lambda: self._status(component, scan_id),
+            stop=lambda: self._stop(component, scan_id),
+            timeout=timeout,
+            on_done=on_done,
         )
 
-        if scan_response.status_code != 200:
-            print(f"❌ Failed to start active scan: {scan_response.text}")
-            return
+    def scan_targets(self, spider_urls, scan_urls, spider_timeout=None, scan_timeout=None):
+        """Spider every URL and active-scan scan_urls, all monitored together
 
-        scan_id = scan_response.json().get("scan")
-        print(f"   Active scan started with scan ID: {scan_id}")
+        An active scan starts as soon as the spider of the same URL finishes,
+        while the other spiders keep running.
+        """
+        print("=== Spidering and Active Scanning ===")
+        spider_timeout = spider_timeout or self.spider_timeout
+        scan_timeout = scan_timeout or self.scan_timeout
+        monitor = ScanMonitor()
 
-        while True:
-            progress = requests.get(
-                f"{self.api_url}/ascan/view/status/",
-                params={'scanId': scan_id, 'apikey': self.api_key}
-            ).json().get("status")
+        def start_active_scan(job):
+            self.watch_scan(monitor, "ascan", job.name.split(" ", 1)[1], scan_timeout)
 
-            print(f"   Scan progress: {progress}%")
-            if progress == "100":
-                break
-            time.sleep(2)
+        for url in spider_urls:
+            on_done = start_active_scan if url in scan_urls else None
+            if self.watch_scan(monitor, "spider", url, spider_timeout, on_done) is None and url in scan_urls:
+                self.watch_scan(monitor, "ascan", url, scan_timeout)
+        for url in scan_urls:
+            if url not in spider_urls:
+                self.watch_scan(monitor, "ascan", url, scan_timeout)
 
-        print("✅ Active scanning completed\n")
+        jobs = monitor.run()
+        print_scan_summary(jobs)
+        self.record_scans(jobs)
+        incomplete = [job.name for job in jobs.values() if job.status != DONE]
+        if incomplete:
+            print(f"⚠️  Incomplete scans: {', '.join(incomplete)}\n")
+        else:
+            print("✅ Spidering and active scanning completed\n")
+        return jobs
 
-    def get_alerts(self):
-        print("=== Retrieving Security Alerts ===")
-        alerts = requests.get(
-            f"{self.api_url}/core/view/alerts/",
-            params={'apikey': self.api_key}
-        )
+    def record_scans(self, jobs):
+        for job in jobs.values():
+            if job.status == DONE:
+                self.results.record(job.name, PASSED, job.duration)
+            elif job.status == TIMEOUT:
+                self.results.record(job.name, FAILED, job.duration, f"stopped at {job.progress}% after the timeout")
+            else:
+                self.results.record(job.name, ERROR, job.duration, f"status polling failed at {job.progress}%")
+
+    def record_alerts(self, aggregator):
+        """One result per alert type: High and Medium risk alerts fail, the rest are skipped
+
+        Low and Informational findings are reported, not counted as passes.
+        """
+        types = {}
+        for record in aggregator.sorted_records():
+            types.setdefault((record["pluginId"], record["risk"]), []).append(record)
+        for (plugin_id, risk), records in types.items():
+            occurrences = sum(record["count"] for record in records)
+            routes = "\n".join(f"{record['url']} [{record['param']}] x{record['count']}" if record["param"]
+                               else f"{record['url']} x{record['count']}" for record in records)
+            self.results.record(f"alert {plugin_id}: {records[0]['alert']} ({risk})",
+                                FAILED if risk in ("High", "Medium") else SKIPPED,
+                                message=f"{len(records)} routes, {occurrences} occurrences", output=routes)
+
+    def spider_site(self, url):
+        return self.scan_targets([url], [])
+
+    def active_scan(self, url):
+        return self.scan_targets([], [url])
 
-        if alerts.status_code != 200:
-            print(f"❌ Failed to retrieve alerts: {alerts.text}")
-            return
+    def get_discovered_urls(self):
+        """URLs ZAP has seen for the backend and the frontend"""
+        urls = []
+        for base_url in (self.target_url, self.frontend_url):
+            response = self.session.get(
+                f"{self.api_url}/core/view/urls/",
+                params={'baseurl': base_url, 'apikey': self.api_key}
+            )
+            if response.status_code == 200:
+                urls.extend(response.json().get("urls", []))
+        return urls
+
+    def audit_security_headers(self, urls=None):
+        print("=== Auditing Security Headers on Discovered URLs ===")
+        urls = urls or self.get_discovered_urls() or [self.target_url, self.frontend_url]
+        start = time.perf_counter()
+        try:
+            report = HeaderAuditor(cache_path=self.header_cache).audit(urls)
+            print_audit(report)
+            errored, missing = errored_routes(report), missing_headers(report)
+            if errored:
+                status, message = ERROR, f"{len(errored)} of {report['routes']} routes errored"
+            elif missing:
+                status, message = FAILED, f"missing on some routes: {', '.join(missing)}"
+            else:
+                status, message = PASSED, None
+            self.results.record("security_headers_audit", status, time.perf_counter() - start, message)
+        except Exception as e:
+            print(f"❌ Error auditing security headers: {e}")
+            self.results.record("security_headers_audit", ERROR, time.perf_counter() - start, str(e))
+        print()
+
+    def incremental_scan(self, state_path):
+        """Active-scan only the backend routes that are new or changed since the last run
+
+        Like the full run, only the backend is actively scanned, and at most
+        max_active_scans scans run at once: the next one starts when one ends.
+        Alerts stored for unchanged routes are merged into the fresh ones.
+        """
+        print("=== Incremental Active Scan ===")
+        state = ScanState(state_path)
+        backend = urlsplit(self.target_url).netloc
+        current = fingerprint_urls([url for url in self.get_discovered_urls() if urlsplit(url).netloc == backend])
+        new, changed, unchanged = state.plan(current)
+        print(f"   {len(current)} routes: {len(new)} new, {len(changed)} changed, {len(unchanged)} unchanged")
+
+        to_scan = new + changed
+        if to_scan:
+            queued = deque(current[key]["url"] for key in to_scan)
+
+            def start_next(_=None):
+                # Skip URLs whose scan could not be started
+                while queued and self.watch_scan(monitor, "ascan", queued.popleft(), self.scan_timeout,
+                                                 recurse="false") is None:
+                    pass
+
+            monitor = ScanMonitor(on_finish=start_next)
+            for _ in range(min(self.max_active_scans, len(queued))):
+                start_next()
+            jobs = monitor.run()
+            print_scan_summary(jobs)
+            self.record_scans(jobs)
+        else:
+            print("✅ Nothing changed, skipping the active scan")
+
+        aggregator = self.get_alerts(report=False)
+        if aggregator is None:
+            return None
+        for record in state.stored_alerts(unchanged):
+            aggregator.merge_record(record)
+        state.update(current, aggregator.records.values(), to_scan)
+        state.save()
 
-        data = alerts.json().get("alerts", [])
+        if aggregator.total == 0:
+            print("ℹ️  No security alerts found\n")
+        else:
+            print_alerts(aggregator)
+        return aggregator
+
+    def record_history(self, aggregator, trend_runs=5):
+        """Store this run's alerts and report what changed since the previous run"""
+        print("=== Alert History ===")
+        with AlertStore(self.history_db) as store:
+            store.record_run(aggregator.records.values(), target=self.target_url)
+            print_diff("🆕 New since last run", store.new_since_last())
+            print_diff("✅ Fixed since last run", store.fixed_since_last())
+            print_trend(store.risk_trend(trend_runs))
+        print()
+
+    def get_alerts(self, baseurl=None, report=True):
+        """Stream alerts page by page and return them aggregated per distinct finding"""
+        print("=== Retrieving Security Alerts ===")
+        aggregator = AlertAggregator(self.max_alert_records)
+        try:
+            aggregator.consume(iter_alerts(self.session, self.api_url, self.api_key, baseurl, self.alert_page_size))
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Failed to retrieve alerts: {e}")
+            return None
 
-        if len(data) == 0:
+        if not report:
+            return aggregator
+        if aggregator.total == 0:
             print("ℹ️  No security alerts found\n")
         else:
-            print(f"⚠ Found {len(data)} alerts\n")
-            for alert in data:
-                print(f"- {alert['alert']} (Risk: {alert['risk']}) | URL: {alert['url']}")
+            print_alerts(aggregator)
+        return aggregator
 
     def run_tests(self):
         self.check_zap_connection()
 
         print("=== Accessing Target Application ===")
         try:
-            requests.get(self.target_url, proxies={"http": self.zap_url})
-            requests.get(self.frontend_url, proxies={"http": self.zap_url})
+            self.session.get(self.target_url, proxies={"http": self.zap_url})
+            self.session.get(self.frontend_url, proxies={"http": self.zap_url})
             print("✅ Accessed both endpoints through ZAP proxy")
+            self.results.record("target_access", PASSED)
         except:
             print("❌ Failed accessing target URLs")
+            self.results.record("target_access", ERROR, message="target URLs unreachable through the ZAP proxy")
 
-        self.spider_site(self.target_url)
-        self.spider_site(self.frontend_url)
-
-        self.active_scan(self.target_url)
+        if self.state_file:
+            # Spider everything, then active-scan only what changed since the last run
+            self.scan_targets([self.target_url, self.frontend_url], [])
+            self.audit_security_headers()
+            aggregator = self.incremental_scan(self.state_file)
+        else:
+            self.scan_targets([self.target_url, self.frontend_url], [self.target_url])
+            self.audit_security_headers()
+            aggregator = self.get_alerts()
 
-        self.get_alerts()
+        if aggregator is None:
+            self.results.record("alerts", ERROR, message="alerts could not be retrieved")
+        else:
+            self.record_alerts(aggregator)
+        if self.history_db and aggregator is not None:
+            self.record_history(aggregator)
+        return aggregator
 
 
 # ==========================
 # MAIN EXECUTION
 # ==========================
-tester = OWASPZAPSecurityTester(
-    zap_url="http://localhost:8081",
-    api_key="337ssn885kd499812ps11v0hrg"
-)
-tester.run_tests()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OWASP ZAP security tests")
+    parser.add_argument("--zap-url", default="http://localhost:8081")
+    parser.add_argument("--api-key", default="337ssn885kd499812ps11v0hrg")
+    parser.add_argument("--spider-timeout", type=float, default=600, help="seconds before a spider is stopped")
+    parser.add_argument("--scan-timeout", type=float, default=3600, help="seconds before an active scan is stopped")
+    parser.add_argument("--alert-page-size", type=int, default=DEFAULT_PAGE_SIZE, help="alerts fetched per request")
+    parser.add_argument("--max-alert-records", type=int, default=DEFAULT_MAX_RECORDS,
+                        help="distinct alerts kept in memory; further new findings are only counted")
+    parser.add_argument("--state-file",
+                        help="JSON scan state; when given, only new or changed URLs are actively scanned")
+    parser.add_argument("--max-active-scans", type=int, default=4,
+                        help="active scans run at once by the incremental scan")
+    parser.add_argument("--history-db", help="SQLite file where every run's alerts are kept for diffing")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    with ResultStream.from_args("owasp-zap-security-test", args) as results:
+        tester = OWASPZAPSecurityTester(
+            zap_url=args.zap_url,
+            api_key=args.api_key,
+            spider_timeout=args.spider_timeout,
+            scan_timeout=args.scan_timeout,
+            alert_page_size=args.alert_page_size,
+            max_alert_records=args.max_alert_records,
+            state_file=args.state_file,
+            history_db=args.history_db,
+            max_active_scans=args.max_active_scans,
+            results=results
+        )
+        tester.run_tests()
@@ -0,0 +1,271 @@
+"""
+Motor de corpus de payloads para las pruebas de seguridad
+
+Lee listas de payloads desde disco línea a línea (pueden tener decenas de miles
+de entradas) y expande cada payload sobre todos los puntos de inyección
+configurados: segmentos de ruta, parámetros de consulta y campos JSON de
+Teacher. Las peticiones se envían con un número acotado de peticiones en vuelo
+y las respuestas se agrupan por código de estado y hash del cuerpo normalizado,
+de modo que solo se reportan las respuestas anómalas.
+"""
+
+import hashlib
+import html
+import json
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import quote, quote_plus, urlsplit, urlunsplit
+
+import requests
+
+import http_client
+from teacher_client import chunked
+
+PAYLOAD_PLACEHOLDER = "{payload}"
+
+# Timestamps and generated IDs change on every response and would otherwise
+# give each payload its own body hash
+_VOLATILE = re.compile(r"\d{4}-\d{2}-\d{2}T[\d:.]+(?:Z|[+-]\d{2}:?\d{2})?|\d+")
+
+
+def iter_payloads(path):
+    """Yield the payloads of a wordlist, skipping blank lines and # comments"""
+    with open(path, encoding="utf-8", errors="replace") as wordlist:
+        for line in wordlist:
+            payload = line.rstrip("\r\n")
+            if payload and not payload.startswith("#"):
+                yield payload
+
+
+class InjectionPoint:
+    """A place in a request where a payload is substituted"""
+
+    __slots__ = ("kind", "label", "method", "url", "name", "index", "template")
+
+    def __init__(self, kind, label, method, url, name=None, index=None, template=None):
+        self.kind = kind
+        self.label = label
+        self.method = method
+        self.url = url
+        self.name = name
+        self.index = index
+        self.template = template
+
+    @classmethod
+    def path_segments(cls, url, method="GET"):
+        """One injection point per segment of the URL path"""
+        parts = urlsplit(url)
+        segments = parts.path.strip("/").split("/")
+        for index, segment in enumerate(segments):
+            shown = "/".join(PAYLOAD_PLACEHOLDER if i == index else s for i, s in enumerate(segments))
+            yield cls("path", f"{method} /{shown}", method, url, index=index)
+
+    @classmethod
+    def query_params(cls, url, names, method="GET"):
+        path = urlsplit(url).path or "/"
+        for name in names:
+            yield cls("query", f"{method} {path}?{name}=", method, url, name=name)
+
+    @classmethod
+    def json_fields(cls, url, template, method="POST"):
+        path = urlsplit(url).path or "/"
+        for name in template:
+            yield cls("json", f"{method} {path} {{{name}}}", method, url, name=name, template=template)
+
+    def build(self, payload):
+        """Return the request (method, url, params, json) carrying payload"""
+        if self.kind == "path":
+            parts = urlsplit(self.url)
+            segments = parts.path.strip("/").split("/")
+            segments[self.index] = quote(payload, safe="")
+            return self.method, urlunsplit(parts._replace(path="/" + "/".join(segments))), None, None
+        if self.kind == "query":
+            return self.method, self.url, {self.name: payload}, None
+        body = dict(self.template)
+        body[self.name] = payload
+        return self.method, self.url, None, body
+
+
+class FuzzCase:
+    __slots__ = ("point", "payload", "context")
+
+    def __init__(self, point, payload, context=None):
+        self.point = point
+        self.payload = payload
+        self.context = context
+
+
+def expand_cases(payloads, points, batch_size=1000, prepare=None):
+    """Pair every payload with every injection point, lazily
+
+    Payloads are taken batch_size at a time; prepare, if given, is called
+    with each batch and its result is attached to the batch's cases as
+    context (e.g. a matcher built over the whole batch).
+    """
+    points = list(points)
+    for batch in chunked(payloads, batch_size):
+        context = prepare(batch) if prepare is not None else None
+        for payload in batch:
+            for point in points:
+                yield FuzzCase(point, payload, context)
+
+
+def payload_encodings(payload):
+    """(kind, text) forms a payload may take once echoed back by the server"""
+    encodings = {}
+    for kind, text in (
+        ("raw", payload),
+        ("html-escaped", html.escape(payload)),
+        ("html-escaped", html.escape(payload, quote=False)),
+        ("url-encoded", quote(payload)),
+        ("url-encoded", quote(payload, safe="")),
+        ("url-encoded", quote_plus(payload)),
+        ("json-escaped", json.dumps(payload)[1:-1]),
+        ("json-escaped", json.dumps(payload, ensure_ascii=False)[1:-1]),
+    ):
+        if text:
+            encodings.setdefault(text, kind)
+    return [(kind, text) for text, kind in encodings.items()]
+
+
+def body_fingerprint(text, payload):
+    """Hash of the body with the payload and volatile values masked out"""
+    for variant in sorted((form for _, form in payload_encodings(payload)), key=len, reverse=True):
+        text = text.replace(variant, PAYLOAD_PLACEHOLDER)
+    text = _VOLATILE.sub("0", text)
+    return hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=8).hexdigest()
+
+
+class FuzzResponse:
+    __slots__ = ("case", "status", "content_type", "digest", "text", "error")
+
+    def __init__(self, case, status, content_type="", digest=None, text="", error=None):
+        self.case = case
+        self.status = status
+        self.content_type = content_type
+        self.digest = digest
+        self.text = text
+        self.error = error
+
+
+class FuzzReport:
+    """Responses grouped per injection point by (status, body hash)
+
+    Only one sample payload is kept per group, so memory depends on the number
+    of distinct behaviours and not on the size of the corpus.
+    """
+
+    def __init__(self):
+        self.groups = {}
+        self.totals = {}
+        self.requests = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def record(self, response):
+        label = response.case.point.label
+        key = (label, response.status, response.digest)
+        group = self.groups.get(key)
+        if group is None:
+            self.groups[key] = [1, response.case.payload, response.error]
+        else:
+            group[0] += 1
+        self.totals[label] = self.totals.get(label, 0) + 1
+        self.requests += 1
+        if response.status is None:
+            self.errors += 1
+
+    def anomalies(self):
+        """Groups that differ from the dominant behaviour of their injection point
+
+        Server errors and transport failures are always anomalies, even when
+        every payload triggers them.
+        """
+        baseline = {}
+        for (label, status, digest), (count, _, _) in self.groups.items():
+            if count > baseline.get(label, ((None, None), 0))[1]:
+                baseline[label] = ((status, digest), count)
+
+        rows = []
+        for (label, status, digest), (count, sample, error) in self.groups.items():
+            broken = status is None or status >= 500
+            if broken or baseline[label][0] != (status, digest):
+                rows.append({
+                    "point": label,
+                    "status": status,
+                    "digest": digest,
+                    "count": count,
+                    "total": self.totals[label],
+                    "sample": sample,
+                    "error": error,
+                })
+        rows.sort(key=lambda row: (row["point"], row["count"]))
+        return rows
+
+
+class PayloadFuzzer:
+    """Send fuzz cases with a bounded number of requests in flight
+
+    Cases are pulled from the (possibly lazy) iterable only as fast as the
+    server answers them, so a huge corpus is never materialised in memory.
+    """
+
+    def __init__(self, concurrency=32, session=None, max_body_bytes=1_000_000):
+        self.concurrency = concurrency
+        self.max_body_bytes = max_body_bytes
+        # No retries: a 503 is part of what the corpus is probing for
+        self.session = session or http_client.create_session(pool_maxsize=concurrency, retries=0)
+
+    def _send(self, case):
+        method, url, params, body = case.point.build(case.payload)
+        try:
+            response = self.session.request(method, url, params=params, json=body)
+        except requests.exceptions.RequestException as e:
+            return FuzzResponse(case, None, error=type(e).__name__)
+        text = response.content[:self.max_body_bytes].decode(response.encoding or "utf-8", "replace")
+        return FuzzResponse(case, response.status_code, response.headers.get("Content-Type", ""),
+                            body_fingerprint(text, case.payload), text)
+
+    def run(self, cases, on_response=None):
+        """Run every case and return a FuzzReport
+
+        on_response, if given, is called from the calling thread with each
+        FuzzResponse (e.g. to look for reflections or collect created IDs).
+        """
+        report = FuzzReport()
+        start = time.perf_counter()
+
+        def collect(futures):
+            for future in futures:
+                response = future.result()
+                report.record(response)
+                if on_response is not None:
+                    on_response(response)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            in_flight = set()
+            for case in cases:
+                if len(in_flight) >= self.concurrency * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight.add(executor.submit(self._send, case))
+            done, _ = wait(in_flight)
+            collect(done)
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+
+def print_anomalies(report, limit=20):
+    """Print the anomalous groups of a report in the testers' console style"""
+    rate = report.requests / report.elapsed if report.elapsed > 0 else 0.0
+    print(f"   {report.requests} requests over {len(report.totals)} injection points "
+          f"in {report.elapsed:.2f}s ({rate:.0f} req/s)")
+    rows = report.anomalies()
+    for row in rows[:limit]:
+        status = row["status"] if row["status"] is not None else row["error"]
+        print(f"   {str(status):>5}  {row['count']:>6}/{row['total']:<6} {row['point']}  "
+              f"e.g. {row['sample']!r}")
+    if len(rows) > limit:
+        print(f"   ... {len(rows) - limit} more anomalous groups")
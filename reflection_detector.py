@@ -0,0 +1,78 @@
+"""
+Detector de reflejos de payloads en cuerpos de respuesta
+
+Construye un autómata Aho-Corasick sobre un lote completo de payloads y sus
+formas codificadas (escapado HTML, codificación URL, escapado JSON) y recorre
+cada cuerpo de respuesta una sola vez. El coste de escanear un cuerpo depende
+de su tamaño y del número de coincidencias, no del número de payloads.
+"""
+
+from collections import deque
+
+from payload_fuzzer import payload_encodings
+
+
+class ReflectionDetector:
+    """Find which payloads of a batch appear in a text, and in which form
+
+    Only "raw" reflections can execute; the escaped forms show the payload was
+    echoed but neutralised, which is still worth knowing when triaging.
+    """
+
+    def __init__(self, payloads):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self._patterns = []
+        for payload in payloads:
+            for kind, text in payload_encodings(payload):
+                self._add(text, len(self._patterns))
+                self._patterns.append((payload, kind))
+        self._link()
+
+    def _add(self, text, pattern_id):
+        state = 0
+        for char in text:
+            following = self._goto[state].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = following
+        self._output[state] += (pattern_id,)
+
+    def _link(self):
+        # Breadth-first, so every failure target is complete before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[following] = target
+                self._output[following] += self._output[target]
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def scan(self, text):
+        """Return {(payload, kind)} for every pattern occurring in text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return {self._patterns[pattern_id] for pattern_id in found}
+
+    def reflected(self, text):
+        """Payloads echoed back unescaped"""
+        return {payload for payload, kind in self.scan(text) if kind == "raw"}
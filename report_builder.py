@@ -0,0 +1,184 @@
+"""
+Construcción paralela de documentos PDF con caché de secciones
+
+Cada documento es una lista de secciones: una función que devuelve los
+flowables de ReportLab y los datos de los que depende. Las secciones se
+renderizan cada una a su propio PDF en un pool de procesos y se guardan en una
+caché en disco bajo un hash de sus datos y del código que las genera; al volver
+a generar los documentos solo se renderizan las secciones cuyo hash ha cambiado
+y cada documento se compone uniendo los PDF de sus secciones.
+
+Unir PDF requiere pypdf (pip install pypdf). Sin él no hay caché de secciones:
+cada documento se renderiza completo, aunque los documentos siguen
+construyéndose en paralelo.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+from reportlab import Version as REPORTLAB_VERSION
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import PageBreak, SimpleDocTemplate
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+DEFAULT_CACHE_DIR = ".report-cache"
+DEFAULT_MAX_ENTRIES = 256
+
+
+class Section:
+    """One page-aligned part of a document
+
+    build(data) returns the section's flowables; it must be a module-level
+    function so that worker processes can run it. data must be JSON
+    serializable: it is part of the cache key, except for the keys of a dict
+    that start with "_" (e.g. a scratch file whose content another key
+    already identifies).
+    """
+
+    __slots__ = ("name", "build", "data")
+
+    def __init__(self, name, build, data=None):
+        self.name = name
+        self.build = build
+        self.data = data
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def section_key(section, salt=""):
+    """Hash of the section's data, its build function's source and the salt"""
+    data = section.data
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if not key.startswith("_")}
+    payload = json.dumps([section.name, data, inspect.getsource(section.build), salt, REPORTLAB_VERSION],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_pdf(path, parts, pagesize=A4):
+    """Build one PDF from [(build, data)], each part starting on a new page"""
+    story = []
+    for build, data in parts:
+        if story:
+            story.append(PageBreak())
+        story.extend(build(data))
+    temporary = f"{path}.{os.getpid()}.tmp"
+    SimpleDocTemplate(temporary, pagesize=pagesize).build(story)
+    os.replace(temporary, path)
+    return path
+
+
+def merge_pdfs(output, paths):
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    temporary = f"{output}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as target:
+        writer.write(target)
+    os.replace(temporary, output)
+    return output
+
+
+class SectionCache:
+    """Rendered section PDFs on disk, named by section key
+
+    Hits refresh the file's modification time; prune() keeps the
+    max_entries most recently used.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)
+        return path
+
+    def prune(self):
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if name.endswith(".pdf")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            os.remove(path)
+
+
+def build_documents(documents, cache=None, workers=None, salt=""):
+    """Render {output path: [Section]} in a process pool
+
+    With a cache (and pypdf), missing sections are rendered once each and
+    every document is merged as soon as all of its sections are available;
+    without one, each document is rendered whole. Returns {output: stats}.
+    """
+    started = time.monotonic()
+    stats = {output: {"sections": len(sections), "rendered": 0, "reused": 0}
+             for output, sections in documents.items()}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if cache is None or PdfWriter is None:
+            futures = {executor.submit(render_pdf, output, [(section.build, section.data) for section in sections]):
+                       output for output, sections in documents.items()}
+            for future in as_completed(futures):
+                future.result()
+                output = futures[future]
+                stats[output].update(rendered=len(documents[output]), elapsed=time.monotonic() - started)
+            return stats
+
+        keys = {output: [section_key(section, salt) for section in sections]
+                for output, sections in documents.items()}
+        renders = {}
+        for output, sections in documents.items():
+            for key, section in zip(keys[output], sections):
+                if key in renders or cache.get(key) is not None:
+                    stats[output]["reused"] += 1
+                    continue
+                renders[key] = executor.submit(render_pdf, cache.path(key), [(section.build, section.data)])
+                stats[output]["rendered"] += 1
+
+        waiting = dict(keys)
+        merges = []
+        pending = set(renders.values())
+        while waiting:
+            for output in [output for output, needed in waiting.items()
+                           if all(key not in renders or renders[key].done() for key in needed)]:
+                for key in waiting.pop(output):
+                    if key in renders:
+                        renders[key].result()
+                merge = executor.submit(merge_pdfs, output, [cache.path(key) for key in keys[output]])
+                merge.add_done_callback(
+                    lambda _, output=output: stats[output].update(elapsed=time.monotonic() - started))
+                merges.append(merge)
+            pending = {future for future in pending if not future.done()}
+            if waiting and pending:
+                wait(pending, return_when=FIRST_COMPLETED)
+
+        for merge in merges:
+            merge.result()
+    cache.prune()
+    return stats
+
+
+def print_build_summary(stats):
+    for output, result in stats.items():
+        print(f"   ✅ {output:<32} {result['sections']} sections "
+              f"({result['rendered']} rendered, {result['reused']} cached)  {result['elapsed']:.1f}s")
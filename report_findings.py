@@ -0,0 +1,408 @@
+"""
+Hallazgos para el informe PDF de pruebas de seguridad
+
+Carga los hallazgos desde un JSON de ZAP (respuesta de /core/view/alerts/ o
+informe "traditional-json") o desde el histórico SQLite de alertas, y los
+entrega como totales por riesgo, totales por tipo de alerta y un flujo de filas.
+El JSON de ZAP se decodifica alerta a alerta, sin cargar el fichero entero.
+StreamingTable convierte ese flujo en tablas de ReportLab que se parten por
+páginas repitiendo la cabecera, construyendo cada bloque de filas solo cuando
+hace falta, de modo que un informe con decenas de miles de hallazgos no tiene
+todas las filas en memoria a la vez.
+"""
+
+import hashlib
+import json
+import re
+from itertools import islice
+
+from reportlab.lib import colors
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, Table, TableStyle
+
+from alert_store import RISK_LEVELS, AlertStore
+from zap_alerts import DEFAULT_MAX_RECORDS, RISK_ORDER, AlertAggregator
+
+RISK_CODES = {"0": "Informational", "1": "Low", "2": "Medium", "3": "High"}
+RISK_COLORS = {
+    "High": colors.HexColor("#f4c7c3"),
+    "Medium": colors.HexColor("#fce8b2"),
+    "Low": colors.HexColor("#d9ead3"),
+    "Informational": colors.HexColor("#e8eaf6"),
+}
+CELL_FONT_SIZE = 7
+# Horizontal cell padding of a default TableStyle
+CELL_PADDING = 12
+
+_TAGS = re.compile(r"<[^>]+>")
+
+
+class Findings:
+    """What the report needs from a findings source
+
+    risk_totals is {risk: {"findings", "occurrences"}}, alert_types one dict
+    per (plugin, risk) most severe first, and rows() a fresh iterator over the
+    individual finding records, also most severe first.
+    """
+
+    def __init__(self, source, risk_totals, alert_types, rows):
+        self.source = source
+        self.risk_totals = risk_totals
+        self.alert_types = alert_types
+        self.rows = rows
+
+    @property
+    def total_findings(self):
+        return sum(totals["findings"] for totals in self.risk_totals.values())
+
+    def digest(self):
+        """Content hash of the totals, alert types and every row, read as a stream"""
+        digest = hashlib.sha256(json.dumps([self.risk_totals, self.alert_types], sort_keys=True).encode())
+        for row in self.rows():
+            digest.update(json.dumps(row, sort_keys=True).encode())
+        return digest.hexdigest()
+
+
+def _plain(text):
+    return " ".join(_TAGS.sub(" ", text or "").split())
+
+
+def _site_alert_instances(alert):
+    """One API-style alert per instance of a traditional-json site alert"""
+    base = {
+        "pluginId": alert.get("pluginid"),
+        "alert": alert.get("alert") or alert.get("name"),
+        "risk": RISK_CODES.get(str(alert.get("riskcode")), alert.get("riskdesc", "").split(" ")[0]),
+        "confidence": alert.get("confidence"),
+        "cweid": alert.get("cweid"),
+        "description": alert.get("desc"),
+        "solution": alert.get("solution"),
+    }
+    for instance in alert.get("instances", []):
+        yield dict(base, url=instance.get("uri", ""), param=instance.get("param", ""))
+
+
+def iter_zap_json_alerts(data):
+    """Yield API-style alerts from a core/view/alerts answer or a traditional-json report"""
+    if isinstance(data, list):
+        yield from data
+        return
+    yield from data.get("alerts", [])
+    for site in data.get("site", []):
+        for alert in site.get("alerts", []):
+            yield from _site_alert_instances(alert)
+
+
+class _JsonReader:
+    """Walks a JSON text read a chunk at a time, decoding only the values asked for
+
+    array() and members() position the reader on each element or member
+    value in turn; the caller consumes it with value() or by walking into it
+    before asking for the next one. Only the current value and one chunk of
+    text are held in memory.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, text_file, chunk_size=1 << 16):
+        self.file = text_file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self, size):
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, not consumed ("" at the end)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._read(self.chunk_size):
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the JSON buffer")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next value, reading more text until it is complete"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+                # A number cut at the end of the buffer decodes, but may go on
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Values bigger than a chunk: grow the reads so the retries stay few
+            self._read(size)
+            size *= 2
+
+    def _separator(self, close):
+        char = self.peek()
+        self.pos += 1
+        if char == close:
+            return False
+        if char != ",":
+            raise ValueError(f"Expected ',' or {close!r} in JSON, found {char!r}")
+        return True
+
+    def array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if not self._separator("]"):
+                return
+
+    def members(self):
+        """Yield each key of an object, positioned on its value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+
+def iter_zap_json_file(path):
+    """iter_zap_json_alerts over a file, decoding one alert at a time
+
+    Only the "alerts" list (or the list at the top) and each site's "alerts"
+    are walked; every other value is decoded and dropped as it is passed.
+    """
+    with open(path, encoding="utf-8") as json_file:
+        reader = _JsonReader(json_file)
+        if reader.peek() == "[":
+            for _ in reader.array():
+                yield reader.value()
+            return
+        for key in reader.members():
+            if key == "alerts":
+                for _ in reader.array():
+                    yield reader.value()
+            elif key == "site":
+                for _ in reader.array():
+                    for site_key in reader.members():
+                        if site_key == "alerts":
+                            for _ in reader.array():
+                                yield from _site_alert_instances(reader.value())
+                        else:
+                            reader.value()
+            else:
+                reader.value()
+
+
+def _alert_types(records, details):
+    types = {}
+    for record in records:
+        key = (record["pluginId"], record["risk"])
+        entry = types.get(key)
+        if entry is None:
+            entry = types[key] = dict(details.get(record["pluginId"], {}), pluginId=record["pluginId"],
+                                      alert=record["alert"], risk=record["risk"], cweid=record.get("cweid"),
+                                      routes=set(), occurrences=0)
+        entry["routes"].add(record["url"])
+        entry["occurrences"] += record["count"]
+    for entry in types.values():
+        entry["routes"] = len(entry["routes"])
+    return sorted(types.values(), key=lambda entry: (RISK_ORDER.get(entry["risk"], len(RISK_ORDER)),
+                                                     -entry["occurrences"]))
+
+
+def _risk_totals(records):
+    totals = {risk: {"findings": 0, "occurrences": 0} for risk in RISK_LEVELS}
+    for record in records:
+        bucket = totals.setdefault(record["risk"], {"findings": 0, "occurrences": 0})
+        bucket["findings"] += 1
+        bucket["occurrences"] += record["count"]
+    return totals
+
+
+def findings_from_records(records, source, details=None):
+    """Findings over already aggregated alert records (e.g. AlertAggregator.sorted_records())"""
+    if not isinstance(records, list):
+        records = list(records)
+    return Findings(source, _risk_totals(records), _alert_types(records, details or {}),
+                    lambda: iter(records))
+
+
+def findings_from_zap_json(path, max_records=DEFAULT_MAX_RECORDS):
+    """Aggregate a ZAP JSON file into distinct findings
+
+    The file is decoded one alert at a time and alerts are folded into at
+    most max_records records as they are read (None lifts the limit), so
+    memory depends on distinct findings, not on the size of the file;
+    descriptions and solutions are kept once per plugin.
+    """
+    aggregator = AlertAggregator(max_records)
+    details = {}
+    for alert in iter_zap_json_file(path):
+        aggregator.add(alert)
+        plugin_id = alert.get("pluginId")
+        if plugin_id not in details and (alert.get("description") or alert.get("solution")):
+            details[plugin_id] = {"description": _plain(alert.get("description")),
+                                  "solution": _plain(alert.get("solution"))}
+    return findings_from_records(aggregator.sorted_records(), path, details)
+
+
+def findings_from_store(path, run_id=None):
+    """Findings of one alert store run (default: latest); rows stream from SQLite"""
+    with AlertStore(path) as store:
+        run_id = store.resolve_run(run_id)
+        risk_totals = store.risk_totals(run_id)
+        alert_types = store.alert_types(run_id)
+
+    def rows():
+        with AlertStore(path) as store:
+            yield from store.iter_findings(run_id)
+
+    return Findings(f"{path} (run {run_id})", risk_totals, alert_types, rows)
+
+
+def write_findings(findings, path):
+    """Save findings as JSON lines: source, totals and alert types first, then one row per line"""
+    with open(path, "w", encoding="utf-8") as target:
+        target.write(json.dumps({"source": str(findings.source), "risk_totals": findings.risk_totals,
+                                 "alert_types": findings.alert_types}) + "\n")
+        for row in findings.rows():
+            target.write(json.dumps(row) + "\n")
+
+
+def findings_from_file(path):
+    """Findings saved by write_findings; rows stream from the file"""
+    with open(path, encoding="utf-8") as source:
+        head = json.loads(source.readline())
+
+    def rows():
+        with open(path, encoding="utf-8") as source:
+            source.readline()
+            for line in source:
+                yield json.loads(line)
+
+    return Findings(head["source"], head["risk_totals"], head["alert_types"], rows)
+
+
+def _cell(text, width, font="Helvetica", size=7, max_lines=4):
+    """Text broken into lines that fit width points, as a plain Table cell
+
+    Plain strings are laid out far faster than Paragraphs, which matters once
+    the table runs to tens of thousands of rows.
+    """
+    text = " ".join(str(text or "").split())
+    if not text:
+        return ""
+    lines = []
+    for line in simpleSplit(text, font, size, width):
+        # URLs are one long "word": cut them by the average character width
+        per_line = max(1, int(len(line) * width / max(stringWidth(line, font, size), 1)))
+        lines.extend(line[start:start + per_line] for start in range(0, len(line), per_line))
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1][:-1] + "…"
+    return "\n".join(lines)
+
+
+class StreamingTable(Flowable):
+    """A table whose rows come from an iterator and are laid out page by page
+
+    Rows are pulled chunk_rows at a time; every chunk becomes a Table with
+    repeatRows=1, so each page starts with the header. The flowable always
+    reports itself as too tall so that the frame asks it to split: the split
+    returns the part of the current chunk that fits plus a continuation.
+    """
+
+    def __init__(self, header, rows, col_widths, make_row, style=None, chunk_rows=200, _pending=None):
+        super().__init__()
+        self.header = header
+        self.rows = rows
+        self.col_widths = col_widths
+        self.make_row = make_row
+        self.style = style or []
+        self.chunk_rows = chunk_rows
+        self.pending = _pending
+
+    def _next_chunk(self):
+        records = list(islice(self.rows, self.chunk_rows))
+        if not records:
+            return None
+        data = [self.header]
+        commands = list(self.style)
+        for number, record in enumerate(records, 1):
+            row, row_commands = self.make_row(record, number)
+            data.append(row)
+            commands.extend(row_commands)
+        return Table(data, colWidths=self.col_widths, repeatRows=1, style=TableStyle(commands))
+
+    def _continuation(self, pending):
+        return StreamingTable(self.header, self.rows, self.col_widths, self.make_row, self.style,
+                              self.chunk_rows, pending)
+
+    def _fill(self):
+        if self.pending is None:
+            self.pending = self._next_chunk()
+        return self.pending
+
+    def wrap(self, availWidth, availHeight):
+        if self._fill() is None:
+            return 0, 0
+        return availWidth, availHeight + 1
+
+    def split(self, availWidth, availHeight):
+        table = self._fill()
+        if table is None:
+            return []
+        _, height = table.wrap(availWidth, availHeight)
+        if height <= availHeight:
+            return [table, self._continuation(None)]
+        parts = table.split(availWidth, availHeight)
+        if not parts:
+            return []
+        return [parts[0], self._continuation(parts[1] if len(parts) > 1 else None)]
+
+    def draw(self):
+        pass
+
+
+def findings_table(findings, col_widths=(58, 140, 171, 52, 30), chunk_rows=40):
+    """StreamingTable over findings.rows(): risk, alert, route, parameter, count"""
+    header = ["Risk", "Alert", "Route", "Param", "Count"]
+    style = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), CELL_FONT_SIZE),
+        ('LEADING', (0, 0), (-1, -1), CELL_FONT_SIZE + 1.5),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
+    ]
+    alert_width, url_width, param_width = (width - CELL_PADDING for width in col_widths[1:4])
+
+    def make_row(record, number):
+        row = [record["risk"], _cell(record.get("alert"), alert_width), _cell(record["url"], url_width),
+               _cell(record.get("param"), param_width), str(record["count"])]
+        color = RISK_COLORS.get(record["risk"])
+        return row, [('BACKGROUND', (0, number), (0, number), color)] if color else []
+
+    return StreamingTable(header, findings.rows(), list(col_widths), make_row, style, chunk_rows)
@@ -0,0 +1,238 @@
+"""
+Resultados estructurados de las pruebas: JSON Lines, JUnit XML y HTML
+
+Todos los testers registran sus comprobaciones como TestResult en un
+ResultStream, que las escribe en cuanto terminan en uno o varios formatos: JSON
+Lines (una línea por resultado y una línea final de resumen), JUnit XML y un
+informe HTML autocontenido. Cada resultado se vuelca a disco al momento, de modo
+que la integración continua puede leer los resultados mientras las pruebas se
+ejecutan, sin analizar la salida por consola ni generar el PDF.
+"""
+
+import json
+import re
+import socket
+import threading
+import time
+from html import escape as html_escape
+from xml.sax.saxutils import escape as xml_escape, quoteattr
+
+from check_scheduler import ERROR, FAILED, PASSED, SKIPPED
+
+STATUSES = (PASSED, FAILED, ERROR, SKIPPED)
+
+# Characters XML 1.0 does not allow, e.g. terminal escape sequences in captured output
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class TestResult:
+    __slots__ = ("suite", "name", "status", "duration", "message", "output", "timestamp")
+
+    def __init__(self, suite, name, status, duration=0.0, message=None, output="", timestamp=None):
+        self.suite = suite
+        self.name = name
+        self.status = status
+        self.duration = duration
+        self.message = message
+        self.output = output
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    @classmethod
+    def from_check(cls, suite, check, output=""):
+        """Convert a CheckScheduler CheckResult plus its captured console output"""
+        message = None if check.error is None else str(check.error)
+        return cls(suite, check.name, check.status, check.duration, message, output)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class JsonLinesWriter:
+    """One JSON object per line: {"type": "result", ...} and a final {"type": "summary", ...}"""
+
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def _line(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.file.flush()
+
+    def write(self, result):
+        self._line(dict(result.to_dict(), type="result"))
+
+    def close(self, summary):
+        self._line(dict(summary, type="summary"))
+        self.file.close()
+
+
+class JUnitXmlWriter:
+    """A <testsuite> whose <testcase> elements are appended as results arrive
+
+    The suite's counters are written into a space-padded slot of the start
+    tag and rewritten in place on close, so nothing is buffered until the end.
+    """
+
+    COUNTERS = ("tests", "failures", "errors", "skipped")
+    # Room for every counter at its largest plausible size; the unused tail is
+    # whitespace between attributes
+    COUNTERS_WIDTH = 160
+
+    def __init__(self, path, suite):
+        self.suite = suite
+        self.file = open(path, "wb")
+        self.file.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.file.write(f"<testsuite name={quoteattr(suite)} hostname={quoteattr(socket.gethostname())} "
+                        f"timestamp=\"{time.strftime('%Y-%m-%dT%H:%M:%S')}\" ".encode())
+        self.counters_at = self.file.tell()
+        self.file.write(self._counters(dict.fromkeys(self.COUNTERS, 0), 0.0) + b">\n")
+        self.file.flush()
+
+    def _counters(self, counts, elapsed):
+        text = " ".join([f'{name}="{counts[name]}"' for name in self.COUNTERS] + [f'time="{elapsed:.3f}"'])
+        return text.ljust(self.COUNTERS_WIDTH).encode()
+
+    @staticmethod
+    def _text(text):
+        return xml_escape(_INVALID_XML.sub("", text))
+
+    def write(self, result):
+        parts = [f"  <testcase classname={quoteattr(result.suite)} name={quoteattr(result.name)} "
+                 f"time=\"{result.duration:.3f}\">"]
+        message = quoteattr(_INVALID_XML.sub("", result.message or result.status))
+        if result.status == FAILED:
+            parts.append(f"<failure message={message}/>")
+        elif result.status == ERROR:
+            parts.append(f"<error message={message}/>")
+        elif result.status == SKIPPED:
+            parts.append(f"<skipped message={message}/>")
+        if result.output:
+            parts.append(f"<system-out>{self._text(result.output)}</system-out>")
+        parts.append("</testcase>\n")
+        self.file.write("".join(parts).encode("utf-8"))
+        self.file.flush()
+
+    def close(self, summary):
+        self.file.write(b"</testsuite>\n")
+        counts = {"tests": summary["tests"], "failures": summary[FAILED], "errors": summary[ERROR],
+                  "skipped": summary[SKIPPED]}
+        self.file.seek(self.counters_at)
+        self.file.write(self._counters(counts, summary["time"]))
+        self.file.close()
+
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; display: flex; flex-direction: column; }}
+#summary {{ order: -1; margin-bottom: 1em; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 14px; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }}
+th {{ background: #555; color: #fff; }}
+tr.passed td:first-child {{ background: #d9ead3; }}
+tr.failed td:first-child, tr.error td:first-child {{ background: #f4c7c3; }}
+tr.skipped td:first-child {{ background: #eee; }}
+td.duration {{ text-align: right; white-space: nowrap; }}
+pre {{ margin: 0; white-space: pre-wrap; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<table>
+<thead><tr><th>Status</th><th>Check</th><th>Duration</th><th>Details</th></tr></thead>
+<tbody>
+"""
+
+
+class HtmlReportWriter:
+    """Single-file HTML: rows are appended as they arrive, the summary on close
+
+    The summary is written last but displayed first (CSS flex order), so the
+    page needs no script and stays viewable while the run is in progress.
+    """
+
+    def __init__(self, path, title):
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write(HTML_HEAD.format(title=html_escape(title)))
+        self.file.flush()
+
+    def write(self, result):
+        details = html_escape(result.message or "")
+        if result.output:
+            details += f"<details><summary>output</summary><pre>{html_escape(result.output)}</pre></details>"
+        self.file.write(f'<tr class="{result.status}"><td>{result.status}</td><td>{html_escape(result.name)}</td>'
+                        f'<td class="duration">{result.duration * 1000:.1f} ms</td><td>{details}</td></tr>\n')
+        self.file.flush()
+
+    def close(self, summary):
+        counts = ", ".join(f"{summary[status]} {status}" for status in STATUSES)
+        self.file.write(f'</tbody>\n</table>\n<p id="summary"><b>{summary["tests"]} checks</b>: {counts} '
+                        f'in {summary["time"]:.1f}s</p>\n</body>\n</html>\n')
+        self.file.close()
+
+
+class ResultStream:
+    """Thread-safe fan-out of TestResults to the configured writers
+
+    With no writers it only keeps the counts, so testers can always record.
+    """
+
+    def __init__(self, suite, writers=()):
+        self.suite = suite
+        self.writers = list(writers)
+        self.counts = dict.fromkeys(STATUSES, 0)
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, suite, args):
+        """Writers for the --jsonl/--junit/--html options of add_result_arguments"""
+        writers = []
+        if getattr(args, "jsonl", None):
+            writers.append(JsonLinesWriter(args.jsonl))
+        if getattr(args, "junit", None):
+            writers.append(JUnitXmlWriter(args.junit, suite))
+        if getattr(args, "html", None):
+            writers.append(HtmlReportWriter(args.html, suite))
+        return cls(suite, writers)
+
+    def add(self, result):
+        with self.lock:
+            self.counts[result.status] = self.counts.get(result.status, 0) + 1
+            for writer in self.writers:
+                writer.write(result)
+        return result
+
+    def record(self, name, status, duration=0.0, message=None, output=""):
+        return self.add(TestResult(self.suite, name, status, duration, message, output))
+
+    def add_check(self, check, output=""):
+        """CheckScheduler on_result callback"""
+        return self.add(TestResult.from_check(self.suite, check, output))
+
+    def summary(self):
+        return dict(self.counts, suite=self.suite, tests=sum(self.counts.values()),
+                    time=time.monotonic() - self.started)
+
+    def close(self):
+        summary = self.summary()
+        with self.lock:
+            for writer in self.writers:
+                writer.close(summary)
+            self.writers = []
+        return summary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def add_result_arguments(parser):
+    group = parser.add_argument_group("machine-readable results")
+    group.add_argument("--jsonl", help="stream results as JSON Lines to this file")
+    group.add_argument("--junit", help="write results as JUnit XML to this file")
+    group.add_argument("--html", help="write results as a self-contained HTML report to this file")
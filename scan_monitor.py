@@ -0,0 +1,169 @@
+"""
+Monitor conjunto de escaneos de larga duración (spider y escaneo activo de ZAP)
+
+Sigue varios escaneos a la vez desde un único bucle: cada uno se consulta con un
+intervalo adaptativo (corto cuando avanza deprisa o está a punto de terminar,
+cada vez más largo cuando no avanza), todos se muestran en una única línea de
+progreso y cada escaneo tiene un tiempo máximo tras el cual se detiene, de modo
+que un escaneo que nunca llega a "100" no bloquea el trabajo.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RUNNING = "running"
+DONE = "done"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+# Consecutive failed polls after which a scan is given up
+MAX_POLL_ERRORS = 3
+
+
+class ScanJob:
+    __slots__ = ("name", "poll", "stop", "timeout", "on_done", "status", "progress",
+                 "started", "finished", "interval", "next_poll", "last_change", "errors", "polls")
+
+    def __init__(self, name, poll, stop, timeout, on_done, now, interval):
+        self.name = name
+        self.poll = poll
+        self.stop = stop
+        self.timeout = timeout
+        self.on_done = on_done
+        self.status = RUNNING
+        self.progress = 0
+        self.started = now
+        self.finished = None
+        self.interval = interval
+        self.next_poll = now
+        self.last_change = now
+        self.errors = 0
+        self.polls = 0
+
+    @property
+    def duration(self):
+        return None if self.finished is None else self.finished - self.started
+
+
+class ScanMonitor:
+    """Poll many scans together with adaptive intervals and hard timeouts
+
+    poll() returns the progress percentage (0-100); stop() is called when a
+    scan exceeds its timeout; on_done(job) runs when a scan reaches 100 and
+    may add follow-up scans (e.g. the active scan after the spider).
+    on_finish(job) runs whenever a scan ends, whatever its status, e.g. to
+    start the next queued scan.
+    """
+
+    def __init__(self, min_interval=0.25, max_interval=10.0, poll_workers=8,
+                 clock=time.monotonic, sleep=time.sleep, on_finish=None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.poll_workers = poll_workers
+        self.clock = clock
+        self.sleep = sleep
+        self.on_finish = on_finish
+        self.jobs = {}
+
+    def add(self, name, poll, stop=None, timeout=600, on_done=None):
+        if name in self.jobs:
+            raise ValueError(f"Duplicate scan: {name}")
+        self.jobs[name] = ScanJob(name, poll, stop, timeout, on_done, self.clock(), self.min_interval)
+        return self.jobs[name]
+
+    def _next_interval(self, job, progress, now):
+        if progress > job.progress:
+            # Aim to look again a little before the estimated completion
+            rate = (progress - job.progress) / max(now - job.last_change, 1e-6)
+            remaining = (100 - progress) / rate
+            return min(self.max_interval, max(self.min_interval, remaining / 2))
+        # No progress: back off geometrically
+        return min(self.max_interval, job.interval * 1.5)
+
+    def _finish(self, job, status, now):
+        job.status = status
+        job.finished = now
+        if status == DONE and job.on_done is not None:
+            job.on_done(job)
+        elif status == TIMEOUT and job.stop is not None:
+            try:
+                job.stop()
+            except Exception:
+                pass
+        if self.on_finish is not None:
+            self.on_finish(job)
+
+    def _update(self, job, outcome, now):
+        job.polls += 1
+        if isinstance(outcome, Exception):
+            job.errors += 1
+            if job.errors >= MAX_POLL_ERRORS:
+                self._finish(job, ERROR, now)
+                return True
+            job.interval = min(self.max_interval, job.interval * 2)
+            job.next_poll = now + job.interval
+            return False
+
+        job.errors = 0
+        progress = max(0, min(100, int(outcome)))
+        changed = progress != job.progress
+        if progress >= 100:
+            job.progress = 100
+            self._finish(job, DONE, now)
+            return True
+        job.interval = self._next_interval(job, progress, now)
+        if changed:
+            job.progress = progress
+            job.last_change = now
+        job.next_poll = now + job.interval
+        return changed
+
+    def _safe_poll(self, job):
+        try:
+            return job.poll()
+        except Exception as e:
+            return e
+
+    def progress_line(self):
+        parts = []
+        for job in self.jobs.values():
+            marker = {DONE: " ✅", TIMEOUT: " ⏱️", ERROR: " ❌"}.get(job.status, "")
+            parts.append(f"{job.name} {job.progress}%{marker}")
+        return "   Progress: " + " | ".join(parts)
+
+    def run(self):
+        """Monitor until every scan is done, failed or timed out"""
+        with ThreadPoolExecutor(max_workers=self.poll_workers) as executor:
+            while True:
+                now = self.clock()
+                running = [job for job in self.jobs.values() if job.status == RUNNING]
+                if not running:
+                    break
+
+                changed = False
+                for job in running:
+                    if now - job.started >= job.timeout:
+                        self._finish(job, TIMEOUT, now)
+                        changed = True
+
+                due = [job for job in running if job.status == RUNNING and job.next_poll <= now]
+                outcomes = list(executor.map(self._safe_poll, due))
+                now = self.clock()
+                for job, outcome in zip(due, outcomes):
+                    changed = self._update(job, outcome, now) or changed
+
+                if changed:
+                    print(self.progress_line())
+
+                pending = [job for job in self.jobs.values() if job.status == RUNNING]
+                if pending:
+                    wake = min(min(job.next_poll, job.started + job.timeout) for job in pending)
+                    self.sleep(max(0.0, wake - self.clock()))
+        return self.jobs
+
+
+def print_scan_summary(jobs):
+    for job in jobs.values():
+        marker = {DONE: "✅", TIMEOUT: "⏱️ ", ERROR: "❌"}[job.status]
+        print(f"   {marker} {job.name:<28} {job.status:<8} {job.progress:>3}%  "
+              f"{job.duration:7.1f}s  {job.polls} polls")
@@ -0,0 +1,107 @@
+"""
+Estado persistente para el escaneo activo incremental de ZAP
+
+Guarda en un fichero JSON, por cada ruta descubierta (URL normalizada más el
+conjunto de parámetros), una huella de la respuesta y las alertas encontradas la
+última vez que se escaneó. En la siguiente ejecución solo las rutas nuevas o
+cuya huella ha cambiado necesitan escaneo activo; para el resto se reutilizan
+las alertas guardadas.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+import http_client
+from header_audit import route_key
+from payload_fuzzer import body_fingerprint
+
+STATE_VERSION = 1
+
+
+def response_fingerprint(session, url):
+    """Status plus a hash of the body with volatile values masked, or None"""
+    try:
+        response = session.get(url)
+    except requests.exceptions.RequestException:
+        return None
+    return f"{response.status_code}:{body_fingerprint(response.text, '')}"
+
+
+def fingerprint_urls(urls, workers=16, session=None):
+    """{route key: {"url", "params", "fingerprint"}} for every distinct route"""
+    session = session or http_client.create_session(pool_maxsize=workers)
+    routes = {}
+    for url in urls:
+        routes.setdefault(route_key(url), url)
+
+    def fingerprint(item):
+        key, url = item
+        params = sorted({name for name, _ in parse_qsl(urlsplit(url).query, keep_blank_values=True)})
+        return key, {"url": url, "params": params, "fingerprint": response_fingerprint(session, url)}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(executor.map(fingerprint, routes.items()))
+
+
+class ScanState:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as state_file:
+                data = json.load(state_file)
+            if data.get("version") == STATE_VERSION:
+                self.entries = data.get("entries", {})
+
+    def plan(self, current):
+        """Split current routes into (new, changed, unchanged) key lists
+
+        A route whose fingerprint could not be taken is treated as changed.
+        """
+        new, changed, unchanged = [], [], []
+        for key, entry in current.items():
+            previous = self.entries.get(key)
+            if previous is None:
+                new.append(key)
+            elif (entry["fingerprint"] is None or previous["fingerprint"] != entry["fingerprint"]
+                    or previous["params"] != entry["params"]):
+                changed.append(key)
+            else:
+                unchanged.append(key)
+        return new, changed, unchanged
+
+    def stored_alerts(self, keys):
+        for key in keys:
+            yield from self.entries.get(key, {}).get("alerts", [])
+
+    def update(self, current, records, scanned):
+        """Record the fingerprints and, for scanned routes, their fresh alerts
+
+        records are aggregated alert records; each belongs to the route whose
+        key equals its normalized URL. Routes no longer discovered are dropped.
+        """
+        by_route = {}
+        for record in records:
+            by_route.setdefault(record["url"], []).append(record)
+
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        scanned = set(scanned)
+        entries = {}
+        for key, entry in current.items():
+            previous = self.entries.get(key, {})
+            if key in scanned or not previous:
+                entries[key] = dict(entry, scanned_at=now, alerts=by_route.get(key, []))
+            else:
+                entries[key] = dict(previous, url=entry["url"])
+        self.entries = entries
+
+    def save(self):
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as state_file:
+            json.dump({"version": STATE_VERSION, "entries": self.entries}, state_file, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
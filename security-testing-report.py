@@ -2,46 +2,120 @@
 Generador de informes de implementación de pruebas de seguridad
 
 Este script genera un informe completo en PDF de las actividades de pruebas de seguridad.
+Los hallazgos se leen de un JSON de OWASP ZAP o del histórico SQLite de alertas
+(alert_store.py); sin ninguno de los dos se usan los hallazgos de ejemplo.
+Los documentos y sus secciones se generan en paralelo y las secciones se
+reutilizan de una caché mientras sus datos no cambien (report_builder.py).
+
+Uso:
+    python security-testing-report.py --zap-json alerts.json
+    python security-testing-report.py --alert-db alerts.db [--run 12]
 """
 
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
+import argparse
+import inspect
+import os
+import tempfile
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-import io
-import base64
 
-def create_security_testing_report():
-    """Create a comprehensive security testing report"""
-    
-    # Create PDF document
-    doc = SimpleDocTemplate("security-testing-report.pdf", pagesize=A4)
-    story = []
-    
-    # Get styles
+import report_findings
+from report_builder import (DEFAULT_CACHE_DIR, PdfWriter, Section, SectionCache, build_documents, file_digest,
+                            print_build_summary, render_pdf)
+from report_findings import (findings_from_file, findings_from_records, findings_from_store, findings_from_zap_json,
+                             findings_table, write_findings)
+from result_writers import FAILED, SKIPPED, ResultStream, add_result_arguments
+from zap_alerts import DEFAULT_MAX_RECORDS, RISK_ORDER
+
+RISK_DESCRIPTIONS = {
+    "High": "Critical vulnerabilities requiring immediate attention",
+    "Medium": "Significant vulnerabilities needing prompt remediation",
+    "Low": "Minor issues that should be addressed",
+    "Informational": "Security best practice recommendations",
+}
+
+# Example findings used when no ZAP output or alert history is given
+SAMPLE_FINDINGS = [
+    {
+        "pluginId": "40012",
+        "alert": "Cross-Site Scripting (XSS)",
+        "risk": "High",
+        "url": "/search",
+        "param": "q",
+        "count": 1,
+        "description": "Reflected XSS found in search functionality",
+        "impact": "Allows execution of malicious scripts in victim's browser",
+        "location": "/search?q= parameter",
+        "solution": "Implement proper input validation and output encoding"
+    },
+    {
+        "pluginId": "40018",
+        "alert": "SQL Injection",
+        "risk": "High",
+        "url": "/login",
+        "param": "username",
+        "count": 1,
+        "description": "SQL injection vulnerability in login form",
+        "impact": "Potential for database access and data theft",
+        "location": "/login username parameter",
+        "solution": "Use parameterized queries and input validation"
+    },
+    {
+        "pluginId": "10021",
+        "alert": "Missing Security Headers",
+        "risk": "Medium",
+        "url": "/",
+        "param": "",
+        "count": 1,
+        "description": "Critical security headers not implemented",
+        "impact": "Increased vulnerability to various attacks",
+        "location": "All application responses",
+        "solution": "Implement X-Content-Type-Options, X-Frame-Options, etc."
+    }
+]
+
+
+def sample_findings():
+    details = {finding["pluginId"]: {key: finding[key] for key in ("description", "impact", "location", "solution")}
+               for finding in SAMPLE_FINDINGS}
+    return findings_from_records(SAMPLE_FINDINGS, "sample findings", details)
+
+
+@lru_cache(maxsize=None)
+def report_styles():
+    """Sample stylesheet plus the report's custom styles, built once per process"""
     styles = getSampleStyleSheet()
-    title_style = styles['Title']
-    heading_style = styles['Heading1']
-    subheading_style = styles['Heading2']
-    normal_style = styles['Normal']
     
     # Add custom styles
-    custom_heading = ParagraphStyle(
+    styles.add(ParagraphStyle(
         'CustomHeading',
         parent=styles['Heading2'],
         fontSize=14,
         spaceAfter=12,
         textColor=colors.darkblue
-    )
+    ))
     
-    custom_subheading = ParagraphStyle(
+    styles.add(ParagraphStyle(
         'CustomSubHeading',
         parent=styles['Heading3'],
         fontSize=12,
         spaceAfter=8,
         textColor=colors.darkgreen
-    )
+    ))
+    return styles
+
+
+def title_section(data):
+    """Title page"""
+    story = []
+    styles = report_styles()
+    title_style = styles['Title']
+    normal_style = styles['Normal']
     
     # Title Page
     story.append(Paragraph("Security Testing Implementation Report", title_style))
@@ -51,9 +125,16 @@ def create_security_testing_report():
     story.append(Paragraph("Prepared by: Security Testing Team", normal_style))
     story.append(Spacer(1, 0.2*inch))
     story.append(Paragraph("Date: November 2025", normal_style))
-    story.append(PageBreak())
-    
-    # Table of Contents would go here in a real implementation
+    return story
+
+
+def summary_section(data):
+    """1. Executive Summary and 2. Testing Objectives"""
+    story = []
+    styles = report_styles()
+    heading_style = styles['Heading1']
+    normal_style = styles['Normal']
+    custom_subheading = styles['CustomSubHeading']
     
     # 1. Executive Summary
     story.append(Paragraph("1. Executive Summary", heading_style))
@@ -85,7 +166,16 @@ def create_security_testing_report():
         story.append(Paragraph(f"{i}. {objective}", custom_subheading))
         story.append(Spacer(1, 0.1*inch))
     
-    story.append(PageBreak())
+    return story
+
+
+def methodology_section(data):
+    """3. Testing Methodology and 4. Implementation Steps"""
+    story = []
+    styles = report_styles()
+    heading_style = styles['Heading1']
+    normal_style = styles['Normal']
+    custom_heading = styles['CustomHeading']
     
     # 3. Methodology
     story.append(Paragraph("3. Testing Methodology", heading_style))
@@ -200,7 +290,28 @@ def create_security_testing_report():
             story.append(Paragraph(f"• {detail}", normal_style))
         story.append(Spacer(1, 0.2*inch))
     
-    story.append(PageBreak())
+    return story
+
+
+def findings_section(data):
+    """5. Security Findings and Results
+
+    data is {"source", "digest", "max_alert_types"} and optionally
+    "_findings_file", findings the parent already built (write_findings);
+    otherwise they are loaded here, in the worker process, from the source spec.
+    """
+    story = []
+    styles = report_styles()
+    heading_style = styles['Heading1']
+    normal_style = styles['Normal']
+    custom_heading = styles['CustomHeading']
+    custom_subheading = styles['CustomSubHeading']
+    
+    if data.get("_findings_file"):
+        findings = findings_from_file(data["_findings_file"])
+    else:
+        findings = load_findings(data["source"])
+    max_alert_types = data.get("max_alert_types", 25)
     
     # 5. Findings and Results
     story.append(Paragraph("5. Security Findings and Results", heading_style))
@@ -208,23 +319,24 @@ def create_security_testing_report():
     
     story.append(Paragraph("5.1 Vulnerability Summary", custom_heading))
     story.append(Spacer(1, 0.1*inch))
+    story.append(Paragraph(f"Source: {escape(str(findings.source))}", normal_style))
+    story.append(Spacer(1, 0.1*inch))
     
     # Vulnerability summary table
-    vulnerability_data = [
-        ["Risk Level", "Count", "Description"],
-        ["High", "3", "Critical vulnerabilities requiring immediate attention"],
-        ["Medium", "5", "Significant vulnerabilities needing prompt remediation"],
-        ["Low", "8", "Minor issues that should be addressed"],
-        ["Informational", "4", "Security best practice recommendations"]
-    ]
+    vulnerability_data = [["Risk Level", "Findings", "Occurrences", "Description"]]
+    for risk in RISK_ORDER:
+        totals = findings.risk_totals.get(risk, {"findings": 0, "occurrences": 0})
+        vulnerability_data.append([risk, str(totals["findings"]), str(totals["occurrences"]),
+                                   Paragraph(RISK_DESCRIPTIONS[risk], normal_style)])
     
-    vulnerability_table = Table(vulnerability_data)
+    vulnerability_table = Table(vulnerability_data, colWidths=[80, 60, 75, 236])
     vulnerability_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
         ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
         ('GRID', (0, 0), (-1, -1), 1, colors.black)
@@ -233,50 +345,45 @@ def create_security_testing_report():
     story.append(vulnerability_table)
     story.append(Spacer(1, 0.3*inch))
     
-    # Detailed findings
-    findings = [
-        {
-            "vulnerability": "Cross-Site Scripting (XSS)",
-            "risk": "High",
-            "description": "Reflected XSS found in search functionality",
-            "impact": "Allows execution of malicious scripts in victim's browser",
-            "location": "/search?q= parameter",
-            "recommendation": "Implement proper input validation and output encoding"
-        },
-        {
-            "vulnerability": "SQL Injection",
-            "risk": "High",
-            "description": "SQL injection vulnerability in login form",
-            "impact": "Potential for database access and data theft",
-            "location": "/login username parameter",
-            "recommendation": "Use parameterized queries and input validation"
-        },
-        {
-            "vulnerability": "Missing Security Headers",
-            "risk": "Medium",
-            "description": "Critical security headers not implemented",
-            "impact": "Increased vulnerability to various attacks",
-            "location": "All application responses",
-            "recommendation": "Implement X-Content-Type-Options, X-Frame-Options, etc."
-        }
-    ]
-    
+    # Detailed analysis, one entry per alert type
     story.append(Paragraph("5.2 Detailed Vulnerability Analysis", custom_heading))
     story.append(Spacer(1, 0.1*inch))
     
-    for i, finding in enumerate(findings, 1):
-        story.append(Paragraph(f"5.2.{i} {finding['vulnerability']} ({finding['risk']} Risk)", custom_subheading))
+    for i, alert_type in enumerate(findings.alert_types[:max_alert_types], 1):
+        story.append(Paragraph(f"5.2.{i} {escape(str(alert_type['alert']))} ({alert_type['risk']} Risk)",
+                               custom_subheading))
         story.append(Spacer(1, 0.1*inch))
-        story.append(Paragraph(f"<b>Description:</b> {finding['description']}", normal_style))
+        for label, key in (("Description", "description"), ("Impact", "impact")):
+            if alert_type.get(key):
+                story.append(Paragraph(f"<b>{label}:</b> {escape(alert_type[key])}", normal_style))
+                story.append(Spacer(1, 0.05*inch))
+        location = alert_type.get("location") or f"{alert_type['routes']} routes"
+        story.append(Paragraph(f"<b>Location:</b> {escape(location)} "
+                               f"({alert_type['occurrences']} occurrences)", normal_style))
         story.append(Spacer(1, 0.05*inch))
-        story.append(Paragraph(f"<b>Impact:</b> {finding['impact']}", normal_style))
-        story.append(Spacer(1, 0.05*inch))
-        story.append(Paragraph(f"<b>Location:</b> {finding['location']}", normal_style))
-        story.append(Spacer(1, 0.05*inch))
-        story.append(Paragraph(f"<b>Recommendation:</b> {finding['recommendation']}", normal_style))
+        if alert_type.get("solution"):
+            story.append(Paragraph(f"<b>Recommendation:</b> {escape(alert_type['solution'])}", normal_style))
+        story.append(Spacer(1, 0.2*inch))
+    if len(findings.alert_types) > max_alert_types:
+        story.append(Paragraph(f"... {len(findings.alert_types) - max_alert_types} more alert types, "
+                               "listed in section 5.3", normal_style))
         story.append(Spacer(1, 0.2*inch))
     
+    # Every finding; rows are laid out from the stream a chunk at a time
     story.append(PageBreak())
+    story.append(Paragraph("5.3 All Findings", custom_heading))
+    story.append(Spacer(1, 0.1*inch))
+    story.append(findings_table(findings))
+    return story
+
+
+def interpretation_section(data):
+    """6. Interpretation of Results and 7. Preventive Measures"""
+    story = []
+    styles = report_styles()
+    heading_style = styles['Heading1']
+    normal_style = styles['Normal']
+    custom_heading = styles['CustomHeading']
     
     # 6. Interpretation of Results
     story.append(Paragraph("6. Interpretation of Results", heading_style))
@@ -361,7 +468,15 @@ def create_security_testing_report():
             story.append(Paragraph(f"• {measure}", normal_style))
         story.append(Spacer(1, 0.2*inch))
     
-    story.append(PageBreak())
+    return story
+
+
+def conclusion_section(data):
+    """8. Conclusion"""
+    story = []
+    styles = report_styles()
+    heading_style = styles['Heading1']
+    normal_style = styles['Normal']
     
     # 8. Conclusion
     story.append(Paragraph("8. Conclusion", heading_style))
@@ -383,17 +498,13 @@ def create_security_testing_report():
         normal_style
     ))
     
-    # Build PDF
-    doc.build(story)
-    print("Security Testing Report generated successfully as 'security-testing-report.pdf'")
+    return story
 
-def create_implementation_steps_document():
-    """Create a detailed implementation steps document"""
-    
-    doc = SimpleDocTemplate("implementation-steps.pdf", pagesize=A4)
+
+def implementation_steps_section(data):
+    """Step-by-step implementation guide"""
     story = []
-    
-    styles = getSampleStyleSheet()
+    styles = report_styles()
     title_style = styles['Title']
     heading_style = styles['Heading1']
     subheading_style = styles['Heading2']
@@ -410,7 +521,7 @@ def create_implementation_steps_document():
             "description": "Setting up the testing environment",
             "details": [
                 "Install Python 3.7 or higher",
-                "Install required packages: pip install flask requests reportlab",
+                "Install required packages: pip install flask requests reportlab pypdf",
                 "Download OWASP ZAP from https://www.zaproxy.org/",
                 "Install OWASP ZAP with default settings"
             ]
@@ -496,22 +607,125 @@ def create_implementation_steps_document():
             story.append(Paragraph(f"• {detail}", normal_style))
         story.append(Spacer(1, 0.3*inch))
     
-    doc.build(story)
-    print("Implementation Steps document generated successfully as 'implementation-steps.pdf'")
+    return story
+
+
+def load_findings(source):
+    """Findings for a source spec: ["zap_json", path, max_records], ["alert_db", path, run] or ["sample"]"""
+    if source[0] == "zap_json":
+        return findings_from_zap_json(source[1], source[2])
+    if source[0] == "alert_db":
+        return findings_from_store(source[1], source[2])
+    return sample_findings()
+
+
+def source_digest(source):
+    """Content hash of a findings source, part of the findings section's cache key"""
+    if source[0] == "zap_json":
+        return file_digest(source[1])
+    return load_findings(source).digest()
+
+
+def report_sections(source=("sample",), max_alert_types=25, findings_file=None):
+    findings_data = {"source": list(source), "digest": source_digest(source), "max_alert_types": max_alert_types}
+    if findings_file:
+        findings_data["_findings_file"] = findings_file
+    return [
+        Section("title", title_section),
+        Section("summary", summary_section),
+        Section("methodology", methodology_section),
+        Section("findings", findings_section, findings_data),
+        Section("interpretation", interpretation_section),
+        Section("conclusion", conclusion_section),
+    ]
+
+
+def implementation_steps_sections():
+    return [Section("implementation_steps", implementation_steps_section)]
+
+
+def render_salt():
+    """What every section draws with besides its own code: styles and the findings table"""
+    return inspect.getsource(report_styles) + file_digest(report_findings.__file__)
+
+
+def record_findings(results, findings):
+    """Stream every finding into results: High and Medium risk findings fail, the rest are skipped
+
+    Low and Informational findings are reported, not counted as passes.
+    """
+    for finding in findings.rows():
+        param = f" [{finding['param']}]" if finding.get("param") else ""
+        results.record(f"{finding['alert']} | {finding['url']}{param}",
+                       FAILED if finding["risk"] in ("High", "Medium") else SKIPPED,
+                       message=f"{finding['risk']} risk, {finding['count']} occurrences")
+
+
+def create_security_testing_report(source=("sample",), output="security-testing-report.pdf", max_alert_types=25):
+    """Create a comprehensive security testing report in this process, without the section cache"""
+    render_pdf(output, [(section.build, section.data) for section in report_sections(source, max_alert_types)])
+    print(f"Security Testing Report generated successfully as '{output}'")
+
+
+def create_implementation_steps_document(output="implementation-steps.pdf"):
+    """Create a detailed implementation steps document"""
+    render_pdf(output, [(section.build, section.data) for section in implementation_steps_sections()])
+    print(f"Implementation Steps document generated successfully as '{output}'")
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the security testing PDF documents")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--zap-json", help="ZAP alerts JSON (core/view/alerts answer or traditional-json report)")
+    source.add_argument("--alert-db", help="SQLite alert history written by owasp-zap-security-test.py")
+    parser.add_argument("--run", type=int, help="alert history run to report (default: latest)")
+    parser.add_argument("--max-records", type=int, default=DEFAULT_MAX_RECORDS,
+                        help="cap on distinct findings kept from --zap-json (default: %(default)s)")
+    parser.add_argument("--output", default="security-testing-report.pdf")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="rendered section cache")
+    parser.add_argument("--no-cache", action="store_true", help="render every section from scratch")
+    parser.add_argument("--workers", type=int, help="rendering processes (default: CPU count)")
+    parser.add_argument("--no-pdf", action="store_true", help="only write the --jsonl/--junit/--html outputs")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    source = ["sample"]
+    if args.zap_json:
+        source = ["zap_json", args.zap_json, args.max_records]
+    elif args.alert_db:
+        source = ["alert_db", args.alert_db, args.run]
+
+    # A ZAP export is parsed once per run: the result outputs and the findings
+    # section (through a scratch file) share the same Findings
+    findings = findings_from_zap_json(args.zap_json, args.max_records) if args.zap_json else None
+    if args.jsonl or args.junit or args.html:
+        with ResultStream.from_args("security-findings", args) as results:
+            record_findings(results, findings or load_findings(source))
+        print(f"Findings written: {results.summary()['tests']} results")
+    if args.no_pdf:
+        raise SystemExit(0)
+
     print("Generating Security Testing Documents...")
     print("=" * 50)
     
-    # Create main security testing report
-    create_security_testing_report()
-    
-    # Create implementation steps document
-    create_implementation_steps_document()
+    # Both documents, and the sections within them, render in parallel
+    with tempfile.TemporaryDirectory(prefix="security-report-") as scratch:
+        findings_file = None
+        if findings is not None:
+            findings_file = os.path.join(scratch, "findings.jsonl")
+            write_findings(findings, findings_file)
+        documents = {
+            args.output: report_sections(source, findings_file=findings_file),
+            "implementation-steps.pdf": implementation_steps_sections(),
+        }
+        cache = None if args.no_cache else SectionCache(args.cache_dir)
+        if cache is not None and PdfWriter is None:
+            print("⚠ pypdf is not installed: section cache disabled, documents are rendered whole")
+        print_build_summary(build_documents(documents, cache, args.workers, render_salt()))
     
     print("\nDocument Generation Complete!")
     print("Generated files:")
-    print("1. security-testing-report.pdf - Main security testing report")
+    print(f"1. {args.output} - Main security testing report")
     print("2. implementation-steps.pdf - Detailed implementation steps")
     print("\nThese documents contain:")
     print("- Step-by-step implementation details")
@@ -1,14 +1,32 @@
 """
 Script de prueba funcional con Selenium para la aplicación de gestión de profesores
 Versión mejorada con esperas explícitas y manejo de errores más robusto.
+
+Cada paso espera a que Angular esté estable y no queden peticiones HTTP en
+curso (angular_waits) en lugar de dormir un tiempo fijo; al final se muestra
+cuánto duró cada espera. Los escenarios se reparten entre varios procesos, cada
+uno con su propio pool de sesiones de Chrome ya arrancadas (webdriver_pool), que
+se reinician entre escenario y escenario en lugar de abrir un navegador nuevo.
+
+Uso:
+    python selenium-test.py --base-url http://localhost:4201 --workers 4 --junit selenium.xml
 """
 
+import argparse
+import time
+import uuid
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-import time
+
+from angular_waits import DEFAULT_TIMEOUT, print_wait_summary
+from result_writers import FAILED, PASSED, ResultStream, add_result_arguments
+from teacher_table import extract_teacher_table, newest_teacher_id, print_table_diff, verify_teacher_table
+from webdriver_pool import print_pool_summary, run_scenarios
+
+BASE_URL = "http://localhost:4201"
+API_URL = "http://localhost:8080/api/teachers"
 
 
 def setup_driver():
@@ -18,62 +36,108 @@ def setup_driver():
     return webdriver.Chrome(options=chrome_options)
 
 
-def test_teacher_management():
-    driver = setup_driver()
-    driver.get("http://localhost:4201")
-
-    print("\n=== Test 1: Opening the application ===")
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.TAG_NAME, "app-root"))
-    )
-    print("✅ Aplicación cargada correctamente")
-
-    time.sleep(2)
-
-    print("\n=== Test 2: Verificando listado de profesores ===")
-    try:
-        # Esperar tabla si existe
-        teacher_rows = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-
-        if len(teacher_rows) > 0:
-            print(f"✅ Lista cargada con {len(teacher_rows)} profesores")
-        else:
-            print("ℹ Lista vacía, agregando profesor primero...")
-    except:
-        print("⚠ No se encontró la tabla")
-
-    print("\n=== Test 3: Creando profesor ===")
-
+def _step(results, name, started, ok, message=None):
+    results.record(name, PASSED if ok else FAILED, time.perf_counter() - started, None if ok else message)
+
+
+def scenario_application_load(waits, results, settings):
+    print("=== Test 1: Opening the application ===")
+    started = time.perf_counter()
+    load = waits.wait("application idle")
+    loaded = load.ready and bool(waits.driver.find_elements(By.TAG_NAME, "app-root"))
+    if loaded:
+        print("✅ Aplicación cargada correctamente")
+    else:
+        print(f"⚠ La aplicación no quedó estable ({load.reason})")
+    _step(results, "application_load", started, loaded, f"application not idle: {load.reason}")
+
+
+def scenario_teacher_list(waits, results, settings):
+    print("=== Test 2: Verificando listado de profesores ===")
+    started = time.perf_counter()
+    # Other workers may create teachers meanwhile. Every teacher the API had
+    # before the page was (re)loaded must be listed; later ones may not be
+    newest = newest_teacher_id(settings["api_url"])
+    waits.get(waits.driver.current_url, "reload teacher list")
+    diff, timings = verify_teacher_table(waits.driver, settings["api_url"], newer_than=newest)
+    if diff.ui_rows > 0:
+        print(f"✅ Lista cargada con {diff.ui_rows} profesores")
+    else:
+        print("ℹ Lista vacía")
+    print("🔍 Comparación con GET /api/teachers:")
+    print_table_diff(diff, timings)
+    _step(results, "teacher_list", started, diff.ok, diff.describe())
+
+
+def scenario_create_teacher(waits, results, settings):
+    driver = waits.driver
+    print("=== Test 3: Creando profesor ===")
+    started = time.perf_counter()
+    # Scenarios run concurrently against one backend: keep the email unique
+    email = f"selenium.tester.{uuid.uuid4().hex[:8]}@example.com"
     driver.find_element(By.ID, "firstName").send_keys("Selenium")
     driver.find_element(By.ID, "lastName").send_keys("Tester")
-    driver.find_element(By.ID, "email").send_keys("selenium.tester@example.com")
+    driver.find_element(By.ID, "email").send_keys(email)
     driver.find_element(By.ID, "subject").send_keys("QA Automation")
     driver.find_element(By.ID, "yearsOfExperience").send_keys("3")
 
     submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-    submit_btn.click()
-
-    time.sleep(3)
-    print("✅ Profesor registrado correctamente")
-
-    print("\n=== Test 4: Verificando actualización del listado ===")
-    teacher_rows_after = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-    print(f"📌 Total de profesores ahora: {len(teacher_rows_after)}")
-
-    print("\n=== Test 5: Validaciones del formulario ===")
-    
+    created = waits.click(submit_btn, "create teacher")
+    if created.ready:
+        print(f"✅ Profesor registrado correctamente ({email})")
+    else:
+        print(f"⚠ El registro no terminó a tiempo ({created.reason})")
+    _step(results, "create_teacher", started, created.ready, f"submit not settled: {created.reason}")
+
+    print("=== Test 4: Verificando actualización del listado ===")
+    started = time.perf_counter()
+    rows = extract_teacher_table(driver)
+    shown = any(row[2] == email for row in rows)
+    print(f"📌 Total de profesores ahora: {len(rows)}")
+    _step(results, "teacher_list_updated", started, shown, f"{email} not in the {len(rows)} rows of the list")
+
+
+def scenario_form_validation(waits, results, settings):
+    driver = waits.driver
+    print("=== Test 5: Validaciones del formulario ===")
+    started = time.perf_counter()
     # Enviar formulario vacío
-    driver.find_element(By.ID, "firstName").clear()
-    submit_btn.click()
-    time.sleep(1)
+    first_name = driver.find_element(By.ID, "firstName")
+    first_name.send_keys("x")
+    first_name.clear()
+    waits.click(driver.find_element(By.CSS_SELECTOR, "button[type='submit']"), "form validation")
 
     errors = driver.find_elements(By.CSS_SELECTOR, ".error-message")
     print(f"🔍 Validaciones detectadas: {len(errors)}")
+    _step(results, "form_validation", started, len(errors) > 0, "no validation message for an empty first name")
+
+
+SCENARIOS = [scenario_application_load, scenario_teacher_list, scenario_create_teacher, scenario_form_validation]
+
+
+def test_teacher_management(base_url=BASE_URL, timeout=DEFAULT_TIMEOUT, results=None, workers=2,
+                            api_url=API_URL):
+    results = results or ResultStream("selenium-test")
+    runs = run_scenarios(SCENARIOS, setup_driver, base_url, results, workers, timeout,
+                         {"api_url": api_url})
 
     print("\n=== PRUEBAS FINALIZADAS ===")
-    driver.quit()
-    print("WebDriver cerrado")
+    print("\n=== Esperas ===")
+    print_wait_summary([record for run in runs for record in run.waits])
+    print("\n=== Sesiones de WebDriver ===")
+    print_pool_summary(runs)
+    return runs
 
 
 if __name__ == "__main__":
-    test_teacher_management()
+    parser = argparse.ArgumentParser(description="Selenium functional tests for the teacher management app")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--api-url", default=API_URL, help="teachers endpoint the list is compared with")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="maximum seconds to wait for the app to go idle after each step")
+    parser.add_argument("--workers", type=int, default=2, help="worker processes running scenarios")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    with ResultStream.from_args("selenium-test", args) as results:
+        test_teacher_management(args.base_url, args.timeout, results, args.workers, args.api_url)
@@ -1,13 +1,22 @@
-""" 
+"""
 Script de prueba simple con Selenium para la aplicación de gestión de profesores
 
 Este script realiza pruebas funcionales básicas de la aplicación de gestión de profesores.
+Tras abrir la página espera a que Angular esté estable y sin peticiones HTTP en
+curso (angular_waits), en lugar de dormir un tiempo fijo.
 """
 
+import argparse
+import time
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-import time
+
+from angular_waits import DEFAULT_TIMEOUT, AngularWaits, print_wait_summary
+from result_writers import ERROR, FAILED, PASSED, ResultStream, add_result_arguments
+
+BASE_URL = "http://localhost:4201"
 
 def setup_driver():
     """Setup Chrome WebDriver with basic configuration"""
@@ -20,7 +29,7 @@ def setup_driver():
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-logging")
     chrome_options.add_argument("--silent")
-    
+
     try:
         driver = webdriver.Chrome(options=chrome_options)
         return driver
@@ -28,41 +37,59 @@ def setup_driver():
         print(f"Error setting up Chrome driver: {e}")
         return None
 
-def simple_test():
+def simple_test(base_url=BASE_URL, timeout=DEFAULT_TIMEOUT, results=None):
     """Simple test to verify the application loads"""
+    results = results or ResultStream("simple-selenium-test")
     driver = setup_driver()
     if not driver:
         print("Failed to setup WebDriver")
+        results.record("webdriver_setup", ERROR, message="Chrome WebDriver could not be started")
         return
-    
+
+    waits = AngularWaits(driver, timeout)
+    started = time.perf_counter()
     try:
         print("=== Simple Test: Opening the application ===")
-        driver.get("http://localhost:4201")
-        time.sleep(5)  # Wait for page to load
-        
+        load = waits.get(base_url, "load application")
+
         # Check if the page title is correct
         title = driver.title
         if "teacher" in title.lower() or "management" in title.lower():
             print("✅ Application page loaded successfully")
         else:
             print(f"ℹ️ Page loaded with title: {title}")
-        
+        results.record("application_load", PASSED if load.ready else FAILED, load.duration,
+                       None if load.ready else f"application not idle: {load.reason}")
+
         # Check if Angular app root is present
+        started = time.perf_counter()
         app_elements = driver.find_elements(By.TAG_NAME, "app-root")
         if len(app_elements) > 0:
             print("✅ Angular application is running")
         else:
             print("⚠️ Angular application root not found")
-            
+        results.record("angular_root", PASSED if app_elements else FAILED, time.perf_counter() - started,
+                       None if app_elements else "app-root not found")
+
         print("✅ Simple test completed successfully")
-        
+
     except Exception as e:
         print(f"❌ Test failed with error: {e}")
+        results.record("simple_test", ERROR, time.perf_counter() - started, str(e))
     finally:
         driver.quit()
         print("WebDriver closed")
+        print_wait_summary(waits.records)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simple Selenium smoke test for the teacher management app")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="maximum seconds to wait for the app to go idle")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
     print("Starting Simple Selenium Test for Teacher Management Application")
     print("=" * 60)
-    simple_test()
\ No newline at end of file
+    with ResultStream.from_args("simple-selenium-test", args) as results:
+        simple_test(args.base_url, args.timeout, results)
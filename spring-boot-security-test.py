@@ -2,21 +2,98 @@
 PRUEBAS DE SEGURIDAD PARA APLICACIONES SPRING BOOT + ANGULAR
 """
 
+import argparse
+import os
 import requests
 import json
 import time
+from itertools import chain
 from urllib.parse import urljoin
 
+import http_client
+from check_scheduler import PASSED, CheckScheduler, print_summary
+from cors_matrix import UNTRUSTED_ORIGINS, CorsMatrix, print_matrix
+from header_audit import SECURITY_HEADERS, HeaderAuditor, errored_routes, missing_headers, print_audit
+from payload_fuzzer import InjectionPoint, PayloadFuzzer, expand_cases, iter_payloads, print_anomalies
+from reflection_detector import ReflectionDetector
+from result_writers import ResultStream, add_result_arguments
+from teacher_client import batch_delete, iter_teachers
+
+PAYLOADS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payloads")
+SQL_WORDLIST = os.path.join(PAYLOADS_DIR, "sql-injection.txt")
+XSS_WORDLIST = os.path.join(PAYLOADS_DIR, "xss.txt")
+
+TEACHER_TEMPLATE = {
+    "firstName": "Fuzz",
+    "lastName": "Payload",
+    "email": "fuzz.payload@test.com",
+    "subject": "Security",
+    "yearsOfExperience": 1
+}
+
 class SpringBootSecurityTester:
-    def __init__(self, base_url="http://localhost:8080"):
+    def __init__(self, base_url="http://localhost:8080", session=None,
+                 sql_wordlist=SQL_WORDLIST, xss_wordlist=XSS_WORDLIST, fuzz_concurrency=32,
+                 audit_urls=None, header_cache=None, results=None):
         self.base_url = base_url
         self.api_url = urljoin(base_url, "/api/teachers")
-        self.session = requests.Session()
+        self.session = session or http_client.get_session()
+        self.sql_wordlist = sql_wordlist
+        self.xss_wordlist = xss_wordlist
+        self.fuzzer = PayloadFuzzer(fuzz_concurrency)
+        # Routes whose headers are audited; the ZAP spider output can be passed in instead
+        self.audit_urls = audit_urls or [
+            urljoin(base_url, "/"),
+            self.api_url,
+            f"{self.api_url}/1",
+            f"{self.api_url}/search?subject=Mathematics",
+        ]
+        self.header_auditor = HeaderAuditor(cache_path=header_cache)
+        self.results = results or ResultStream("spring-boot-security-test")
+        
+    def injection_points(self):
+        """Every path segment, query parameter and Teacher JSON field we fuzz"""
+        yield from InjectionPoint.path_segments(f"{self.api_url}/1")
+        yield from InjectionPoint.query_params(urljoin(self.base_url, "/"), ["search"])
+        yield from InjectionPoint.query_params(self.api_url, ["after", "size", "subject"])
+        yield from InjectionPoint.query_params(f"{self.api_url}/search",
+                                               ["email", "subject", "minExperience", "maxExperience"])
+        yield from InjectionPoint.json_fields(self.api_url, TEACHER_TEMPLATE)
+        
+    def run_payload_corpus(self, wordlist, on_response=None, prepare=None):
+        """Stream a wordlist through every injection point and return the report
+
+        prepare is called once per batch of payloads; see expand_cases.
+        """
+        created_ids = []
+        
+        def inspect(response):
+            # Payloads the API accepted became real teachers; remember them for cleanup
+            if response.status == 201 and response.case.point.kind == "json":
+                try:
+                    created_ids.append(json.loads(response.text)["id"])
+                except (ValueError, KeyError, TypeError):
+                    pass
+            if on_response is not None:
+                on_response(response)
+                
+        # Read-only points go first so the teachers created by the JSON cases
+        # cannot show up in the search results of the query cases
+        points = list(self.injection_points())
+        read_only = [point for point in points if point.method == "GET"]
+        mutating = [point for point in points if point.method != "GET"]
+        cases = chain(expand_cases(iter_payloads(wordlist), read_only, prepare=prepare),
+                      expand_cases(iter_payloads(wordlist), mutating, prepare=prepare))
+        try:
+            return self.fuzzer.run(cases, inspect)
+        finally:
+            if created_ids:
+                batch_delete(self.api_url, created_ids, session=self.session)
         
     def check_application_status(self):
         """Check if the application is running"""
         try:
-            response = requests.get(self.base_url)
+            response = self.session.get(self.base_url)
             if response.status_code == 200:
                 print("✅ Application is accessible")
                 return True
@@ -31,7 +108,7 @@ class SpringBootSecurityTester:
         """Test CORS configuration"""
         print("\n=== Testing CORS Configuration ===")
         try:
-            response = requests.options(self.api_url, headers={
+            response = self.session.options(self.api_url, headers={
                 'Origin': 'http://malicious-site.com',
                 'Access-Control-Request-Method': 'POST'
             })
@@ -41,27 +118,52 @@ class SpringBootSecurityTester:
                 print(f"✅ CORS is configured. Allowed origin: {allowed_origin}")
             else:
                 print("⚠️  CORS headers not found in response")
+            return True
         except Exception as e:
             print(f"❌ Error testing CORS: {e}")
+            return False
+            
+    def test_cors_matrix(self):
+        """Probe CORS preflights for every origin, method, header and endpoint"""
+        print("\n=== Testing CORS Preflight Matrix ===")
+        try:
+            matrix = CorsMatrix(self.base_url)
+            report = matrix.run()
+            print_matrix(matrix, report)
+            
+            risky = [row for row in report["rows"]
+                     if row["allowed"] and row["origins"] & set(UNTRUSTED_ORIGINS)]
+            credentialed = [row for row in risky if (row["credentials"] or "").lower() == "true"]
+            if credentialed:
+                print("❌ Untrusted origins are allowed to send credentialed requests")
+            elif risky:
+                print("⚠️  Untrusted origins pass the preflight (wildcard CORS policy)")
+            else:
+                print("✅ Only trusted origins pass the preflight")
+            return not credentialed
+        except Exception as e:
+            print(f"❌ Error testing CORS matrix: {e}")
+            return False
             
     def test_api_endpoints(self):
         """Test API endpoints for basic functionality"""
         print("\n=== Testing API Endpoints ===")
         
-        # Test GET all teachers
+        ok = True
+        # Test GET all teachers, streamed page by page
         try:
-            response = requests.get(self.api_url)
-            if response.status_code == 200:
-                teachers = response.json()
-                print(f"✅ GET /api/teachers successful. Found {len(teachers)} teachers")
-            else:
-                print(f"❌ GET /api/teachers failed with status {response.status_code}")
+            count = sum(1 for _ in iter_teachers(self.api_url, session=self.session))
+            print(f"✅ GET /api/teachers successful. Found {count} teachers")
+        except requests.exceptions.HTTPError as e:
+            print(f"❌ GET /api/teachers failed with status {e.response.status_code}")
+            ok = False
         except Exception as e:
             print(f"❌ Error testing GET /api/teachers: {e}")
+            ok = False
             
         # Test GET specific teacher
         try:
-            response = requests.get(f"{self.api_url}/1")
+            response = self.session.get(f"{self.api_url}/1")
             if response.status_code == 200:
                 teacher = response.json()
                 print(f"✅ GET /api/teachers/1 successful")
@@ -69,8 +171,11 @@ class SpringBootSecurityTester:
                 print("⚠️  Teacher with ID 1 not found")
             else:
                 print(f"❌ GET /api/teachers/1 failed with status {response.status_code}")
+                ok = False
         except Exception as e:
             print(f"❌ Error testing GET /api/teachers/1: {e}")
+            ok = False
+        return ok
             
     def test_input_validation(self):
         """Test input validation by sending malformed data"""
@@ -86,100 +191,142 @@ class SpringBootSecurityTester:
         }
         
         try:
-            response = requests.post(self.api_url, json=malformed_teacher)
+            response = self.session.post(self.api_url, json=malformed_teacher)
             if response.status_code == 400:
                 print("✅ Server properly validates input and returns 400 for bad request")
-            elif response.status_code == 200:
+            elif response.status_code in (200, 201):
                 print("⚠️  Server accepted malformed data (potential validation issue)")
             else:
                 print(f"ℹ️  POST returned status {response.status_code}")
+            # Any client error rejects the data; a success or a server error does not
+            return 400 <= response.status_code < 500
         except Exception as e:
             print(f"❌ Error testing input validation: {e}")
+            return False
             
     def test_security_headers(self):
-        """Check for important security headers"""
+        """Check for important security headers on every route"""
         print("\n=== Testing Security Headers ===")
         
         try:
-            response = requests.get(self.base_url)
-            headers = response.headers
-            
-            security_headers = {
-                'X-Content-Type-Options': 'nosniff',
-                'X-Frame-Options': 'DENY',
-                'X-XSS-Protection': '1; mode=block',
-                'Strict-Transport-Security': 'max-age=31536000'
-            }
+            report = self.header_auditor.audit(self.audit_urls)
+            print_audit(report)
             
-            missing_headers = []
-            for header, expected_value in security_headers.items():
-                if header in headers:
-                    print(f"✅ {header}: {headers[header]}")
-                else:
-                    missing_headers.append(header)
-                    
-            if missing_headers:
-                print(f"⚠️  Missing security headers: {', '.join(missing_headers)}")
+            missing = missing_headers(report)
+            errored = errored_routes(report)
+            if errored:
+                print(f"❌ {len(errored)} of {report['routes']} routes could not be audited")
+            if missing:
+                print(f"⚠️  Missing security headers: {', '.join(missing)}")
                 print("   These headers help protect against common web vulnerabilities")
+            elif not errored:
+                print(f"✅ Every audited route sends {', '.join(SECURITY_HEADERS)}")
+            return not (missing or errored)
         except Exception as e:
             print(f"❌ Error checking security headers: {e}")
+            return False
             
     def test_sql_injection(self):
-        """Test for basic SQL injection vulnerabilities"""
-        print("\n=== Testing for SQL Injection (Basic) ===")
+        """Test for SQL injection with the payload corpus"""
+        print("\n=== Testing for SQL Injection ===")
         
-        # Test with SQL injection payload in URL parameters
         try:
-            response = requests.get(f"{self.api_url}/1' OR '1'='1")
-            if response.status_code == 404:
-                print("✅ Application properly handles special characters in URL parameters")
-            elif response.status_code == 500:
+            report = self.run_payload_corpus(self.sql_wordlist)
+            print_anomalies(report)
+            server_errors = [row for row in report.anomalies()
+                             if row["status"] is not None and row["status"] >= 500]
+            if server_errors:
                 print("❌ Application may be vulnerable to SQL injection (500 error)")
             else:
-                print(f"ℹ️  SQL injection test returned status {response.status_code}")
+                print("✅ Application properly handles special characters in every injection point")
+            return not server_errors
         except Exception as e:
             print(f"❌ Error testing SQL injection: {e}")
+            return False
             
     def test_xss_vulnerabilities(self):
-        """Test for basic XSS vulnerabilities"""
-        print("\n=== Testing for XSS Vulnerabilities (Basic) ===")
+        """Test for reflected XSS with the payload corpus"""
+        print("\n=== Testing for XSS Vulnerabilities ===")
         
-        # Test with XSS payload
-        xss_payload = "<script>alert('XSS')</script>"
+        reflections = {}
+        escaped = [0]
         
-        # Test in query parameters
+        def find_reflection(response):
+            # Only an HTML document can execute a reflected script. The detector
+            # matches the whole batch, so a payload stored by another case counts too
+            if "html" not in response.content_type:
+                return
+            matches = response.case.context.scan(response.text)
+            raw = sorted(payload for payload, kind in matches if kind == "raw")
+            if raw:
+                label = response.case.point.label
+                count, sample = reflections.get(label, (0, raw[0]))
+                reflections[label] = (count + 1, sample)
+            elif matches:
+                escaped[0] += 1
+                
         try:
-            response = requests.get(f"{self.base_url}/?search={xss_payload}")
-            if xss_payload in response.text:
-                print("❌ Potential XSS vulnerability found in search parameter")
-            else:
-                print("✅ Application properly escapes HTML in search parameter")
+            report = self.run_payload_corpus(self.xss_wordlist, find_reflection, ReflectionDetector)
+            print_anomalies(report)
+            if escaped[0]:
+                print(f"ℹ️  {escaped[0]} HTML responses echoed a payload in escaped form")
+            for label, (count, sample) in sorted(reflections.items()):
+                print(f"❌ Potential XSS vulnerability: {count} payloads reflected unescaped "
+                      f"in {label} (e.g. {sample!r})")
+            if not reflections:
+                print("✅ Application properly escapes HTML in every injection point")
+            return not reflections
         except Exception as e:
-            print(f"❌ Error testing XSS in search parameter: {e}")
+            print(f"❌ Error testing XSS: {e}")
+            return False
             
-    def run_all_tests(self):
-        """Run all security tests"""
+    def run_all_tests(self, max_workers=4):
+        """Run all security tests, independent checks in parallel"""
         print("Starting Security Tests for Spring Boot + Angular Application")
         print("=" * 60)
         
-        # Check if application is running
-        if not self.check_application_status():
+        # Every check only needs the application to be up, so they all run side by side
+        scheduler = CheckScheduler(max_workers, on_result=self.results.add_check)
+        scheduler.add("application_status", self.check_application_status)
+        for name, check in (
+            ("cors_configuration", self.test_cors_configuration),
+            ("cors_matrix", self.test_cors_matrix),
+            ("api_endpoints", self.test_api_endpoints),
+            ("input_validation", self.test_input_validation),
+            ("security_headers", self.test_security_headers),
+            ("sql_injection", self.test_sql_injection),
+            ("xss_vulnerabilities", self.test_xss_vulnerabilities),
+        ):
+            scheduler.add(name, lambda _, check=check: check(), depends_on=["application_status"])
+        results = scheduler.run()
+        
+        if results["application_status"].status != PASSED:
             print("Cannot proceed with tests. Please start your Spring Boot application.")
-            return
-            
-        # Run all tests
-        self.test_cors_configuration()
-        self.test_api_endpoints()
-        self.test_input_validation()
-        self.test_security_headers()
-        self.test_sql_injection()
-        self.test_xss_vulnerabilities()
+            return results
         
         print("\n" + "=" * 60)
+        print_summary(results)
         print("Security Testing Complete")
         print("Note: This is a basic security test. For comprehensive security testing,")
         print("use tools like OWASP ZAP or Burp Suite.")
+        return results
 
 if __name__ == "__main__":
-    tester = SpringBootSecurityTester()
-    tester.run_all_tests()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Basic security tests for the Spring Boot backend")
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--workers", type=int, default=4, help="checks run concurrently")
+    parser.add_argument("--sql-wordlist", default=SQL_WORDLIST, help="SQL injection payloads, one per line")
+    parser.add_argument("--xss-wordlist", default=XSS_WORDLIST, help="XSS payloads, one per line")
+    parser.add_argument("--concurrency", type=int, default=32, help="payload requests in flight")
+    parser.add_argument("--audit-url", action="append", dest="audit_urls",
+                        help="URL whose security headers are audited (repeatable)")
+    parser.add_argument("--header-cache", help="JSON file keeping header audit results between runs")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    with ResultStream.from_args("spring-boot-security-test", args) as results:
+        tester = SpringBootSecurityTester(args.base_url, sql_wordlist=args.sql_wordlist,
+                                          xss_wordlist=args.xss_wordlist, fuzz_concurrency=args.concurrency,
+                                          audit_urls=args.audit_urls, header_cache=args.header_cache,
+                                          results=results)
+        tester.run_all_tests(args.workers)
\ No newline at end of file
@@ -0,0 +1,74 @@
+package vallegrande.edu.pe.Pruebas.controller;
+
+import vallegrande.edu.pe.Pruebas.model.BatchOperation;
+import vallegrande.edu.pe.Pruebas.model.BatchResult;
+import vallegrande.edu.pe.Pruebas.model.Teacher;
+import vallegrande.edu.pe.Pruebas.service.TeacherService;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.http.HttpStatus;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.*;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Optional;
+
+@RestController
+@RequestMapping("/api/teachers/batch")
+@CrossOrigin(origins = "*")
+public class TeacherBatchController {
+    
+    static final int MAX_BATCH_SIZE = 5000;
+    
+    @Autowired
+    private TeacherService teacherService;
+    
+    @PostMapping
+    public ResponseEntity<List<BatchResult>> applyBatch(@RequestBody List<BatchOperation> operations) {
+        if (operations.size() > MAX_BATCH_SIZE) {
+            return new ResponseEntity<>(HttpStatus.PAYLOAD_TOO_LARGE);
+        }
+        
+        // Each item gets the status code its single-record endpoint would have returned
+        List<BatchResult> results = new ArrayList<>(operations.size());
+        for (BatchOperation operation : operations) {
+            results.add(apply(operation));
+        }
+        return new ResponseEntity<>(results, HttpStatus.OK);
+    }
+    
+    private BatchResult apply(BatchOperation operation) {
+        String op = operation.getOp() == null ? "" : operation.getOp().toLowerCase();
+        switch (op) {
+            case "create":
+                if (operation.getTeacher() == null) {
+                    return error("teacher is required for create");
+                }
+                Teacher teacher = operation.getTeacher();
+                // Ensure ID is null for new teachers
+                teacher.setId(null);
+                Teacher savedTeacher = teacherService.saveTeacher(teacher);
+                return new BatchResult(HttpStatus.CREATED.value(), savedTeacher.getId(), savedTeacher, null);
+            case "update":
+                if (operation.getId() == null || operation.getTeacher() == null) {
+                    return error("id and teacher are required for update");
+                }
+                Optional<Teacher> updatedTeacher = teacherService.updateTeacher(operation.getId(), operation.getTeacher());
+                return updatedTeacher
+                        .map(value -> new BatchResult(HttpStatus.OK.value(), value.getId(), value, null))
+                        .orElseGet(() -> new BatchResult(HttpStatus.NOT_FOUND.value(), operation.getId(), null, null));
+            case "delete":
+                if (operation.getId() == null) {
+                    return error("id is required for delete");
+                }
+                HttpStatus status = teacherService.deleteTeacher(operation.getId()) ? HttpStatus.NO_CONTENT : HttpStatus.NOT_FOUND;
+                return new BatchResult(status.value(), operation.getId(), null, null);
+            default:
+                return error("unknown op: " + operation.getOp());
+        }
+    }
+    
+    private BatchResult error(String message) {
+        return new BatchResult(HttpStatus.BAD_REQUEST.value(), null, null, message);
+    }
+}
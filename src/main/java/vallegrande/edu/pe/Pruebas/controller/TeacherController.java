@@ -3,6 +3,8 @@ package vallegrande.edu.pe.Pruebas.controller;
 import vallegrande.edu.pe.Pruebas.model.Teacher;
 import vallegrande.edu.pe.Pruebas.service.TeacherService;
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.http.CacheControl;
+import org.springframework.http.HttpHeaders;
 import org.springframework.http.HttpStatus;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
@@ -12,22 +14,67 @@ import java.util.Optional;
 
 @RestController
 @RequestMapping("/api/teachers")
-@CrossOrigin(origins = "*")
+@CrossOrigin(origins = "*", exposedHeaders = {TeacherController.NEXT_CURSOR_HEADER, HttpHeaders.ETAG})
 public class TeacherController {
     
+    public static final String NEXT_CURSOR_HEADER = "X-Next-Cursor";
+    static final int DEFAULT_PAGE_SIZE = 100;
+    static final int MAX_PAGE_SIZE = 1000;
+    
     @Autowired
     private TeacherService teacherService;
     
     @GetMapping
-    public ResponseEntity<List<Teacher>> getAllTeachers() {
-        List<Teacher> teachers = teacherService.getAllTeachers();
-        return new ResponseEntity<>(teachers, HttpStatus.OK);
+    public ResponseEntity<List<Teacher>> getAllTeachers(@RequestParam(required = false) Long after,
+                                                        @RequestParam(required = false) Integer size,
+                                                        @RequestParam(required = false) String subject,
+                                                        @RequestHeader(value = HttpHeaders.IF_NONE_MATCH, required = false) String ifNoneMatch) {
+        // Read the version before the data so a concurrent write can only make the ETag older, never newer
+        String etag = "\"teachers-v" + teacherService.getVersion() + "\"";
+        if (etagMatches(ifNoneMatch, etag)) {
+            return ResponseEntity.status(HttpStatus.NOT_MODIFIED).eTag(etag).build();
+        }
+        
+        if (after == null && size == null && subject == null) {
+            List<Teacher> teachers = teacherService.getAllTeachers();
+            return ResponseEntity.ok().eTag(etag).cacheControl(CacheControl.noCache()).body(teachers);
+        }
+        
+        // Cursor pagination: fetch one extra record to know whether another page exists
+        int pageSize = size == null ? DEFAULT_PAGE_SIZE : Math.max(1, Math.min(size, MAX_PAGE_SIZE));
+        List<Teacher> page = teacherService.getTeachersPage(after, pageSize + 1, subject);
+        HttpHeaders headers = new HttpHeaders();
+        if (page.size() > pageSize) {
+            page = page.subList(0, pageSize);
+            headers.add(NEXT_CURSOR_HEADER, String.valueOf(page.get(pageSize - 1).getId()));
+        }
+        return ResponseEntity.ok().headers(headers).eTag(etag).cacheControl(CacheControl.noCache()).body(page);
+    }
+    
+    @GetMapping("/search")
+    public ResponseEntity<List<Teacher>> searchTeachers(@RequestParam(required = false) String email,
+                                                        @RequestParam(required = false) String subject,
+                                                        @RequestParam(required = false) Integer minExperience,
+                                                        @RequestParam(required = false) Integer maxExperience,
+                                                        @RequestHeader(value = HttpHeaders.IF_NONE_MATCH, required = false) String ifNoneMatch) {
+        String etag = "\"teachers-v" + teacherService.getVersion() + "\"";
+        if (etagMatches(ifNoneMatch, etag)) {
+            return ResponseEntity.status(HttpStatus.NOT_MODIFIED).eTag(etag).build();
+        }
+        
+        List<Teacher> teachers = teacherService.searchTeachers(email, subject, minExperience, maxExperience);
+        return ResponseEntity.ok().eTag(etag).cacheControl(CacheControl.noCache()).body(teachers);
     }
     
     @GetMapping("/{id}")
-    public ResponseEntity<Teacher> getTeacherById(@PathVariable Long id) {
+    public ResponseEntity<Teacher> getTeacherById(@PathVariable Long id,
+                                                  @RequestHeader(value = HttpHeaders.IF_NONE_MATCH, required = false) String ifNoneMatch) {
+        String etag = "\"teacher-" + id + "-r" + teacherService.getTeacherRevision(id) + "\"";
         Optional<Teacher> teacher = teacherService.getTeacherById(id);
-        return teacher.map(value -> new ResponseEntity<>(value, HttpStatus.OK))
+        if (teacher.isPresent() && etagMatches(ifNoneMatch, etag)) {
+            return ResponseEntity.status(HttpStatus.NOT_MODIFIED).eTag(etag).build();
+        }
+        return teacher.map(value -> ResponseEntity.ok().eTag(etag).cacheControl(CacheControl.noCache()).body(value))
                 .orElseGet(() -> new ResponseEntity<>(HttpStatus.NOT_FOUND));
     }
     
@@ -41,25 +88,34 @@ public class TeacherController {
     
     @PutMapping("/{id}")
     public ResponseEntity<Teacher> updateTeacher(@PathVariable Long id, @RequestBody Teacher teacher) {
-        Optional<Teacher> existingTeacher = teacherService.getTeacherById(id);
-        if (existingTeacher.isPresent()) {
-            // Ensure the ID is set correctly
-            teacher.setId(id);
-            Teacher updatedTeacher = teacherService.saveTeacher(teacher);
-            return new ResponseEntity<>(updatedTeacher, HttpStatus.OK);
-        } else {
-            return new ResponseEntity<>(HttpStatus.NOT_FOUND);
-        }
+        // Existence check and replacement happen atomically in the service
+        Optional<Teacher> updatedTeacher = teacherService.updateTeacher(id, teacher);
+        return updatedTeacher.map(value -> new ResponseEntity<>(value, HttpStatus.OK))
+                .orElseGet(() -> new ResponseEntity<>(HttpStatus.NOT_FOUND));
     }
     
     @DeleteMapping("/{id}")
     public ResponseEntity<Void> deleteTeacher(@PathVariable Long id) {
-        Optional<Teacher> existingTeacher = teacherService.getTeacherById(id);
-        if (existingTeacher.isPresent()) {
-            teacherService.deleteTeacher(id);
+        if (teacherService.deleteTeacher(id)) {
             return new ResponseEntity<>(HttpStatus.NO_CONTENT);
         } else {
             return new ResponseEntity<>(HttpStatus.NOT_FOUND);
         }
     }
+    
+    private static boolean etagMatches(String ifNoneMatch, String etag) {
+        if (ifNoneMatch == null) {
+            return false;
+        }
+        for (String candidate : ifNoneMatch.split(",")) {
+            String value = candidate.trim();
+            if (value.startsWith("W/")) {
+                value = value.substring(2);
+            }
+            if (value.equals("*") || value.equals(etag)) {
+                return true;
+            }
+        }
+        return false;
+    }
 }
\ No newline at end of file
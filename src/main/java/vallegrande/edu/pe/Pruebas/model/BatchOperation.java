@@ -0,0 +1,15 @@
+package vallegrande.edu.pe.Pruebas.model;
+
+import lombok.Data;
+import lombok.NoArgsConstructor;
+import lombok.AllArgsConstructor;
+
+@Data
+@NoArgsConstructor
+@AllArgsConstructor
+public class BatchOperation {
+    // One of "create", "update" or "delete"
+    private String op;
+    private Long id;
+    private Teacher teacher;
+}
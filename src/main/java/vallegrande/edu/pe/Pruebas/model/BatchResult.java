@@ -0,0 +1,17 @@
+package vallegrande.edu.pe.Pruebas.model;
+
+import com.fasterxml.jackson.annotation.JsonInclude;
+import lombok.Data;
+import lombok.NoArgsConstructor;
+import lombok.AllArgsConstructor;
+
+@Data
+@NoArgsConstructor
+@AllArgsConstructor
+@JsonInclude(JsonInclude.Include.NON_NULL)
+public class BatchResult {
+    private int status;
+    private Long id;
+    private Teacher teacher;
+    private String error;
+}
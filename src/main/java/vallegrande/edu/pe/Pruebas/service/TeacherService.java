@@ -7,7 +7,12 @@ import java.util.Optional;
 
 public interface TeacherService {
     List<Teacher> getAllTeachers();
+    List<Teacher> getTeachersPage(Long afterId, int size, String subject);
+    List<Teacher> searchTeachers(String email, String subject, Integer minExperience, Integer maxExperience);
     Optional<Teacher> getTeacherById(Long id);
+    long getVersion();
+    long getTeacherRevision(Long id);
     Teacher saveTeacher(Teacher teacher);
-    void deleteTeacher(Long id);
+    Optional<Teacher> updateTeacher(Long id, Teacher teacher);
+    boolean deleteTeacher(Long id);
 }
\ No newline at end of file
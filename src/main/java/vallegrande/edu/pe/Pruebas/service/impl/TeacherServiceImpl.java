@@ -5,27 +5,49 @@ import vallegrande.edu.pe.Pruebas.service.TeacherService;
 import org.springframework.stereotype.Service;
 
 import java.util.ArrayList;
-import java.util.HashMap;
+import java.util.Collection;
+import java.util.Collections;
 import java.util.List;
+import java.util.Locale;
 import java.util.Map;
+import java.util.NavigableSet;
 import java.util.Optional;
+import java.util.TreeSet;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ConcurrentMap;
+import java.util.concurrent.ConcurrentNavigableMap;
+import java.util.concurrent.ConcurrentSkipListMap;
+import java.util.concurrent.ConcurrentSkipListSet;
 import java.util.concurrent.atomic.AtomicLong;
 
 @Service
 public class TeacherServiceImpl implements TeacherService {
     
-    private final Map<Long, Teacher> teacherMap = new HashMap<>();
+    // Sorted by ID so pages can resume from a cursor without copying the whole store
+    private final ConcurrentNavigableMap<Long, Teacher> teacherMap = new ConcurrentSkipListMap<>();
     private final AtomicLong idGenerator = new AtomicLong(1);
     
+    // Bumped on every write; each teacher remembers the version of its last write (used for ETags)
+    private final AtomicLong version = new AtomicLong();
+    private final ConcurrentMap<Long, Long> revisions = new ConcurrentHashMap<>();
+    
+    // Secondary indexes; each maps a normalized key to the sorted IDs holding it
+    private final ConcurrentMap<String, NavigableSet<Long>> emailIndex = new ConcurrentHashMap<>();
+    private final ConcurrentMap<String, NavigableSet<Long>> subjectIndex = new ConcurrentHashMap<>();
+    private final ConcurrentNavigableMap<Integer, NavigableSet<Long>> experienceIndex = new ConcurrentSkipListMap<>();
+    
+    // Writes are serialized so the store and its indexes change together; reads stay lock-free
+    private final Object writeLock = new Object();
+    
     public TeacherServiceImpl() {
         // Initialize with some mock data
         Teacher teacher1 = new Teacher(idGenerator.getAndIncrement(), "John", "Doe", "john.doe@school.edu", "Mathematics", 5);
         Teacher teacher2 = new Teacher(idGenerator.getAndIncrement(), "Jane", "Smith", "jane.smith@school.edu", "Physics", 8);
         Teacher teacher3 = new Teacher(idGenerator.getAndIncrement(), "Robert", "Johnson", "robert.johnson@school.edu", "Chemistry", 3);
-        
-        teacherMap.put(teacher1.getId(), teacher1);
-        teacherMap.put(teacher2.getId(), teacher2);
-        teacherMap.put(teacher3.getId(), teacher3);
+    
+        saveTeacher(teacher1);
+        saveTeacher(teacher2);
+        saveTeacher(teacher3);
     }
     
     @Override
@@ -33,11 +55,78 @@ public class TeacherServiceImpl implements TeacherService {
         return new ArrayList<>(teacherMap.values());
     }
     
+    @Override
+    public List<Teacher> getTeachersPage(Long afterId, int size, String subject) {
+        Collection<Long> ids;
+        if (subject == null) {
+            ids = afterId == null ? teacherMap.keySet() : teacherMap.tailMap(afterId, false).keySet();
+        } else {
+            NavigableSet<Long> subjectIds = subjectIndex.getOrDefault(normalize(subject), Collections.emptyNavigableSet());
+            ids = afterId == null ? subjectIds : subjectIds.tailSet(afterId, false);
+        }
+    
+        List<Teacher> page = new ArrayList<>(Math.min(size, 256));
+        for (Long id : ids) {
+            Teacher teacher = teacherMap.get(id);
+            // Index entries may briefly lag a concurrent write, so re-check the record
+            if (teacher != null && (subject == null || subject.equalsIgnoreCase(teacher.getSubject()))) {
+                page.add(teacher);
+                if (page.size() == size) {
+                    break;
+                }
+            }
+        }
+        return page;
+    }
+    
+    @Override
+    public List<Teacher> searchTeachers(String email, String subject, Integer minExperience, Integer maxExperience) {
+        // Drive the lookup from the most selective index, then filter on the remaining criteria
+        Collection<Long> candidates;
+        if (email != null) {
+            candidates = emailIndex.getOrDefault(normalize(email), Collections.emptyNavigableSet());
+        } else if (subject != null) {
+            candidates = subjectIndex.getOrDefault(normalize(subject), Collections.emptyNavigableSet());
+        } else if (minExperience != null || maxExperience != null) {
+            int from = minExperience == null ? Integer.MIN_VALUE : minExperience;
+            int to = maxExperience == null ? Integer.MAX_VALUE : maxExperience;
+            if (from > to) {
+                return new ArrayList<>();
+            }
+            NavigableSet<Long> rangeIds = new TreeSet<>();
+            for (NavigableSet<Long> ids : experienceIndex.subMap(from, true, to, true).values()) {
+                rangeIds.addAll(ids);
+            }
+            candidates = rangeIds;
+        } else {
+            candidates = teacherMap.keySet();
+        }
+    
+        List<Teacher> result = new ArrayList<>();
+        for (Long id : candidates) {
+            Teacher teacher = teacherMap.get(id);
+            if (teacher != null && matches(teacher, email, subject, minExperience, maxExperience)) {
+                result.add(teacher);
+            }
+        }
+        return result;
+    }
+    
     @Override
     public Optional<Teacher> getTeacherById(Long id) {
         return Optional.ofNullable(teacherMap.get(id));
     }
     
+    @Override
+    public long getVersion() {
+        return version.get();
+    }
+    
+    @Override
+    public long getTeacherRevision(Long id) {
+        return revisions.getOrDefault(id, 0L);
+    }
+    
     @Override
     public Teacher saveTeacher(Teacher teacher) {
         // For new teachers (ID is null), assign a new ID
@@ -45,12 +134,88 @@ public class TeacherServiceImpl implements TeacherService {
             teacher.setId(idGenerator.getAndIncrement());
         }
         // For existing teachers, keep the existing ID
-        teacherMap.put(teacher.getId(), teacher);
+        synchronized (writeLock) {
+            Teacher previous = teacherMap.put(teacher.getId(), teacher);
+            unindex(previous);
+            index(teacher);
+            revisions.put(teacher.getId(), version.incrementAndGet());
+        }
         return teacher;
     }
     
     @Override
-    public void deleteTeacher(Long id) {
-        teacherMap.remove(id);
+    public Optional<Teacher> updateTeacher(Long id, Teacher teacher) {
+        // Replace only if the teacher still exists, atomically with respect to deletes
+        synchronized (writeLock) {
+            Teacher existing = teacherMap.get(id);
+            if (existing == null) {
+                return Optional.empty();
+            }
+            teacher.setId(id);
+            teacherMap.put(id, teacher);
+            unindex(existing);
+            index(teacher);
+            revisions.put(id, version.incrementAndGet());
+            return Optional.of(teacher);
+        }
+    }
+    
+    @Override
+    public boolean deleteTeacher(Long id) {
+        synchronized (writeLock) {
+            Teacher removed = teacherMap.remove(id);
+            if (removed == null) {
+                return false;
+            }
+            unindex(removed);
+            revisions.remove(id);
+            version.incrementAndGet();
+            return true;
+        }
+    }
+    
+    private void index(Teacher teacher) {
+        addToIndex(emailIndex, normalize(teacher.getEmail()), teacher.getId());
+        addToIndex(subjectIndex, normalize(teacher.getSubject()), teacher.getId());
+        addToIndex(experienceIndex, teacher.getYearsOfExperience(), teacher.getId());
+    }
+    
+    private void unindex(Teacher teacher) {
+        if (teacher == null) {
+            return;
+        }
+        removeFromIndex(emailIndex, normalize(teacher.getEmail()), teacher.getId());
+        removeFromIndex(subjectIndex, normalize(teacher.getSubject()), teacher.getId());
+        removeFromIndex(experienceIndex, teacher.getYearsOfExperience(), teacher.getId());
+    }
+    
+    private static <K> void addToIndex(Map<K, NavigableSet<Long>> index, K key, Long id) {
+        if (key != null) {
+            index.computeIfAbsent(key, k -> new ConcurrentSkipListSet<>()).add(id);
+        }
+    }
+    
+    private static <K> void removeFromIndex(Map<K, NavigableSet<Long>> index, K key, Long id) {
+        if (key == null) {
+            return;
+        }
+        NavigableSet<Long> ids = index.get(key);
+        if (ids != null) {
+            ids.remove(id);
+            if (ids.isEmpty()) {
+                index.remove(key);
+            }
+        }
+    }
+    
+    private static boolean matches(Teacher teacher, String email, String subject, Integer minExperience, Integer maxExperience) {
+        return (email == null || email.equalsIgnoreCase(teacher.getEmail()))
+                && (subject == null || subject.equalsIgnoreCase(teacher.getSubject()))
+                && (minExperience == null || teacher.getYearsOfExperience() >= minExperience)
+                && (maxExperience == null || teacher.getYearsOfExperience() <= maxExperience);
+    }
+    
+    private static String normalize(String value) {
+        return value == null ? null : value.toLowerCase(Locale.ROOT);
     }
 }
\ No newline at end of file
@@ -0,0 +1,59 @@
+package vallegrande.edu.pe.Pruebas;
+
+import org.junit.jupiter.api.Test;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.boot.test.autoconfigure.web.servlet.AutoConfigureMockMvc;
+import org.springframework.boot.test.context.SpringBootTest;
+import org.springframework.http.MediaType;
+import org.springframework.test.annotation.DirtiesContext;
+import org.springframework.test.web.servlet.MockMvc;
+
+import static org.hamcrest.Matchers.hasSize;
+import static org.hamcrest.Matchers.is;
+import static org.springframework.test.web.servlet.request.MockMvcRequestBuilders.*;
+import static org.springframework.test.web.servlet.result.MockMvcResultMatchers.*;
+
+@SpringBootTest
+@AutoConfigureMockMvc
+@DirtiesContext(classMode = DirtiesContext.ClassMode.AFTER_EACH_TEST_METHOD)
+public class TeacherBatchControllerTest {
+
+    @Autowired
+    private MockMvc mockMvc;
+
+    @Test
+    public void shouldApplyMixedBatchWithPerItemResults() throws Exception {
+        String batchJson = "["
+                + "{\"op\":\"create\",\"teacher\":{\"firstName\":\"Alice\",\"lastName\":\"Brown\",\"email\":\"alice.brown@school.edu\",\"subject\":\"Biology\",\"yearsOfExperience\":4}},"
+                + "{\"op\":\"update\",\"id\":2,\"teacher\":{\"firstName\":\"Jane\",\"lastName\":\"Smith Updated\",\"email\":\"jane.smith@school.edu\",\"subject\":\"Physics\",\"yearsOfExperience\":9}},"
+                + "{\"op\":\"delete\",\"id\":3},"
+                + "{\"op\":\"delete\",\"id\":999},"
+                + "{\"op\":\"archive\",\"id\":1}"
+                + "]";
+
+        mockMvc.perform(post("/api/teachers/batch")
+                .contentType(MediaType.APPLICATION_JSON)
+                .content(batchJson))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$", hasSize(5)))
+                .andExpect(jsonPath("$[0].status", is(201)))
+                .andExpect(jsonPath("$[0].id", is(4)))
+                .andExpect(jsonPath("$[1].status", is(200)))
+                .andExpect(jsonPath("$[1].teacher.lastName", is("Smith Updated")))
+                .andExpect(jsonPath("$[2].status", is(204)))
+                .andExpect(jsonPath("$[3].status", is(404)))
+                .andExpect(jsonPath("$[4].status", is(400)));
+
+        mockMvc.perform(get("/api/teachers"))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$", hasSize(3)));
+    }
+
+    @Test
+    public void shouldRejectMalformedBatch() throws Exception {
+        mockMvc.perform(post("/api/teachers/batch")
+                .contentType(MediaType.APPLICATION_JSON)
+                .content("{ invalid json }"))
+                .andExpect(status().isBadRequest());
+    }
+}
@@ -87,4 +87,79 @@ public class TeacherControllerTest {
         mockMvc.perform(get("/api/teachers/1"))
                 .andExpect(status().isNotFound());
     }
+
+    @Test
+    public void shouldReturnFirstPageWithNextCursor() throws Exception {
+        mockMvc.perform(get("/api/teachers").param("size", "2"))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$", hasSize(2)))
+                .andExpect(jsonPath("$[0].id", is(1)))
+                .andExpect(jsonPath("$[1].id", is(2)))
+                .andExpect(header().string("X-Next-Cursor", "2"));
+    }
+
+    @Test
+    public void shouldReturnLastPageWithoutNextCursor() throws Exception {
+        mockMvc.perform(get("/api/teachers").param("size", "2").param("after", "2"))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$", hasSize(1)))
+                .andExpect(jsonPath("$[0].id", is(3)))
+                .andExpect(header().doesNotExist("X-Next-Cursor"));
+    }
+
+    @Test
+    public void shouldFilterTeachersBySubject() throws Exception {
+        mockMvc.perform(get("/api/teachers").param("subject", "physics"))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$", hasSize(1)))
+                .andExpect(jsonPath("$[0].firstName", is("Jane")));
+    }
+
+    @Test
+    public void shouldSearchTeachersByEmail() throws Exception {
+        mockMvc.perform(get("/api/teachers/search").param("email", "JANE.SMITH@school.edu"))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$", hasSize(1)))
+                .andExpect(jsonPath("$[0].id", is(2)));
+    }
+
+    @Test
+    public void shouldSearchTeachersByExperienceRange() throws Exception {
+        mockMvc.perform(get("/api/teachers/search").param("minExperience", "4").param("maxExperience", "8"))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$", hasSize(2)))
+                .andExpect(jsonPath("$[0].firstName", is("John")))
+                .andExpect(jsonPath("$[1].firstName", is("Jane")));
+    }
+
+    @Test
+    public void shouldAnswerConditionalGetWithNotModified() throws Exception {
+        String etag = mockMvc.perform(get("/api/teachers"))
+                .andExpect(status().isOk())
+                .andExpect(header().exists("ETag"))
+                .andReturn().getResponse().getHeader("ETag");
+
+        mockMvc.perform(get("/api/teachers").header("If-None-Match", etag))
+                .andExpect(status().isNotModified());
+    }
+
+    @Test
+    public void shouldChangeTeacherEtagAfterUpdate() throws Exception {
+        String etag = mockMvc.perform(get("/api/teachers/1"))
+                .andExpect(status().isOk())
+                .andReturn().getResponse().getHeader("ETag");
+
+        mockMvc.perform(get("/api/teachers/1").header("If-None-Match", etag))
+                .andExpect(status().isNotModified());
+
+        String teacherJson = "{\"firstName\":\"John\",\"lastName\":\"Doe Updated\",\"email\":\"john.updated@school.edu\",\"subject\":\"Advanced Mathematics\",\"yearsOfExperience\":6}";
+        mockMvc.perform(put("/api/teachers/1")
+                .contentType(MediaType.APPLICATION_JSON)
+                .content(teacherJson))
+                .andExpect(status().isOk());
+
+        mockMvc.perform(get("/api/teachers/1").header("If-None-Match", etag))
+                .andExpect(status().isOk())
+                .andExpect(jsonPath("$.lastName", is("Doe Updated")));
+    }
 }
\ No newline at end of file
@@ -6,8 +6,16 @@ import vallegrande.edu.pe.Pruebas.service.impl.TeacherServiceImpl;
 import org.junit.jupiter.api.BeforeEach;
 import org.junit.jupiter.api.Test;
 
+import java.util.ArrayList;
+import java.util.HashSet;
 import java.util.List;
 import java.util.Optional;
+import java.util.Set;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
 
 import static org.junit.jupiter.api.Assertions.*;
 
@@ -88,4 +96,92 @@ public class TeacherServiceTest {
         Optional<Teacher> deletedTeacher = teacherService.getTeacherById(1L);
         assertFalse(deletedTeacher.isPresent());
     }
+
+    @Test
+    public void shouldReturnTeachersPageAfterCursor() {
+        List<Teacher> page = teacherService.getTeachersPage(1L, 10, null);
+        assertEquals(2, page.size());
+        assertEquals(2L, page.get(0).getId());
+        assertEquals(3L, page.get(1).getId());
+    }
+
+    @Test
+    public void shouldKeepIndexesInSyncOnUpdateAndDelete() {
+        Teacher updatedTeacher = new Teacher();
+        updatedTeacher.setFirstName("John");
+        updatedTeacher.setLastName("Doe");
+        updatedTeacher.setEmail("john.new@school.edu");
+        updatedTeacher.setSubject("Physics");
+        updatedTeacher.setYearsOfExperience(20);
+        teacherService.updateTeacher(1L, updatedTeacher);
+
+        assertTrue(teacherService.searchTeachers("john.doe@school.edu", null, null, null).isEmpty());
+        assertEquals(1, teacherService.searchTeachers("john.new@school.edu", null, null, null).size());
+        assertEquals(2, teacherService.searchTeachers(null, "Physics", null, null).size());
+        assertEquals(1, teacherService.searchTeachers(null, null, 10, null).size());
+
+        teacherService.deleteTeacher(2L);
+        List<Teacher> physics = teacherService.searchTeachers(null, "physics", null, null);
+        assertEquals(1, physics.size());
+        assertEquals(1L, physics.get(0).getId());
+    }
+
+    @Test
+    public void shouldNotUpdateDeletedTeacher() {
+        teacherService.deleteTeacher(1L);
+
+        Teacher updatedTeacher = new Teacher();
+        updatedTeacher.setFirstName("Ghost");
+
+        assertFalse(teacherService.updateTeacher(1L, updatedTeacher).isPresent());
+        assertFalse(teacherService.getTeacherById(1L).isPresent());
+    }
+
+    @Test
+    public void shouldReportWhetherTeacherWasDeleted() {
+        assertTrue(teacherService.deleteTeacher(1L));
+        assertFalse(teacherService.deleteTeacher(1L));
+    }
+
+    @Test
+    public void shouldAssignUniqueIdsUnderConcurrentSaves() throws Exception {
+        ExecutorService executor = Executors.newFixedThreadPool(16);
+        List<Future<Teacher>> futures = new ArrayList<>();
+        for (int i = 0; i < 2000; i++) {
+            final int index = i;
+            futures.add(executor.submit(() -> {
+                Teacher teacher = new Teacher();
+                teacher.setFirstName("Concurrent" + index);
+                return teacherService.saveTeacher(teacher);
+            }));
+        }
+
+        Set<Long> ids = new HashSet<>();
+        for (Future<Teacher> future : futures) {
+            assertTrue(ids.add(future.get().getId()));
+        }
+        executor.shutdown();
+        assertTrue(executor.awaitTermination(10, TimeUnit.SECONDS));
+
+        assertEquals(2003, teacherService.getAllTeachers().size());
+    }
+
+    @Test
+    public void shouldDeleteEachTeacherOnlyOnceUnderConcurrentDeletes() throws Exception {
+        ExecutorService executor = Executors.newFixedThreadPool(16);
+        AtomicInteger successfulDeletes = new AtomicInteger();
+        for (int i = 0; i < 1000; i++) {
+            final long id = 1L + (i % 3);
+            executor.submit(() -> {
+                if (teacherService.deleteTeacher(id)) {
+                    successfulDeletes.incrementAndGet();
+                }
+            });
+        }
+        executor.shutdown();
+        assertTrue(executor.awaitTermination(10, TimeUnit.SECONDS));
+
+        assertEquals(3, successfulDeletes.get());
+        assertTrue(teacherService.getAllTeachers().isEmpty());
+    }
 }
\ No newline at end of file
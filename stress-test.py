@@ -0,0 +1,231 @@
+"""
+Prueba de estrés de concurrencia para la API de profesores
+
+Envía muchas peticiones POST/PUT/DELETE concurrentes sobre IDs solapados y luego
+verifica invariantes del almacén de TeacherServiceImpl: IDs sin duplicar, el
+número de registros creados coincide con el GET /api/teachers final, ningún
+profesor eliminado reaparece y ninguna petición devuelve 500.
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import http_client
+from result_writers import ERROR, FAILED, PASSED, ResultStream, add_result_arguments
+
+
+class ConcurrencyStressTester:
+    def __init__(self, base_url="http://localhost:8080", workers=32, session=None, results=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api/teachers"
+        self.workers = workers
+        # No retries: a replayed PUT/DELETE would hide exactly what we look for
+        self.session = session or http_client.create_session(pool_maxsize=workers, retries=0)
+        self.status_counts = Counter()
+        self.failures = []
+        self.results = results or ResultStream("stress-test")
+        self._lock = threading.Lock()
+
+    def _request(self, method, url, **kwargs):
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            with self._lock:
+                self.status_counts["error"] += 1
+            return None, str(e)
+        with self._lock:
+            self.status_counts[response.status_code] += 1
+        return response, None
+
+    def _fetch_all(self):
+        response, error = self._request("GET", self.api_url)
+        if response is None or response.status_code != 200:
+            return None
+        return response.json()
+
+    def _create(self, index):
+        teacher = {
+            "firstName": "Stress",
+            "lastName": f"Create{index}",
+            "email": f"stress.{index}@test.com",
+            "subject": "Concurrency",
+            "yearsOfExperience": index % 40
+        }
+        response, _ = self._request("POST", self.api_url, json=teacher)
+        if response is not None and response.status_code == 201:
+            return response.json().get("id")
+        return None
+
+    def _mutate(self, teacher_id, marker):
+        """Either update or delete a teacher, returning what happened"""
+        if random.random() < 0.7:
+            teacher = {
+                "firstName": marker,
+                "lastName": "Updated",
+                "email": f"{marker.lower()}@test.com",
+                "subject": "Concurrency",
+                "yearsOfExperience": 1
+            }
+            response, _ = self._request("PUT", f"{self.api_url}/{teacher_id}", json=teacher)
+            return ("update", teacher_id, marker, response.status_code if response is not None else None)
+        response, _ = self._request("DELETE", f"{self.api_url}/{teacher_id}")
+        return ("delete", teacher_id, None, response.status_code if response is not None else None)
+
+    def test_concurrent_creates(self, count):
+        """Create teachers concurrently and check the assigned IDs are unique"""
+        print(f"\n=== Creating {count} teachers with {self.workers} workers ===")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            ids = [teacher_id for teacher_id in executor.map(self._create, range(count))
+                   if teacher_id is not None]
+
+        duplicates = [teacher_id for teacher_id, n in Counter(ids).items() if n > 1]
+        if duplicates:
+            self.failures.append(f"duplicate IDs assigned: {duplicates[:10]}")
+            print(f"❌ {len(duplicates)} IDs were assigned more than once")
+        else:
+            print(f"✅ {len(ids)} teachers created with unique IDs")
+        if len(ids) != count:
+            self.failures.append(f"only {len(ids)} of {count} creates returned 201")
+            print(f"❌ Only {len(ids)} of {count} creates returned 201")
+        return ids
+
+    def test_overlapping_mutations(self, ids, operations):
+        """Fire concurrent PUT/DELETE requests at a small overlapping ID set"""
+        print(f"\n=== Sending {operations} overlapping PUT/DELETE requests ===")
+        targets = [random.choice(ids) for _ in range(operations)]
+        markers = [f"Stress{i}" for i in range(operations)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self._mutate, targets, markers))
+
+        deletes = Counter(teacher_id for op, teacher_id, _, status in results
+                          if op == "delete" and status == 204)
+        updates = defaultdict(set)
+        for op, teacher_id, marker, status in results:
+            if op == "update" and status == 200:
+                updates[teacher_id].add(marker)
+
+        double_deletes = [teacher_id for teacher_id, n in deletes.items() if n > 1]
+        if double_deletes:
+            self.failures.append(f"teachers deleted more than once: {double_deletes[:10]}")
+            print(f"❌ {len(double_deletes)} teachers returned 204 on more than one DELETE")
+        else:
+            print(f"✅ {len(deletes)} teachers deleted exactly once")
+        return set(deletes), updates
+
+    def verify_final_state(self, baseline_ids, created_ids, deleted_ids, updates):
+        """Compare the final GET /api/teachers with the expected store contents"""
+        print("\n=== Verifying final store state ===")
+        teachers = self._fetch_all()
+        if teachers is None:
+            self.failures.append("final GET /api/teachers failed")
+            print("❌ Final GET /api/teachers failed")
+            return
+
+        final_ids = [teacher.get("id") for teacher in teachers]
+        duplicates = [teacher_id for teacher_id, n in Counter(final_ids).items() if n > 1]
+        if duplicates:
+            self.failures.append(f"duplicate IDs in final listing: {duplicates[:10]}")
+            print(f"❌ Final listing contains duplicate IDs: {duplicates[:10]}")
+
+        expected = (set(baseline_ids) | set(created_ids)) - deleted_ids
+        resurrected = set(final_ids) & deleted_ids
+        missing = expected - set(final_ids)
+        if resurrected:
+            self.failures.append(f"deleted teachers reappeared: {sorted(resurrected)[:10]}")
+            print(f"❌ {len(resurrected)} deleted teachers reappeared (update raced a delete)")
+        if missing:
+            self.failures.append(f"teachers lost from the store: {sorted(missing)[:10]}")
+            print(f"❌ {len(missing)} teachers are missing from the store")
+        if len(final_ids) != len(expected):
+            self.failures.append(f"expected {len(expected)} teachers, found {len(final_ids)}")
+            print(f"❌ Expected {len(expected)} teachers, GET returned {len(final_ids)}")
+        else:
+            print(f"✅ Final count matches: {len(final_ids)} teachers")
+
+        lost_updates = []
+        for teacher in teachers:
+            markers = updates.get(teacher.get("id"))
+            if markers and teacher.get("firstName") not in markers:
+                lost_updates.append(teacher.get("id"))
+        if lost_updates:
+            self.failures.append(f"final state matches no acknowledged update: {lost_updates[:10]}")
+            print(f"❌ {len(lost_updates)} teachers do not hold any acknowledged update")
+        else:
+            print("✅ Every updated teacher holds one of its acknowledged updates")
+
+    def _phase(self, name, func, *args):
+        """Run one phase and record it; the invariants it violated become the failure message"""
+        before = len(self.failures)
+        start = time.perf_counter()
+        value = func(*args)
+        violations = self.failures[before:]
+        self.results.record(name, FAILED if violations else PASSED, time.perf_counter() - start,
+                            "; ".join(violations) or None)
+        return value
+
+    def cleanup(self, ids):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(lambda teacher_id: self._request("DELETE", f"{self.api_url}/{teacher_id}"), ids))
+
+    def run_stress_tests(self, creates=500, operations=2000, hot_ids=20):
+        """Run the stress suite and return True when every invariant holds"""
+        print("Starting Concurrency Stress Tests for TeacherServiceImpl")
+        print("=" * 60)
+
+        baseline = self._fetch_all()
+        if baseline is None:
+            print("❌ Cannot reach GET /api/teachers. Make sure the backend is running on port 8080")
+            self.results.record("backend_reachable", ERROR, message="GET /api/teachers failed")
+            return False
+        baseline_ids = [teacher.get("id") for teacher in baseline]
+
+        created_ids = self._phase("concurrent_creates", self.test_concurrent_creates, creates)
+        if not created_ids:
+            return False
+
+        # Concentrate mutations on a few IDs so requests collide
+        hot = random.sample(created_ids, min(hot_ids, len(created_ids)))
+        deleted_ids, updates = self._phase("overlapping_mutations", self.test_overlapping_mutations, hot, operations)
+        self._phase("final_state", self.verify_final_state, baseline_ids, created_ids, deleted_ids, updates)
+
+        server_errors = sum(n for status, n in self.status_counts.items()
+                            if isinstance(status, int) and status >= 500)
+        if server_errors:
+            self.failures.append(f"{server_errors} responses with status 5xx")
+            print(f"❌ {server_errors} requests returned 5xx")
+            self.results.record("no_server_errors", FAILED, message=f"{server_errors} responses with status 5xx")
+        else:
+            print("✅ No 5xx responses")
+            self.results.record("no_server_errors", PASSED)
+
+        self.cleanup(set(created_ids) - deleted_ids)
+
+        print("\n" + "=" * 60)
+        print(f"Status codes: {dict(self.status_counts)}")
+        if self.failures:
+            print(f"❌ {len(self.failures)} invariant violations detected")
+            return False
+        print("✅ All concurrency invariants hold")
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrency stress tests for /api/teachers")
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--workers", type=int, default=32, help="concurrent requests in flight")
+    parser.add_argument("--creates", type=int, default=500, help="teachers created concurrently")
+    parser.add_argument("--operations", type=int, default=2000, help="overlapping PUT/DELETE requests")
+    parser.add_argument("--hot-ids", type=int, default=20, help="IDs targeted by the mutations")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    with ResultStream.from_args("stress-test", args) as results:
+        tester = ConcurrencyStressTester(args.base_url, workers=args.workers, results=results)
+        ok = tester.run_stress_tests(args.creates, args.operations, args.hot_ids)
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,453 @@
+"""
+Servidor sustituto (stand-in) de la API de profesores basado en asyncio
+
+Emula TeacherController sin necesitar Spring Boot: 201 al crear, 404 para IDs
+inexistentes, 204 al eliminar, 400 para JSON o IDs mal formados y la cabecera
+CORS "*". También reproduce la paginación por cursor, /search, /batch y los
+ETag con respuesta 304. Permite inyectar latencia y errores configurables para
+perfilar los propios testers a tasas de peticiones altas.
+
+Uso:
+    python teacher_api_standin.py --port 8080 --latency-ms 5 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import random
+from datetime import datetime, timezone
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+TEACHER_FIELDS = ("firstName", "lastName", "email", "subject")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_SIZE = 5000
+ALLOWED_METHODS = ("GET", "POST", "PUT", "DELETE")
+EXPOSED_HEADERS = "X-Next-Cursor, ETag"
+
+FRONTEND_PAGE = (b"<!doctype html><html><head><title>Teacher Management</title></head>"
+                 b"<body><app-root></app-root></body></html>")
+
+
+class BadRequest(Exception):
+    pass
+
+
+class TeacherStore:
+    """In-memory store mirroring TeacherServiceImpl"""
+
+    def __init__(self, seed=True):
+        self.teachers = {}
+        self.sorted_ids = []
+        self.revisions = {}
+        self.version = 0
+        self.next_id = 1
+        if seed:
+            self.create({"firstName": "John", "lastName": "Doe", "email": "john.doe@school.edu",
+                         "subject": "Mathematics", "yearsOfExperience": 5})
+            self.create({"firstName": "Jane", "lastName": "Smith", "email": "jane.smith@school.edu",
+                         "subject": "Physics", "yearsOfExperience": 8})
+            self.create({"firstName": "Robert", "lastName": "Johnson", "email": "robert.johnson@school.edu",
+                         "subject": "Chemistry", "yearsOfExperience": 3})
+
+    @staticmethod
+    def to_teacher(teacher_id, data):
+        """Build a Teacher the way Jackson would bind it"""
+        if not isinstance(data, dict):
+            raise BadRequest("JSON object expected")
+        teacher = {"id": teacher_id}
+        for field in TEACHER_FIELDS:
+            value = data.get(field)
+            if value is not None and not isinstance(value, (str, int, float, bool)):
+                raise BadRequest(f"Cannot deserialize {field}")
+            teacher[field] = None if value is None else str(value)
+        experience = data.get("yearsOfExperience", 0)
+        if experience is None:
+            experience = 0
+        if isinstance(experience, bool) or not isinstance(experience, (int, float, str)):
+            raise BadRequest("Cannot deserialize yearsOfExperience")
+        try:
+            teacher["yearsOfExperience"] = int(experience)
+        except ValueError:
+            raise BadRequest("Cannot deserialize yearsOfExperience")
+        return teacher
+
+    def _touch(self, teacher_id):
+        self.version += 1
+        self.revisions[teacher_id] = self.version
+
+    def create(self, data):
+        teacher = self.to_teacher(self.next_id, data)
+        self.next_id += 1
+        self.teachers[teacher["id"]] = teacher
+        self.sorted_ids.append(teacher["id"])
+        self._touch(teacher["id"])
+        return teacher
+
+    def update(self, teacher_id, data):
+        if teacher_id not in self.teachers:
+            return None
+        teacher = self.to_teacher(teacher_id, data)
+        self.teachers[teacher_id] = teacher
+        self._touch(teacher_id)
+        return teacher
+
+    def delete(self, teacher_id):
+        if self.teachers.pop(teacher_id, None) is None:
+            return False
+        index = bisect.bisect_left(self.sorted_ids, teacher_id)
+        del self.sorted_ids[index]
+        self.revisions.pop(teacher_id, None)
+        self.version += 1
+        return True
+
+    def page(self, after, size, subject):
+        start = 0 if after is None else bisect.bisect_right(self.sorted_ids, after)
+        result = []
+        for index in range(start, len(self.sorted_ids)):
+            teacher = self.teachers[self.sorted_ids[index]]
+            if subject is None or (teacher["subject"] or "").lower() == subject.lower():
+                result.append(teacher)
+                if len(result) == size:
+                    break
+        return result
+
+    def search(self, email, subject, min_experience, max_experience):
+        return [teacher for teacher in self.teachers.values()
+                if (email is None or (teacher["email"] or "").lower() == email.lower())
+                and (subject is None or (teacher["subject"] or "").lower() == subject.lower())
+                and (min_experience is None or teacher["yearsOfExperience"] >= min_experience)
+                and (max_experience is None or teacher["yearsOfExperience"] <= max_experience)]
+
+
+class Response:
+    def __init__(self, status, body=None, headers=None, content_type="application/json"):
+        self.status = status
+        self.headers = dict(headers or {})
+        if body is None:
+            self.body = b""
+        elif isinstance(body, bytes):
+            self.body = body
+            self.headers.setdefault("Content-Type", content_type)
+        else:
+            self.body = json.dumps(body, separators=(",", ":")).encode()
+            self.headers.setdefault("Content-Type", "application/json")
+
+
+class HttpStandIn:
+    """Minimal asyncio HTTP/1.1 server with keep-alive; subclasses implement handle()"""
+
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.host = host
+        self.port = port
+        self.requests_served = 0
+        self._servers = []
+
+    async def handle(self, method, target, headers, body):
+        raise NotImplementedError
+
+    async def start(self):
+        self._servers.append(await asyncio.start_server(self._handle_connection, self.host, self.port))
+        # Port 0 picks a free port; report what was actually bound
+        self.port = self._servers[0].sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+    async def _handle_connection(self, reader, writer):
+        await self._serve(reader, writer, self.handle)
+
+    async def _read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            return None
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0") or 0)
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, version, headers, body
+
+    async def _serve(self, reader, writer, handler):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                response = await handler(method, target, headers, body)
+                self.requests_served += 1
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                self._write(writer, method, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _write(self, writer, method, response, keep_alive):
+        reason = HTTPStatus(response.status).phrase
+        headers = response.headers
+        if response.status not in (204, 304):
+            headers["Content-Length"] = str(len(response.body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines = [f"HTTP/1.1 {response.status} {reason}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        if method != "HEAD" and response.status not in (204, 304):
+            payload += response.body
+        writer.write(payload)
+
+
+class TeacherApiStandIn(HttpStandIn):
+    """asyncio HTTP/1.1 server speaking the /api/teachers protocol"""
+
+    def __init__(self, host="127.0.0.1", port=8080, latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, error_status=500, seed=True, frontend_port=None):
+        super().__init__(host, port)
+        self.frontend_port = frontend_port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.store = TeacherStore(seed=seed)
+
+    # ------------------------------------------------------------------ HTTP
+
+    async def start(self):
+        await super().start()
+        if self.frontend_port is not None:
+            self._servers.append(await asyncio.start_server(self._handle_frontend, self.host, self.frontend_port))
+            self.frontend_port = self._servers[1].sockets[0].getsockname()[1]
+
+    async def _handle_frontend(self, reader, writer):
+        async def frontend(method, target, headers, body):
+            return Response(200, FRONTEND_PAGE, content_type="text/html")
+        await self._serve(reader, writer, frontend)
+
+    # --------------------------------------------------------------- routing
+
+    async def handle(self, method, target, headers, body):
+        """Apply injected faults, route the request and add CORS headers"""
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep(max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+
+        url = urlsplit(target)
+        path = unquote(url.path)
+        origin = headers.get("origin")
+
+        if self.error_rate and random.random() < self.error_rate:
+            response = self._error(self.error_status, path)
+        elif method == "OPTIONS" and origin and "access-control-request-method" in headers:
+            return self._preflight(path, headers)
+        else:
+            try:
+                response = self.route(method, path, parse_qs(url.query), headers, body)
+            except BadRequest:
+                response = self._error(400, path)
+
+        if origin and path.startswith("/api/"):
+            response.headers["Access-Control-Allow-Origin"] = "*"
+            response.headers["Access-Control-Expose-Headers"] = EXPOSED_HEADERS
+        if path.startswith("/api/"):
+            response.headers["Vary"] = "Origin, Access-Control-Request-Method, Access-Control-Request-Headers"
+        return response
+
+    def _preflight(self, path, headers):
+        requested = headers["access-control-request-method"].upper()
+        if not path.startswith("/api/") or requested not in ALLOWED_METHODS:
+            return Response(403, b"Invalid CORS request", content_type="text/plain")
+        response = Response(200, headers={
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Methods": ",".join(ALLOWED_METHODS),
+            "Access-Control-Max-Age": "1800",
+            "Vary": "Origin, Access-Control-Request-Method, Access-Control-Request-Headers",
+        })
+        if "access-control-request-headers" in headers:
+            response.headers["Access-Control-Allow-Headers"] = headers["access-control-request-headers"]
+        return response
+
+    def _error(self, status, path):
+        return Response(status, {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "status": status,
+            "error": HTTPStatus(status).phrase,
+            "path": path,
+        })
+
+    @staticmethod
+    def _json(body):
+        try:
+            return json.loads(body or b"null")
+        except ValueError:
+            raise BadRequest("Malformed JSON")
+
+    @staticmethod
+    def _param(query, name, cast=str):
+        values = query.get(name)
+        if not values:
+            return None
+        try:
+            return cast(values[0])
+        except ValueError:
+            raise BadRequest(f"Invalid {name}")
+
+    @staticmethod
+    def _etag_matches(if_none_match, etag):
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            value = candidate.strip()
+            if value.startswith("W/"):
+                value = value[2:]
+            if value in ("*", etag):
+                return True
+        return False
+
+    def route(self, method, path, query, headers, body):
+        store = self.store
+        if path in ("/", "/index.html") and method in ("GET", "HEAD"):
+            return Response(200, FRONTEND_PAGE, content_type="text/html")
+
+        parts = [part for part in path.split("/") if part]
+        if parts[:2] != ["api", "teachers"] or len(parts) > 3:
+            return self._error(404, path)
+
+        if len(parts) == 2:
+            if method in ("GET", "HEAD"):
+                return self._list(query, headers)
+            if method == "POST":
+                data = self._json(body)
+                return Response(201, store.create(data))
+            return self._error(405, path)
+
+        if parts[2] == "search" and method in ("GET", "HEAD"):
+            etag = f'"teachers-v{store.version}"'
+            if self._etag_matches(headers.get("if-none-match"), etag):
+                return Response(304, headers={"ETag": etag})
+            teachers = store.search(self._param(query, "email"), self._param(query, "subject"),
+                                    self._param(query, "minExperience", int),
+                                    self._param(query, "maxExperience", int))
+            return Response(200, teachers, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+        if parts[2] == "batch":
+            if method != "POST":
+                return self._error(405, path)
+            return self._batch(self._json(body))
+
+        try:
+            teacher_id = int(parts[2])
+        except ValueError:
+            # Spring fails to convert the path variable to Long
+            raise BadRequest("Invalid id")
+
+        if method in ("GET", "HEAD"):
+            teacher = store.teachers.get(teacher_id)
+            if teacher is None:
+                return Response(404)
+            etag = f'"teacher-{teacher_id}-r{store.revisions.get(teacher_id, 0)}"'
+            if self._etag_matches(headers.get("if-none-match"), etag):
+                return Response(304, headers={"ETag": etag})
+            return Response(200, teacher, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        if method == "PUT":
+            data = self._json(body)
+            teacher = store.update(teacher_id, data)
+            return Response(200, teacher) if teacher is not None else Response(404)
+        if method == "DELETE":
+            return Response(204) if store.delete(teacher_id) else Response(404)
+        return self._error(405, path)
+
+    def _list(self, query, headers):
+        store = self.store
+        etag = f'"teachers-v{store.version}"'
+        if self._etag_matches(headers.get("if-none-match"), etag):
+            return Response(304, headers={"ETag": etag})
+
+        after = self._param(query, "after", int)
+        size = self._param(query, "size", int)
+        subject = self._param(query, "subject")
+        response_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if after is None and size is None and subject is None:
+            return Response(200, list(store.teachers.values()), headers=response_headers)
+
+        page_size = DEFAULT_PAGE_SIZE if size is None else max(1, min(size, MAX_PAGE_SIZE))
+        page = store.page(after, page_size + 1, subject)
+        if len(page) > page_size:
+            page = page[:page_size]
+            response_headers["X-Next-Cursor"] = str(page[-1]["id"])
+        return Response(200, page, headers=response_headers)
+
+    def _batch(self, operations):
+        if not isinstance(operations, list):
+            raise BadRequest("JSON array expected")
+        if len(operations) > MAX_BATCH_SIZE:
+            return Response(413)
+        results = []
+        for operation in operations:
+            if not isinstance(operation, dict):
+                raise BadRequest("JSON object expected")
+            op = str(operation.get("op") or "").lower()
+            teacher_id = operation.get("id")
+            data = operation.get("teacher")
+            if op == "create":
+                if data is None:
+                    results.append({"status": 400, "error": "teacher is required for create"})
+                    continue
+                teacher = self.store.create(data)
+                results.append({"status": 201, "id": teacher["id"], "teacher": teacher})
+            elif op == "update":
+                if teacher_id is None or data is None:
+                    results.append({"status": 400, "error": "id and teacher are required for update"})
+                    continue
+                teacher = self.store.update(teacher_id, data)
+                results.append({"status": 200, "id": teacher_id, "teacher": teacher} if teacher
+                               else {"status": 404, "id": teacher_id})
+            elif op == "delete":
+                if teacher_id is None:
+                    results.append({"status": 400, "error": "id is required for delete"})
+                    continue
+                results.append({"status": 204 if self.store.delete(teacher_id) else 404, "id": teacher_id})
+            else:
+                results.append({"status": 400, "error": f"unknown op: {operation.get('op')}"})
+        return Response(200, results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Spring Boot teacher API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--frontend-port", type=int, help="also serve a minimal Angular shell on this port")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random +/- jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="status code of injected failures")
+    parser.add_argument("--empty", action="store_true", help="start without the three seed teachers")
+    args = parser.parse_args()
+
+    standin = TeacherApiStandIn(args.host, args.port, args.latency_ms, args.jitter_ms,
+                                args.error_rate, args.error_status, seed=not args.empty,
+                                frontend_port=args.frontend_port)
+    print(f"Teacher API stand-in listening on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(standin.serve_forever())
+    except KeyboardInterrupt:
+        pass
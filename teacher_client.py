@@ -0,0 +1,98 @@
+"""
+Cliente de la API de profesores para los scripts de pruebas
+
+Recorre GET /api/teachers página a página usando el cursor X-Next-Cursor, de modo
+que la memoria usada depende del tamaño de página y no del total de profesores.
+La siguiente página se solicita mientras el llamador procesa la actual.
+
+También agrupa altas y bajas masivas en lotes para POST /api/teachers/batch,
+evitando una petición HTTP por profesor al sembrar o limpiar datos.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import http_client
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_BATCH_SIZE = 1000
+
+
+def fetch_teachers_page(api_url, after=None, size=500, subject=None, session=None):
+    """Fetch one page and return (teachers, next_cursor)"""
+    session = session or http_client.get_session()
+    params = {"size": size}
+    if after is not None:
+        params["after"] = after
+    if subject:
+        params["subject"] = subject
+    response = session.get(api_url, params=params)
+    response.raise_for_status()
+    return response.json(), response.headers.get(NEXT_CURSOR_HEADER)
+
+
+def iter_teachers(api_url, page_size=500, subject=None, session=None, prefetch=True):
+    """Yield every teacher lazily, prefetching the next page in the background"""
+    session = session or http_client.get_session()
+
+    if not prefetch:
+        cursor = None
+        while True:
+            page, cursor = fetch_teachers_page(api_url, cursor, page_size, subject, session)
+            yield from page
+            if not cursor:
+                return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(fetch_teachers_page, api_url, None, page_size, subject, session)
+        while pending is not None:
+            page, cursor = pending.result()
+            pending = None
+            if cursor:
+                pending = executor.submit(fetch_teachers_page, api_url, cursor, page_size, subject, session)
+            yield from page
+
+
+def chunked(items, size):
+    """Yield lists of at most size items from any iterable"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def apply_batch(api_url, operations, session=None):
+    """Send one batch of operations and return the per-item results"""
+    session = session or http_client.get_session()
+    response = session.post(f"{api_url}/batch", json=operations)
+    response.raise_for_status()
+    return response.json()
+
+
+def _apply_chunks(api_url, operation_chunks, workers, session):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(lambda chunk: apply_batch(api_url, chunk, session), operation_chunks):
+            yield from results
+
+
+def batch_create(api_url, teachers, chunk_size=DEFAULT_BATCH_SIZE, workers=4, session=None):
+    """Create teachers in batches and return their IDs in input order
+
+    Items that the backend rejected come back as None.
+    """
+    session = session or http_client.get_session()
+    chunks = ([{"op": "create", "teacher": teacher} for teacher in chunk]
+              for chunk in chunked(teachers, chunk_size))
+    return [result.get("id") if result.get("status") == 201 else None
+            for result in _apply_chunks(api_url, chunks, workers, session)]
+
+
+def batch_delete(api_url, teacher_ids, chunk_size=DEFAULT_BATCH_SIZE, workers=4, session=None):
+    """Delete teachers in batches and return how many were actually removed"""
+    session = session or http_client.get_session()
+    chunks = ([{"op": "delete", "id": teacher_id} for teacher_id in chunk]
+              for chunk in chunked(teacher_ids, chunk_size))
+    return sum(1 for result in _apply_chunks(api_url, chunks, workers, session)
+               if result.get("status") == 204)
@@ -0,0 +1,156 @@
+"""
+Lectura de la tabla de profesores de la interfaz y comparación con la API
+
+Extrae la tabla completa de profesores (ID, nombre, email, asignatura y
+experiencia) con una sola ejecución de JavaScript en el navegador, que devuelve
+las filas como listas compactas de texto, en lugar de una llamada de WebDriver
+por celda. La comparación con GET /api/teachers se hace en Python por ID,
+recorriendo la API página a página, de modo que verificar miles de filas lleva
+milisegundos.
+"""
+
+import time
+
+from teacher_client import iter_teachers
+
+FIELDS = ("id", "name", "email", "subject", "experience")
+
+# Column headers of the teacher-list component for each field
+HEADERS = {"id": "ID", "name": "Name", "email": "Email", "subject": "Subject", "experience": "Experience"}
+
+# Returns {headers: [...], rows: [[cell text, ...], ...]} for the first table
+# with a body; textContent avoids the layout pass that innerText forces.
+EXTRACT_TABLE = """
+var table = document.querySelector(arguments[0]);
+if (!table || !table.tBodies.length) { return { headers: [], rows: [] }; }
+function text(cell) { return cell.textContent.replace(/\\s+/g, ' ').trim(); }
+var headers = table.tHead ? Array.prototype.map.call(table.tHead.rows[0].cells, text) : [];
+var rows = [];
+var bodyRows = table.tBodies[0].rows;
+for (var i = 0; i < bodyRows.length; i++) {
+  var cells = bodyRows[i].cells;
+  var row = new Array(cells.length);
+  for (var j = 0; j < cells.length; j++) { row[j] = text(cells[j]); }
+  rows.push(row);
+}
+return { headers: headers, rows: rows };
+"""
+
+
+def _text(value):
+    return "" if value is None else " ".join(str(value).split())
+
+
+def extract_teacher_table(driver, selector="table"):
+    """The teacher table as (id, name, email, subject, experience) string tuples, in one round trip"""
+    table = driver.execute_script(EXTRACT_TABLE, selector)
+    headers = table["headers"]
+    if headers:
+        missing = [HEADERS[field] for field in FIELDS if HEADERS[field] not in headers]
+        if missing:
+            raise ValueError(f"Teacher table has no column(s): {', '.join(missing)}")
+        columns = [headers.index(HEADERS[field]) for field in FIELDS]
+    else:
+        columns = range(len(FIELDS))
+    # Rows with fewer cells (e.g. an "empty list" placeholder row) are not teachers
+    width = max(columns) + 1
+    return [tuple(row[column] for column in columns) for row in table["rows"] if len(row) >= width]
+
+
+def api_teacher_row(teacher):
+    """An API teacher in the same shape as a table row"""
+    return (_text(teacher.get("id")), _text(f"{_text(teacher.get('firstName'))} {_text(teacher.get('lastName'))}"),
+            _text(teacher.get("email")), _text(teacher.get("subject")), _text(teacher.get("yearsOfExperience")))
+
+
+class TableDiff:
+    """Differences between the UI table and the API, keyed by teacher ID
+
+    missing: API rows absent from the table; extra: table rows the API does
+    not have; mismatched: (id, field, ui value, api value); duplicates: IDs
+    shown more than once; newer: API rows skipped because they were created
+    after the table was read (see diff_teachers).
+    """
+
+    __slots__ = ("ui_rows", "api_rows", "missing", "extra", "mismatched", "duplicates", "newer")
+
+    def __init__(self):
+        self.ui_rows = 0
+        self.api_rows = 0
+        self.missing = []
+        self.extra = []
+        self.mismatched = []
+        self.duplicates = []
+        self.newer = 0
+
+    @property
+    def ok(self):
+        return not (self.missing or self.extra or self.mismatched or self.duplicates)
+
+    def describe(self):
+        return (f"{self.ui_rows} UI rows, {self.api_rows} API teachers: {len(self.missing)} missing, "
+                f"{len(self.extra)} extra, {len(self.mismatched)} mismatched, {len(self.duplicates)} duplicated")
+
+
+def diff_teachers(ui_rows, api_teachers, newer_than=None):
+    """Compare table rows with API teachers (any iterable, consumed once)
+
+    With newer_than, API teachers whose numeric ID is above it are counted in
+    newer instead of missing: another client created them after the table was
+    rendered. Take it from newest_teacher_id() before loading the page.
+    """
+    diff = TableDiff()
+    diff.ui_rows = len(ui_rows)
+    by_id = {}
+    for row in ui_rows:
+        if row[0] in by_id:
+            diff.duplicates.append(row[0])
+        by_id[row[0]] = row
+
+    for teacher in api_teachers:
+        diff.api_rows += 1
+        api_row = api_teacher_row(teacher)
+        ui_row = by_id.pop(api_row[0], None)
+        if ui_row is None:
+            if newer_than is not None and api_row[0].isdigit() and int(api_row[0]) > newer_than:
+                diff.newer += 1
+            else:
+                diff.missing.append(api_row)
+            continue
+        for field, ui_value, api_value in zip(FIELDS[1:], ui_row[1:], api_row[1:]):
+            if ui_value != api_value:
+                diff.mismatched.append((api_row[0], field, ui_value, api_value))
+    diff.extra = list(by_id.values())
+    return diff
+
+
+def newest_teacher_id(api_url, session=None):
+    """Highest teacher ID the API returns, or -1 when there are none"""
+    return max((int(teacher["id"]) for teacher in iter_teachers(api_url, session=session)), default=-1)
+
+
+def verify_teacher_table(driver, api_url, newer_than=None, session=None):
+    """Extract the table and diff it against GET api_url; returns (diff, timings in seconds)
+
+    The API is streamed page by page into the comparison, so "compare"
+    includes fetching it.
+    """
+    started = time.perf_counter()
+    ui_rows = extract_teacher_table(driver)
+    extracted = time.perf_counter()
+    diff = diff_teachers(ui_rows, iter_teachers(api_url, session=session), newer_than)
+    return diff, {"extract": extracted - started, "compare": time.perf_counter() - extracted}
+
+
+def print_table_diff(diff, timings=None, limit=10):
+    print(f"   {diff.describe()}")
+    if timings:
+        print("   " + ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()))
+    for row in diff.missing[:limit]:
+        print(f"   - missing in UI: {' | '.join(row)}")
+    for row in diff.extra[:limit]:
+        print(f"   - only in UI: {' | '.join(row)}")
+    for teacher_id, field, ui_value, api_value in diff.mismatched[:limit]:
+        print(f"   - teacher {teacher_id} {field}: UI {ui_value!r} != API {api_value!r}")
+    for teacher_id in diff.duplicates[:limit]:
+        print(f"   - teacher {teacher_id} shown more than once")
@@ -0,0 +1,45 @@
+import asyncio
+import contextlib
+import os
+import sys
+import threading
+
+import pytest
+
+# The scripts are top-level modules of the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from teacher_api_standin import TeacherApiStandIn  # noqa: E402
+from zap_api_standin import ZapApiStandIn  # noqa: E402
+
+
+@contextlib.contextmanager
+def serve(standin):
+    """Run an HttpStandIn on its own event loop thread; yields its base URL"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(standin.start(), loop).result(10)
+    try:
+        yield f"http://{standin.host}:{standin.port}"
+    finally:
+        asyncio.run_coroutine_threadsafe(standin.stop(), loop).result(10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(10)
+        loop.close()
+
+
+@pytest.fixture
+def teacher_api():
+    """(stand-in, base URL) of a seeded teacher API on a free port"""
+    standin = TeacherApiStandIn(port=0)
+    with serve(standin) as base_url:
+        yield standin, base_url
+
+
+@pytest.fixture
+def zap_api():
+    """(stand-in, JSON API URL) of a ZAP API stand-in on a free port"""
+    standin = ZapApiStandIn(port=0, api_key="test-key")
+    with serve(standin) as base_url:
+        yield standin, f"{base_url}/JSON"
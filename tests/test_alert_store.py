@@ -0,0 +1,72 @@
+import pytest
+
+from alert_store import RISK_LEVELS, AlertStore
+
+
+def record(plugin_id, url, risk="Medium", param="", count=1):
+    return {"pluginId": plugin_id, "alert": f"Alert {plugin_id}", "risk": risk, "url": url, "param": param,
+            "count": count}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AlertStore(str(tmp_path / "alerts.db")) as store:
+        yield store
+
+
+def keys(findings):
+    return sorted((finding["plugin_id"], finding["url"]) for finding in findings)
+
+
+def test_new_and_fixed_between_the_last_two_runs(store):
+    first = store.record_run([record("1", "/a"), record("2", "/b", "High"), record("3", "/c", "Low")])
+    second = store.record_run([record("1", "/a"), record("2", "/b", "High"), record("4", "/d")])
+    assert store.run_ids() == [second, first]
+    assert keys(store.new_since_last()) == [("4", "/d")]
+    assert keys(store.fixed_since_last()) == [("3", "/c")]
+    # Against an explicit run: the first one has no predecessor
+    assert keys(store.new_since_last(first)) == [("1", "/a"), ("2", "/b"), ("3", "/c")]
+    assert store.fixed_since_last(first) == []
+
+
+def test_risk_and_parameter_are_part_of_a_finding(store):
+    store.record_run([record("1", "/a", "Medium"), record("1", "/a", "Low", param="id")])
+    store.record_run([record("1", "/a", "High"), record("1", "/a", "Low", param="id")])
+    assert [(f["risk"], f["param"]) for f in store.new_since_last()] == [("High", "")]
+    assert [(f["risk"], f["param"]) for f in store.fixed_since_last()] == [("Medium", "")]
+
+
+def test_duplicate_records_in_a_run_add_up(store):
+    run = store.record_run([record("1", "/a", count=2), record("1", "/a", count=3)])
+    assert [f["count"] for f in store.iter_findings(run)] == [5]
+    assert store.risk_totals(run)["Medium"] == {"findings": 1, "occurrences": 5}
+
+
+def test_findings_and_alert_types_most_severe_first(store):
+    run = store.record_run([record("1", "/a", "Low", count=9), record("2", "/a", "High"),
+                            record("2", "/b", "High", count=4), record("3", "/c", "Medium")])
+    assert [(f["risk"], f["count"]) for f in store.iter_findings(run)] == [
+        ("High", 4), ("High", 1), ("Medium", 1), ("Low", 9)]
+    types = store.alert_types(run)
+    assert [(t["pluginId"], t["routes"], t["occurrences"]) for t in types] == [("2", 2, 5), ("3", 1, 1), ("1", 1, 9)]
+    assert store.risk_totals(run) == {"Informational": {"findings": 0, "occurrences": 0},
+                                      "Low": {"findings": 1, "occurrences": 9},
+                                      "Medium": {"findings": 1, "occurrences": 1},
+                                      "High": {"findings": 2, "occurrences": 5}}
+
+
+def test_trend_covers_the_last_runs_oldest_first(store):
+    runs = [store.record_run([record(str(n), f"/{n}", "High") for n in range(high)] +
+                             [record("low", "/x", "Low")])
+            for high in (3, 0, 1, 2)]
+    trend = store.risk_trend(3)
+    assert [point["run_id"] for point in trend] == runs[1:]
+    assert [point["High"] for point in trend] == [0, 1, 2]
+    assert all(point["Low"] == 1 and point["Informational"] == 0 for point in trend)
+    assert set(trend[0]) == {"run_id", "started_at"} | set(RISK_LEVELS)
+
+
+def test_empty_store(store):
+    assert store.new_since_last() == [] and store.fixed_since_last() == []
+    assert list(store.iter_findings()) == []
+    assert store.risk_trend() == []
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from check_scheduler import ERROR, FAILED, PASSED, SKIPPED, CheckScheduler
+
+
+def statuses(results):
+    return {name: result.status for name, result in results.items()}
+
+
+def test_return_value_decides_the_status():
+    def boom():
+        raise RuntimeError("down")
+
+    scheduler = (CheckScheduler()
+                 .add("truthy", lambda: {"id": 1})
+                 .add("false", lambda: False)
+                 .add("none", lambda: None)
+                 .add("raises", boom))
+    results = scheduler.run()
+    assert statuses(results) == {"truthy": PASSED, "false": FAILED, "none": FAILED, "raises": ERROR}
+    assert isinstance(results["raises"].error, RuntimeError)
+
+
+def test_dependency_values_are_passed_in_order():
+    scheduler = (CheckScheduler()
+                 .add("create", lambda: 7)
+                 .add("name", lambda: "ada")
+                 .add("update", lambda teacher_id, name: (teacher_id, name), depends_on=["create", "name"]))
+    assert scheduler.run()["update"].value == (7, "ada")
+
+
+def test_failed_dependency_skips_its_dependents():
+    ran = []
+    scheduler = (CheckScheduler()
+                 .add("create", lambda: None)
+                 .add("update", lambda _: ran.append("update") or True, depends_on=["create"])
+                 .add("delete", lambda _: ran.append("delete") or True, depends_on=["update"]))
+    results = scheduler.run()
+    assert statuses(results) == {"create": FAILED, "update": SKIPPED, "delete": SKIPPED}
+    assert results["update"].error == "blocked by create"
+    assert ran == []
+
+
+def test_after_waits_for_any_outcome():
+    order = []
+    scheduler = (CheckScheduler()
+                 .add("first", lambda: order.append("first"))
+                 .add("second", lambda: order.append("second") or True, after=["first"]))
+    results = scheduler.run()
+    assert statuses(results) == {"first": FAILED, "second": PASSED}
+    assert order == ["first", "second"]
+
+
+def test_independent_checks_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    scheduler = CheckScheduler(max_workers=3)
+    for name in ("a", "b", "c"):
+        scheduler.add(name, lambda: barrier.wait() >= 0)
+    assert set(statuses(scheduler.run()).values()) == {PASSED}
+
+
+def test_output_and_results_follow_registration_order(capsys):
+    release = threading.Event()
+    seen = []
+
+    def slow():
+        # Finishes only after fast has printed
+        release.wait(5)
+        print("slow done")
+        return True
+
+    def fast():
+        print("fast done")
+        release.set()
+        return True
+
+    scheduler = CheckScheduler(max_workers=2, on_result=lambda result, output: seen.append(result.name))
+    scheduler.add("slow", slow).add("fast", fast)
+    results = scheduler.run()
+    assert list(results) == seen == ["slow", "fast"]
+    assert capsys.readouterr().out.splitlines() == ["slow done", "fast done"]
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    cycle = (CheckScheduler()
+             .add("a", lambda _: True, depends_on=["b"])
+             .add("b", lambda: True, after=["a"]))
+    with pytest.raises(ValueError, match="cycle"):
+        cycle.run()
+    with pytest.raises(ValueError, match="unknown check"):
+        CheckScheduler().add("a", lambda _: True, depends_on=["missing"]).run()
+    with pytest.raises(ValueError, match="Duplicate"):
+        CheckScheduler().add("a", lambda: True).add("a", lambda: True)
@@ -0,0 +1,82 @@
+import http_client
+
+
+def cached_session(**kwargs):
+    return http_client.create_session(retries=0, **kwargs)
+
+
+def test_304_is_served_from_the_cache(teacher_api):
+    standin, base_url = teacher_api
+    session = cached_session(cache_size=8)
+    first = session.get(f"{base_url}/api/teachers")
+    served = standin.requests_served
+    second = session.get(f"{base_url}/api/teachers")
+
+    assert first.status_code == second.status_code == 200
+    assert first.from_cache is False and second.from_cache is True
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert standin.requests_served == served + 1
+    assert session.cache_hits == 1
+
+
+def test_changed_resource_is_downloaded_again(teacher_api):
+    _, base_url = teacher_api
+    session = cached_session(cache_size=8)
+    before = session.get(f"{base_url}/api/teachers").json()
+    session.post(f"{base_url}/api/teachers", json={"firstName": "Ada", "lastName": "Lovelace",
+                                                   "email": "ada@school.edu", "subject": "Mathematics",
+                                                   "yearsOfExperience": 12})
+    after = session.get(f"{base_url}/api/teachers")
+    assert after.from_cache is False
+    assert len(after.json()) == len(before) + 1
+    assert session.cache_hits == 0
+
+
+def test_least_recently_used_entry_is_evicted(teacher_api):
+    _, base_url = teacher_api
+    session = cached_session(cache_size=2)
+    for teacher_id in (1, 2, 1, 3):
+        session.get(f"{base_url}/api/teachers/{teacher_id}")
+    # 1 was used after 2, so 2 made room for 3
+    assert session.get(f"{base_url}/api/teachers/1").from_cache is True
+    assert session.get(f"{base_url}/api/teachers/3").from_cache is True
+    assert session.get(f"{base_url}/api/teachers/2").from_cache is False
+
+
+def test_body_bytes_bound_the_cache(teacher_api):
+    _, base_url = teacher_api
+    probe = cached_session(cache_size=8)
+    sizes = [len(probe.get(f"{base_url}/api/teachers/{teacher_id}").content) for teacher_id in (1, 2, 3)]
+    # Room for the two most recent bodies, not for all three
+    session = cached_session(cache_size=8, cache_bytes=sizes[1] + sizes[2])
+    for teacher_id in (1, 2, 3):
+        session.get(f"{base_url}/api/teachers/{teacher_id}")
+    assert len(session._cache) == 2
+    assert session._cache_total == sizes[1] + sizes[2]
+    assert session.get(f"{base_url}/api/teachers/1").from_cache is False
+
+
+def test_body_larger_than_the_budget_is_not_cached(teacher_api):
+    _, base_url = teacher_api
+    session = cached_session(cache_size=8, cache_bytes=16)
+    session.get(f"{base_url}/api/teachers")
+    assert session.get(f"{base_url}/api/teachers").from_cache is False
+    assert len(session._cache) == 0 and session._cache_total == 0
+
+
+def test_request_headers_are_part_of_the_key(teacher_api):
+    _, base_url = teacher_api
+    session = cached_session(cache_size=8)
+    session.get(f"{base_url}/api/teachers", headers={"Origin": "http://a.example"})
+    assert session.get(f"{base_url}/api/teachers", headers={"Origin": "http://b.example"}).from_cache is False
+    assert session.get(f"{base_url}/api/teachers", headers={"Origin": "http://a.example"}).from_cache is True
+
+
+def test_cache_is_off_by_default(teacher_api):
+    _, base_url = teacher_api
+    session = cached_session()
+    session.get(f"{base_url}/api/teachers")
+    response = session.get(f"{base_url}/api/teachers")
+    assert not getattr(response, "from_cache", False)
+    assert session.cache_hits == 0
@@ -0,0 +1,73 @@
+import math
+import random
+
+import pytest
+
+from latency_histogram import LatencyHistogram
+
+
+def exact_percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+@pytest.mark.parametrize("significant_figures", [2, 3, 4])
+def test_percentiles_within_relative_error(significant_figures):
+    rng = random.Random(significant_figures)
+    values = [int(rng.lognormvariate(9, 1.5)) for _ in range(20000)] + [0, 1, 59_999_999]
+    histogram = LatencyHistogram(significant_figures=significant_figures)
+    for value in values:
+        histogram.record(value)
+
+    for pct in (0, 1, 25, 50, 90, 99, 99.9, 100):
+        exact = exact_percentile(values, pct)
+        reported = histogram.value_at_percentile(pct)
+        # Reported values are the top of the exact value's bucket
+        assert exact <= reported <= exact + exact * 10 ** -significant_figures + 1, pct
+    assert histogram.total_count == len(values)
+    assert histogram.min_value == 0
+    assert histogram.max_value == 59_999_999
+    assert histogram.mean() == pytest.approx(sum(values) / len(values))
+
+
+def test_counts_and_clamping():
+    histogram = LatencyHistogram(highest_trackable=1_000_000)
+    histogram.record(500, count=3)
+    histogram.record(5_000_000)
+    histogram.record(-7)
+    assert histogram.total_count == 5
+    assert histogram.max_value == 1_000_000
+    assert histogram.min_value == 0
+    assert histogram.value_at_percentile(50) == pytest.approx(500, rel=1e-3)
+    assert histogram.value_at_percentile(100) == 1_000_000
+
+
+def test_record_seconds_uses_microseconds():
+    histogram = LatencyHistogram()
+    histogram.record_seconds(0.25)
+    assert histogram.value_at_percentile(50) == pytest.approx(250_000, rel=1e-3)
+
+
+def test_merge_matches_a_single_histogram():
+    rng = random.Random(7)
+    values = [rng.randrange(1, 5_000_000) for _ in range(5000)]
+    whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for index, value in enumerate(values):
+        whole.record(value)
+        (first if index % 2 else second).record(value)
+    first.merge(second)
+    assert first.summary() == whole.summary()
+
+
+def test_merge_rejects_other_configurations():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(significant_figures=2))
+
+
+def test_empty_and_invalid():
+    assert LatencyHistogram().summary() == {"count": 0, "min": 0, "mean": 0.0, "max": 0,
+                                            "p50": 0, "p90": 0, "p95": 0, "p99": 0, "p99.9": 0}
+    with pytest.raises(ValueError):
+        LatencyHistogram(significant_figures=6)
+    with pytest.raises(ValueError):
+        LatencyHistogram(lowest_trackable=10, highest_trackable=15)
@@ -0,0 +1,48 @@
+import html
+import os
+import random
+
+from payload_fuzzer import iter_payloads, payload_encodings
+from reflection_detector import ReflectionDetector
+
+XSS_WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "payloads", "xss.txt")
+
+
+def brute_force(payloads, text):
+    return {(payload, kind) for payload in payloads for kind, form in payload_encodings(payload) if form in text}
+
+
+def test_matches_brute_force_on_overlapping_patterns():
+    rng = random.Random(12)
+    alphabet = "ab<>'\" &"
+    # Short patterns over a tiny alphabet: prefixes, suffixes and nested matches abound
+    payloads = list({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))) for _ in range(300)})
+    detector = ReflectionDetector(payloads)
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+        assert detector.scan(text) == brute_force(payloads, text), text
+
+
+def test_matches_brute_force_on_the_xss_wordlist():
+    payloads = list(iter_payloads(XSS_WORDLIST))
+    detector = ReflectionDetector(payloads)
+    rng = random.Random(3)
+    for _ in range(50):
+        echoed = rng.sample(payloads, 3)
+        forms = [rng.choice(payload_encodings(payload))[1] for payload in echoed]
+        text = "<html><body>" + "<p>filler</p>".join(forms) + "</body></html>"
+        assert detector.scan(text) == brute_force(payloads, text)
+
+
+def test_reflected_reports_only_raw_echoes():
+    detector = ReflectionDetector(["<script>alert(1)</script>", "<img src=x onerror=alert(2)>"])
+    text = "<div><script>alert(1)</script>" + html.escape("<img src=x onerror=alert(2)>") + "</div>"
+    assert detector.reflected(text) == {"<script>alert(1)</script>"}
+    assert ("<img src=x onerror=alert(2)>", "html-escaped") in detector.scan(text)
+
+
+def test_no_match_and_size():
+    detector = ReflectionDetector(["<svg/onload=1>"])
+    assert detector.scan("") == set()
+    assert detector.scan("plain body") == set()
+    assert len(detector) == len(payload_encodings("<svg/onload=1>"))
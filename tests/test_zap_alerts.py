@@ -0,0 +1,74 @@
+import pytest
+
+import http_client
+from zap_alerts import AlertAggregator, iter_alerts
+
+
+def alert(plugin_id="10020", url="http://localhost:8080/api/teachers/1", param="", risk="Medium"):
+    return {"pluginId": plugin_id, "alert": f"Alert {plugin_id}", "risk": risk, "url": url, "param": param}
+
+
+def record(plugin_id="10020", url="http://localhost:8080/api/teachers/{id}", param="", risk="Medium", count=1):
+    return {"pluginId": plugin_id, "alert": f"Alert {plugin_id}", "risk": risk, "url": url, "param": param,
+            "count": count}
+
+
+def test_alerts_on_the_same_route_share_a_record():
+    aggregator = AlertAggregator().consume([alert(url=f"http://localhost:8080/api/teachers/{n}") for n in range(5)])
+    assert aggregator.total == 5
+    assert [r["count"] for r in aggregator.records.values()] == [5]
+    assert aggregator.overflow == 0
+
+
+def test_new_findings_beyond_the_limit_are_only_counted():
+    aggregator = AlertAggregator(max_records=2)
+    aggregator.consume([alert("1"), alert("2"), alert("3"), alert("1"), alert("3")])
+    assert len(aggregator.records) == 2
+    assert aggregator.total == 5
+    # Known findings keep counting; only the ones that would open a record overflow
+    assert aggregator.overflow == 2
+    assert sum(r["count"] for r in aggregator.records.values()) + aggregator.overflow == aggregator.total
+
+
+def test_merge_record_counts_each_finding_once():
+    aggregator = AlertAggregator(max_records=2)
+    aggregator.merge_record(record("1", count=4))
+    aggregator.merge_record(record("1", count=3))
+    aggregator.merge_record(record("1", count=6))
+    assert aggregator.total == 6
+    aggregator.merge_record(record("2", count=2))
+    aggregator.merge_record(record("3", count=5))
+    assert aggregator.total == 13
+    assert aggregator.overflow == 5
+    assert len(aggregator.records) == 2
+
+
+def test_no_limit():
+    aggregator = AlertAggregator(max_records=None).consume(alert(str(n)) for n in range(100))
+    assert len(aggregator.records) == 100 and aggregator.overflow == 0
+
+
+def test_sorted_records_most_severe_first():
+    aggregator = AlertAggregator().consume([alert("1", risk="Low"), alert("2", risk="High"),
+                                            alert("3", risk="Medium"), alert("3", risk="Medium")])
+    assert [r["risk"] for r in aggregator.sorted_records()] == ["High", "Medium", "Low"]
+
+
+@pytest.mark.parametrize("alerts, page_size", [(1000, 64), (512, 64), (10, 500), (0, 50)])
+def test_iter_alerts_reads_every_page(zap_api, alerts, page_size):
+    standin, api_url = zap_api
+    standin.alert_count = alerts
+    session = http_client.create_session(retries=0)
+    ids = [int(a["id"]) for a in iter_alerts(session, api_url, standin.api_key, page_size=page_size)]
+    assert ids == list(range(alerts))
+
+
+def test_aggregating_the_stand_in_stream(zap_api):
+    standin, api_url = zap_api
+    standin.alert_count, standin.distinct_alerts = 1000, 40
+    session = http_client.create_session(retries=0)
+    aggregator = AlertAggregator(max_records=25).consume(iter_alerts(session, api_url, standin.api_key, page_size=128))
+    assert aggregator.total == 1000
+    assert len(aggregator.records) == 25
+    # Alert n belongs to finding n % 40: findings 25..39 arrive after the limit is reached
+    assert aggregator.overflow == 15 * 1000 // 40
@@ -0,0 +1,250 @@
+"""
+Pool de sesiones de WebDriver y ejecución de escenarios de UI en paralelo
+
+Arrancar Chrome cuesta varios segundos, así que las sesiones se crean una vez y
+se prestan a los escenarios: al devolver una sesión se borran su
+almacenamiento local y de sesión y sus cookies y se vuelve a cargar la URL
+base, de modo que cada préstamo empieza como un navegador recién abierto.
+run_scenarios reparte los escenarios entre varios procesos, cada uno con su
+propio pool, y devuelve sus resultados y su salida al proceso principal, que
+los escribe en el ResultStream en cuanto llegan.
+"""
+
+import contextlib
+import io
+import multiprocessing.util
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from angular_waits import DEFAULT_TIMEOUT, AngularWaits
+from result_writers import ERROR, ResultStream
+
+CLEAR_STORAGE = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+class DriverPool:
+    """Warm WebDriver sessions, leased to one test at a time
+
+    factory() starts a new driver. Sessions are started on demand up to size
+    (or up front with warm()) and handed out as AngularWaits, already on
+    base_url. A session whose reset fails is quit and replaced later.
+    """
+
+    def __init__(self, factory, base_url, size=1, timeout=DEFAULT_TIMEOUT):
+        self.factory = factory
+        self.base_url = base_url
+        parts = urlsplit(base_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.sessions = []
+        self.lock = threading.Lock()
+        self.starting = 0
+        self.leases = 0
+        self.startup_time = 0.0
+        self.reset_time = 0.0
+
+    def _start(self):
+        started = time.perf_counter()
+        driver = None
+        try:
+            driver = self.factory()
+            waits = AngularWaits(driver, self.timeout)
+            waits.get(self.base_url, "start session")
+        except Exception:
+            with self.lock:
+                self.starting -= 1
+            if driver is not None:
+                driver.quit()
+            raise
+        with self.lock:
+            self.starting -= 1
+            self.sessions.append(waits)
+            self.startup_time += time.perf_counter() - started
+        return waits
+
+    def _reserve(self):
+        """Claim a slot for a new session if the pool is not full yet"""
+        with self.lock:
+            if len(self.sessions) + self.starting >= self.size:
+                return False
+            self.starting += 1
+            return True
+
+    def warm(self):
+        """Start every missing session now, concurrently"""
+        count = 0
+        while self._reserve():
+            count += 1
+        if count:
+            with ThreadPoolExecutor(count) as executor:
+                for waits in executor.map(lambda _: self._start(), range(count)):
+                    self.idle.put(waits)
+
+    def acquire(self):
+        try:
+            waits = self.idle.get_nowait()
+        except queue.Empty:
+            waits = self._start() if self._reserve() else self.idle.get()
+        with self.lock:
+            self.leases += 1
+        waits.records = []
+        return waits
+
+    def reset(self, waits):
+        """Clear the base origin's storage and cookies and reload base_url"""
+        driver = waits.driver
+        if waits.preinstalled:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": self.origin, "storageTypes": "all"})
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            # Storage is per origin: it can only be cleared from a page of the base origin
+            if not driver.current_url.startswith(self.origin):
+                driver.get(self.base_url)
+            driver.execute_script(CLEAR_STORAGE)
+            driver.delete_all_cookies()
+        waits.get(self.base_url, "reset session")
+
+    def release(self, waits):
+        started = time.perf_counter()
+        try:
+            self.reset(waits)
+        except Exception:
+            self._discard(waits)
+            return
+        finally:
+            with self.lock:
+                self.reset_time += time.perf_counter() - started
+        self.idle.put(waits)
+
+    def _discard(self, waits):
+        with self.lock:
+            self.sessions.remove(waits)
+        try:
+            waits.driver.quit()
+        except Exception:
+            pass
+
+    @contextlib.contextmanager
+    def lease(self):
+        waits = self.acquire()
+        try:
+            yield waits
+        finally:
+            self.release(waits)
+
+    def stats(self):
+        with self.lock:
+            return {"sessions": len(self.sessions), "leases": self.leases,
+                    "startup": self.startup_time, "reset": self.reset_time}
+
+    def close(self):
+        with self.lock:
+            sessions, self.sessions = self.sessions, []
+        for waits in sessions:
+            try:
+                waits.driver.quit()
+            except Exception:
+                pass
+
+
+class _Collector:
+    """ResultStream writer that keeps the results, to send them back to the parent"""
+
+    def __init__(self):
+        self.results = []
+
+    def write(self, result):
+        self.results.append(result)
+
+    def close(self, summary):
+        pass
+
+
+class ScenarioRun:
+    __slots__ = ("name", "results", "waits", "output", "worker", "pool")
+
+    def __init__(self, name, results, waits, output, worker, pool):
+        self.name = name
+        self.results = results
+        self.waits = waits
+        self.output = output
+        self.worker = worker
+        self.pool = pool
+
+
+# The worker process's own pool, created by _init_worker
+_pool = None
+
+
+def _init_worker(factory, base_url, size, timeout):
+    global _pool
+    _pool = DriverPool(factory, base_url, size, timeout)
+    # Worker processes exit through multiprocessing, which skips atexit but runs finalizers
+    multiprocessing.util.Finalize(_pool, _pool.close, exitpriority=10)
+    try:
+        _pool.warm()
+    except Exception:
+        # Leave it to the first lease to start (and report) the session
+        pass
+
+
+def _run_scenario(suite, scenario, settings):
+    collector = _Collector()
+    results = ResultStream(suite, [collector])
+    output = io.StringIO()
+    records = []
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        try:
+            with _pool.lease() as waits:
+                try:
+                    scenario(waits, results, settings)
+                finally:
+                    records = list(waits.records)
+        except Exception as e:
+            results.record(scenario.__name__, ERROR, time.perf_counter() - started, f"{type(e).__name__}: {e}")
+    return ScenarioRun(scenario.__name__, collector.results, records, output.getvalue(),
+                       multiprocessing.current_process().name, _pool.stats())
+
+
+def run_scenarios(scenarios, factory, base_url, results, workers=2, timeout=DEFAULT_TIMEOUT, settings=None):
+    """Run scenario(waits, results, settings) functions across worker processes
+
+    A worker runs one scenario at a time, so its DriverPool holds a single
+    session that is reset between scenarios; scenarios and factory must be
+    module-level functions and settings (a dict) picklable. Results are added
+    to results and each scenario's output printed as it finishes. Returns the
+    ScenarioRuns in the order of scenarios.
+    """
+    runs = [None] * len(scenarios)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(factory, base_url, 1, timeout)) as executor:
+        futures = {executor.submit(_run_scenario, results.suite, scenario, settings or {}): index
+                   for index, scenario in enumerate(scenarios)}
+        for future in as_completed(futures):
+            run = future.result()
+            print(f"\n=== {run.name} ({run.worker}) ===")
+            print(run.output, end="")
+            for result in run.results:
+                results.add(result)
+            runs[futures[future]] = run
+    return runs
+
+
+def print_pool_summary(runs):
+    """Per worker: sessions started, leases, browser startup and reset time"""
+    workers = {}
+    for run in runs:
+        # Stats are cumulative per worker: the last run reported carries the totals
+        current = workers.get(run.worker)
+        if current is None or run.pool["leases"] > current["leases"]:
+            workers[run.worker] = run.pool
+    print(f"   {'worker':<24} {'sessions':>8} {'leases':>7} {'startup s':>10} {'reset s':>8}")
+    for worker, stats in sorted(workers.items()):
+        print(f"   {worker:<24} {stats['sessions']:>8} {stats['leases']:>7} "
+              f"{stats['startup']:>10.1f} {stats['reset']:>8.1f}")
@@ -0,0 +1,121 @@
+"""
+Recuperación paginada y deduplicación de alertas de OWASP ZAP
+
+Pide /core/view/alerts/ por páginas (start/count) y las consume como un flujo,
+solicitando la página siguiente mientras se procesa la actual. Las alertas se
+agregan sobre la marcha por (pluginId, URL normalizada, parámetro, riesgo), así
+que la memoria depende del número de alertas distintas y no del total devuelto
+por ZAP.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from header_audit import route_key
+
+DEFAULT_PAGE_SIZE = 500
+# Distinct findings kept in memory; more than this is a scan of generated URLs
+DEFAULT_MAX_RECORDS = 50000
+RISK_ORDER = {"High": 0, "Medium": 1, "Low": 2, "Informational": 3}
+
+
+def fetch_alerts_page(session, api_url, api_key, start, count, baseurl=None):
+    params = {'start': start, 'count': count, 'apikey': api_key}
+    if baseurl:
+        params['baseurl'] = baseurl
+    response = session.get(f"{api_url}/core/view/alerts/", params=params)
+    response.raise_for_status()
+    return response.json().get("alerts", [])
+
+
+def iter_alerts(session, api_url, api_key, baseurl=None, page_size=DEFAULT_PAGE_SIZE):
+    """Yield every alert, page by page, prefetching the next page"""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        start = 0
+        pending = executor.submit(fetch_alerts_page, session, api_url, api_key, start, page_size, baseurl)
+        while pending is not None:
+            page = pending.result()
+            pending = None
+            if len(page) == page_size:
+                start += page_size
+                pending = executor.submit(fetch_alerts_page, session, api_url, api_key, start, page_size, baseurl)
+            yield from page
+
+
+def alert_key(alert):
+    """Deduplication key: same check, same route, same parameter, same risk"""
+    return (alert.get("pluginId"), route_key(alert.get("url", "")), alert.get("param", ""), alert.get("risk"))
+
+
+class AlertAggregator:
+    """Fold a stream of alerts into one record per alert_key with a count
+
+    Alerts that would open a new record beyond max_records are only counted
+    in overflow; max_records=None lifts the limit.
+    """
+
+    def __init__(self, max_records=DEFAULT_MAX_RECORDS):
+        self.max_records = max_records
+        self.records = {}
+        self.total = 0
+        self.overflow = 0
+
+    def add(self, alert):
+        self.total += 1
+        key = alert_key(alert)
+        record = self.records.get(key)
+        if record is not None:
+            record["count"] += 1
+            return
+        if self.max_records is not None and len(self.records) >= self.max_records:
+            self.overflow += 1
+            return
+        plugin_id, url, param, risk = key
+        self.records[key] = {
+            "pluginId": plugin_id,
+            "alert": alert.get("alert") or alert.get("name"),
+            "risk": risk,
+            "confidence": alert.get("confidence"),
+            "cweid": alert.get("cweid"),
+            "url": url,
+            "param": param,
+            "sample_url": alert.get("url"),
+            "count": 1,
+        }
+
+    def merge_record(self, record):
+        """Fold in an already aggregated record, e.g. one kept from an earlier run
+
+        The same finding reported again is not counted twice: the larger
+        occurrence count wins.
+        """
+        key = (record["pluginId"], record["url"], record["param"], record["risk"])
+        existing = self.records.get(key)
+        if existing is None:
+            self.total += record["count"]
+            if self.max_records is not None and len(self.records) >= self.max_records:
+                self.overflow += record["count"]
+                return
+            self.records[key] = dict(record)
+        elif record["count"] > existing["count"]:
+            self.total += record["count"] - existing["count"]
+            existing["count"] = record["count"]
+
+    def consume(self, alerts):
+        for alert in alerts:
+            self.add(alert)
+        return self
+
+    def sorted_records(self):
+        return sorted(self.records.values(),
+                      key=lambda record: (RISK_ORDER.get(record["risk"], len(RISK_ORDER)),
+                                          -record["count"], record["url"]))
+
+
+def print_alerts(aggregator):
+    """Print one line per aggregated alert, most severe first"""
+    print(f"⚠ Found {aggregator.total} alerts, {len(aggregator.records)} distinct\n")
+    for record in aggregator.sorted_records():
+        param = f" [{record['param']}]" if record["param"] else ""
+        print(f"- {record['alert']} (Risk: {record['risk']}) x{record['count']} | URL: {record['url']}{param}")
+    if aggregator.overflow:
+        print(f"- ... {aggregator.overflow} more alerts beyond the {aggregator.max_records} record limit")
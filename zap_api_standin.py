@@ -0,0 +1,231 @@
+"""
+Servidor sustituto (stand-in) de la API JSON de OWASP ZAP basado en asyncio
+
+Implementa los endpoints que usa OWASPZAPSecurityTester: core/view/version,
+spider y ascan (scan/status/stop), core/view/urls, core/view/alerts con
+start/count y core/view/numberOfAlerts. Las curvas de progreso de los escaneos y
+el volumen de alertas son configurables (incluidas respuestas de 100k alertas),
+de modo que el sondeo, la paginación y el uso de memoria de la orquestación se
+pueden probar y ajustar sin ZAP ni red.
+
+Uso:
+    python zap_api_standin.py --port 8081 --spider-curve linear:5 --scan-curve stall:40 --alerts 100000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from teacher_api_standin import HttpStandIn, Response
+
+ZAP_VERSION = "2.14.0"
+
+# (pluginId, name, risk, cweid) of common ZAP passive and active rules
+PLUGINS = [
+    ("10021", "X-Content-Type-Options Header Missing", "Low", "693"),
+    ("10020", "Missing Anti-clickjacking Header", "Medium", "1021"),
+    ("10038", "Content Security Policy (CSP) Header Not Set", "Medium", "693"),
+    ("10035", "Strict-Transport-Security Header Not Set", "Low", "319"),
+    ("10098", "Cross-Domain Misconfiguration", "Medium", "264"),
+    ("10036", "Server Leaks Version Information", "Low", "200"),
+    ("10027", "Information Disclosure - Suspicious Comments", "Informational", "200"),
+    ("40012", "Cross Site Scripting (Reflected)", "High", "79"),
+    ("40018", "SQL Injection", "High", "89"),
+    ("90022", "Application Error Disclosure", "Medium", "200"),
+]
+PARAMS = ["", "id", "subject", "email"]
+
+
+class ProgressCurve:
+    """Scripted scan progress: "linear:SECONDS", "step:SECONDS" or "stall:PERCENT[:SECONDS]"
+
+    linear grows smoothly to 100 over SECONDS, step jumps in 10% increments
+    and stall stops at PERCENT, never finishing.
+    """
+
+    def __init__(self, spec):
+        kind, _, arguments = spec.partition(":")
+        values = [float(value) for value in arguments.split(":") if value]
+        self.kind = kind
+        if kind == "stall":
+            self.stall_at = values[0] if values else 50.0
+            self.duration = values[1] if len(values) > 1 else 1.0
+        elif kind in ("linear", "step"):
+            self.duration = values[0] if values else 5.0
+        else:
+            raise ValueError(f"Unknown progress curve: {spec}")
+
+    def progress(self, elapsed):
+        fraction = 1.0 if self.duration <= 0 else min(1.0, elapsed / self.duration)
+        if self.kind == "step":
+            return int(fraction * 10) * 10
+        if self.kind == "stall":
+            return int(min(self.stall_at, fraction * 100))
+        return int(fraction * 100)
+
+
+class Scan:
+    __slots__ = ("url", "curve", "started", "stopped_at")
+
+    def __init__(self, url, curve):
+        self.url = url
+        self.curve = curve
+        self.started = time.monotonic()
+        self.stopped_at = None
+
+    def progress(self):
+        return self.curve.progress((self.stopped_at or time.monotonic()) - self.started)
+
+
+class ZapApiStandIn(HttpStandIn):
+    """asyncio HTTP/1.1 server speaking the subset of the ZAP JSON API we use
+
+    Alerts are computed from their index, so even very large alert volumes
+    cost no memory until a page is actually requested.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8081, api_key=None, spider_curve="linear:3",
+                 scan_curve="linear:10", alerts=200, distinct_alerts=40, urls_per_target=20,
+                 latency_ms=0.0):
+        super().__init__(host, port)
+        self.api_key = api_key
+        self.spider_curve = spider_curve
+        self.scan_curve = scan_curve
+        self.alert_count = alerts
+        self.distinct_alerts = max(1, distinct_alerts)
+        self.urls_per_target = urls_per_target
+        self.latency_ms = latency_ms
+        self.scans = {"spider": {}, "ascan": {}}
+        self.targets = []
+        self.status_polls = 0
+
+    # ---------------------------------------------------------------- alerts
+
+    def alert(self, index):
+        """Deterministic alert number index; distinct_alerts keys repeat cyclically"""
+        slot = index % self.distinct_alerts
+        plugin_id, name, risk, cweid = PLUGINS[slot % len(PLUGINS)]
+        route = slot // len(PLUGINS)
+        target = self.targets[route % len(self.targets)] if self.targets else "http://localhost:8080"
+        param = PARAMS[route % len(PARAMS)]
+        query = f"?{param}=v{index}" if param else ""
+        return {
+            "id": str(index),
+            "pluginId": plugin_id,
+            "alert": name,
+            "name": name,
+            "risk": risk,
+            "confidence": "Medium",
+            "cweid": cweid,
+            "url": f"{target.rstrip('/')}/route{route}/{index}{query}",
+            "param": param,
+            "method": "GET",
+        }
+
+    def _alerts_body(self, start, count):
+        stop = self.alert_count if count <= 0 else min(self.alert_count, start + count)
+        # Serialized alert by alert so a 100k-alert answer never exists as Python objects
+        chunks = [b'{"alerts":[']
+        chunks.append(b",".join(json.dumps(self.alert(index), separators=(",", ":")).encode()
+                                for index in range(start, stop)))
+        chunks.append(b"]}")
+        return b"".join(chunks)
+
+    # --------------------------------------------------------------- routing
+
+    async def handle(self, method, target, headers, body):
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+        if target.startswith("http://") or target.startswith("https://"):
+            # Proxied request from the tester: just acknowledge it
+            return Response(200, b"proxied by ZAP stand-in", content_type="text/plain")
+
+        url = urlsplit(target)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if self.api_key and query.get("apikey") != self.api_key:
+            return Response(400, {"code": "bad_api_key", "message": "Missing or invalid API key"})
+
+        parts = [part for part in url.path.split("/") if part]
+        if len(parts) < 4 or parts[0] != "JSON":
+            return Response(404, {"code": "bad_view", "message": "No such view"})
+        component, kind, operation = parts[1:4]
+        return self.route(component, kind, operation, query)
+
+    def route(self, component, kind, operation, query):
+        if component == "core" and kind == "view":
+            if operation == "version":
+                return Response(200, {"version": ZAP_VERSION})
+            if operation == "urls":
+                return Response(200, {"urls": self._urls(query.get("baseurl"))})
+            if operation == "numberOfAlerts":
+                return Response(200, {"numberOfAlerts": str(self.alert_count)})
+            if operation == "alerts":
+                try:
+                    start = int(query.get("start", 0))
+                    count = int(query.get("count", 0))
+                except ValueError:
+                    return Response(400, {"code": "illegal_parameter", "message": "start/count"})
+                return Response(200, self._alerts_body(max(0, start), count))
+
+        if component in self.scans:
+            scans = self.scans[component]
+            if kind == "action" and operation == "scan":
+                target = query.get("url")
+                if not target:
+                    return Response(400, {"code": "missing_parameter", "message": "url"})
+                if target not in self.targets:
+                    self.targets.append(target)
+                scan_id = str(len(scans))
+                curve = self.spider_curve if component == "spider" else self.scan_curve
+                scans[scan_id] = Scan(target, ProgressCurve(curve))
+                return Response(200, {"scan": scan_id})
+
+            scan = scans.get(query.get("scanId", ""))
+            if scan is None:
+                return Response(400, {"code": "does_not_exist", "message": "Does Not Exist"})
+            if kind == "view" and operation == "status":
+                self.status_polls += 1
+                return Response(200, {"status": str(scan.progress())})
+            if kind == "action" and operation == "stop":
+                scan.stopped_at = scan.stopped_at or time.monotonic()
+                return Response(200, {"Result": "OK"})
+            if kind == "view" and operation == "results" and component == "spider":
+                return Response(200, {"results": self._urls(scan.url)})
+
+        return Response(404, {"code": "bad_view", "message": "No such view"})
+
+    def _urls(self, baseurl):
+        targets = [baseurl] if baseurl else self.targets
+        urls = []
+        for target in targets:
+            root = target.rstrip("/")
+            urls.append(f"{root}/")
+            urls.append(f"{root}/api/teachers")
+            urls.extend(f"{root}/api/teachers/{index}" for index in range(1, self.urls_per_target - 1))
+        return urls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for the OWASP ZAP JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--api-key", help="require this apikey parameter")
+    parser.add_argument("--spider-curve", default="linear:3", help="linear:S, step:S or stall:PCT[:S]")
+    parser.add_argument("--scan-curve", default="linear:10", help="linear:S, step:S or stall:PCT[:S]")
+    parser.add_argument("--alerts", type=int, default=200, help="total alerts reported")
+    parser.add_argument("--distinct-alerts", type=int, default=40,
+                        help="distinct (plugin, route, parameter, risk) keys among them")
+    parser.add_argument("--urls-per-target", type=int, default=20, help="URLs the spider 'discovers'")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added to every request")
+    args = parser.parse_args()
+
+    standin = ZapApiStandIn(args.host, args.port, args.api_key, args.spider_curve, args.scan_curve,
+                            args.alerts, args.distinct_alerts, args.urls_per_target, args.latency_ms)
+    print(f"ZAP API stand-in listening on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(standin.serve_forever())
+    except KeyboardInterrupt:
+        pass